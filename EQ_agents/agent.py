@@ -6,12 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from agents import (
     Agent,
-    Runner,
     FileSearchTool,
-    output_guardrail,
-    GuardrailFunctionOutput,
-    OutputGuardrailTripwireTriggered,
-    RunContextWrapper,
     trace,
     guardrail_span
 
@@ -24,6 +19,10 @@ from typing import Dict, Any
 import asyncio
 from models.period import Period
 from models.rubric import Rubric, Scale
+from EQ_agents.llm_scheduler import llm_scheduler, on_slot_acquired, run_agent
+from EQ_agents.agent_loop import agent_loop
+from EQ_agents.schedule_guardrail import ScheduleGuardrail, ScheduleReview
+from data_access.llm_cache_dao import llm_cache_key, llm_output_cache
 
 class IndividualQuest(BaseModel):
     Name: str = Field(description="Name of the quest")
@@ -43,11 +42,68 @@ class schedule(BaseModel):
 class detailed_schedule(BaseModel):
     list_of_quests: list[IndividualQuest] = Field(description="List of quests for the student")
 
+class CourseWeek(BaseModel):
+    Week: int = Field(description="Week of the course")
+    Topics: str = Field(description="Topics taught in class that week")
+    Skills: str = Field(description="Skills students are expected to learn that week")
+
+class course_calendar(BaseModel):
+    list_of_weeks: list[CourseWeek] = Field(description="What is taught in each week of the course")
+
+def format_course_calendar(calendar) -> str:
+    """Render a period's stored course calendar as prompt text"""
+    return "\n".join(
+        f"Week {int(week['week'])}: {week['topics']} (skills: {week['skills']})"
+        for week in calendar.get("weeks", [])
+    )
+
+class CourseCalendarAgent:
+    """Derives what is taught each week from a period's course materials, once per period"""
+
+    def __init__(self, period, existing_calendar=None, new_files=None):
+        self.period = period
+        self.vector_store = period["vector_store_id"]
+
+        if existing_calendar and new_files:
+            # Incremental rebuild: revise the stored calendar with the new materials only
+            self.input = f"""Here is the current course calendar:
+{format_course_calendar(existing_calendar)}
+
+The teacher added these course files: {", ".join(new_files)}. Search them and update the calendar with anything they add or change. Keep the weeks they do not affect exactly as they are, and return all weeks."""
+        else:
+            self.input = f"Build the week-by-week course calendar for {period.get('course', 'this course')}."
+
+        self.calendar_agent = Agent(
+            name="Course Calendar Agent",
+            instructions="""
+                You read the course materials (syllabus, course schedule, module items) with file search and determine what is taught in class each week. There are 18 weeks in total.
+                For every week, list the topics covered in class and the skills students are expected to learn that week.
+                If the materials do not cover a week explicitly, infer it from the surrounding weeks and the order of the material.
+            """,
+            model="gpt-4.1",
+            tools=[
+                FileSearchTool(
+                    vector_store_ids=[self.vector_store]
+                )
+            ],
+            output_type=course_calendar
+        )
+
+    async def _run_async(self) -> course_calendar:
+        with trace("course_calendar_generation"):
+            result = await run_agent(self.calendar_agent, self.input)
+        return result.final_output
+
+    def run(self) -> course_calendar:
+        return agent_loop.run(self._run_async())
+
 class SchedulesAgent:
     def __init__(self, student, period, recommended_change=None):
         self.student = student
         self.period = period
         self.vector_store = period["vector_store_id"]
+        # Precomputed week -> topics map shared by every student in the period
+        self.course_calendar = period.get("course_calendar")
         
         # Base input for the agent
         base_input = f"""I'm {self.student["first_name"]} {self.student["last_name"]}. My strengths are {self.student["strength"]}, my weaknesses are {self.student["weakness"]}, my interests are {self.student["interest"]}, and my learning style is {self.student["learning_style"]}. My long-term goal is {self.student["long_term_goal"]}. I am in grade {self.student["grade"]}."""
@@ -69,6 +125,21 @@ class SchedulesAgent:
                 By the 18th week, the student will have accomplished their long term goal.
         """
         
+        if self.course_calendar:
+            # The calendar replaces file search for what is taught each week
+            instructions += f"""
+
+            The course calendar below already lists what is taught in class each week. Use it instead of searching the course files:
+            {format_course_calendar(self.course_calendar)}
+            """
+            tools = []
+        else:
+            tools = [
+                FileSearchTool(
+                    vector_store_ids=[self.vector_store]
+                )
+            ]
+
         # Add specific instructions for recommended changes
         if recommended_change:
             instructions += f"""
@@ -80,77 +151,98 @@ class SchedulesAgent:
             name="Schedules Agent",
             instructions=instructions,
             model="gpt-4.1",
-            tools=[
-                FileSearchTool(
-                    vector_store_ids=[self.vector_store]
-                )
-            ],
+            tools=tools,
             output_type=schedule
         )
 
+        guardrail_instructions = "You check if the weekly quests align with the materials taught in class for that corresponding week accurately and timely. If they do not, set approved to false and explain in feedback which weeks are misaligned and why."
+        if self.course_calendar:
+            guardrail_instructions += f"\n\nWhat is taught in class each week:\n{format_course_calendar(self.course_calendar)}"
+
         self.guardrial_agent = Agent(
             name="Guardrial Agent",
             handoff_description="You check if the weekly quests align with the materials taught in class accurately and timely. If not, you will handoff to the Schedules Agent.",
-            instructions="You check if the weekly quests align with the materials taught in class for that corresponding week accurately and timely. If not, you will handoff to the Schedules Agent.",
+            instructions=guardrail_instructions,
             model="gpt-4.1",
-            tools=[
-                FileSearchTool(
-                    vector_store_ids=[self.vector_store]
-                )
-            ]
+            tools=tools,
+            output_type=ScheduleReview
         )
+        self.guardrail = ScheduleGuardrail()
+        self.guardrail_decision = None
 
-    @output_guardrail()
-    async def guardrail(self, ctx: RunContextWrapper, agent: Agent, output: schedule) -> GuardrailFunctionOutput:
-        try:
-            result = await Runner.run(
-                self.guardrial_agent,
-                output.model_dump_json(),
-                context=ctx.context
-            )
-            if "approved" in result.response.lower():
-                return GuardrailFunctionOutput(output=output)
+    async def _model_check(self, output: schedule):
+        """Ask the checker agent whether the schedule matches what is taught each week"""
+        result = await run_agent(self.guardrial_agent, output.model_dump_json())
+        review = result.final_output
+        return review.approved, review.feedback
 
-            new_schedule = await Runner.run(
+    async def _run_async(self) -> schedule:
+        with trace("schedule_generation"):
+            result = await run_agent(
                 self.schedules_agent,
-                self.input,
-                context=ctx.context
-            )
-            if isinstance(new_schedule.output, schedule):
-                return GuardrailFunctionOutput(output=new_schedule.output)
-
-            raise OutputGuardrailTripwireTriggered(
-                message="Failed to regenerate aligned schedule",
-                original_output=output
-            )
-        except Exception as e:
-            raise OutputGuardrailTripwireTriggered(
-                message=f"Error in guardrail check: {str(e)}",
-                original_output=output
+                self.input
             )
+            output = result.final_output
 
-    async def _run_async(self) -> schedule:
-        with trace("schedule_generation") as span:
             with guardrail_span("schedule_guardrail"):
-                result = await Runner.run(
+                self.guardrail_decision = await self.guardrail.check(output, self.period, self._model_check)
+
+            if not self.guardrail_decision["approved"]:
+                # One regeneration with the reviewer's feedback; the retry is not checked again
+                print(f"Schedule rejected by guardrail: {self.guardrail_decision['feedback']}")
+                result = await run_agent(
                     self.schedules_agent,
-                    self.input
+                    f"{self.input}\n\nA reviewer rejected a previous schedule for these reasons: "
+                    f"{self.guardrail_decision['feedback']}. Make sure every week's quest practises what is taught in class that week."
                 )
-        return result.final_output
+                output = result.final_output
+        return output
 
     def run(self) -> schedule:
-        return asyncio.run(self._run_async())
+        return agent_loop.run(self._run_async())
+
+
+class CheckpointError(Exception):
+    """A quest was generated but HWAgent's on_quest_done callback failed to save it"""
+
 
 class HWAgent:
     """A simpler homework agent that generates instructions and rubrics directly"""
     
-    def __init__(self, student, period, schedule, timeout_seconds=300):
+    def __init__(self, student, period, schedule, timeout_seconds=300, on_quest_done=None,
+                 queue_timeout_seconds=1800):
         self.student = student
         self.period = period
         self.schedule = schedule
         self.vector_store = period["vector_store_id"]
+        # Counted from the first model call that gets an LLM scheduler slot, so time
+        # spent queued behind other students' jobs (e.g. a class onboarding) does not
+        # count; queue_timeout_seconds caps the wait for that first slot
         self.timeout_seconds = timeout_seconds
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.started = False
+        # Called with each IndividualQuest as soon as it is generated, so finished
+        # quests can be saved before the rest of the batch completes or times out
+        self.on_quest_done = on_quest_done
+        self.completed_quests = []
+        # (week, error) for quests that were generated but whose on_quest_done failed
+        self.failed_checkpoints = []
         
+    async def _cached_run(self, kind, agent, input, dump, load):
+        """
+        Run the agent unless an output for the same prompt and model is cached.
+        Unchanged quests and student profiles therefore cost no model calls
+        on reruns or refreshes.
+        """
+        cache_key = llm_cache_key(kind, agent.model, agent.instructions, input)
+        cached = await asyncio.to_thread(llm_output_cache.get, cache_key)
+        if cached is not None:
+            return load(cached)
+
+        result = await run_agent(agent, input)
+        await asyncio.to_thread(llm_output_cache.put, cache_key, kind, agent.model, dump(result.final_output))
+        return result.final_output
+
     async def generate_instructions(self, quest) -> str:
         """Generate detailed instructions for a quest"""
         with trace("generate_instructions"):
@@ -183,12 +275,13 @@ class HWAgent:
                 model="gpt-4o"
             )
             
-            result = await Runner.run(
+            return await self._cached_run(
+                "instructions",
                 instruction_agent,
-                f"Create detailed instructions for this quest: {quest_name} - Skills: {quest_skills}"
+                f"Create detailed instructions for this quest: {quest_name} - Skills: {quest_skills}",
+                dump=lambda output: output,
+                load=lambda cached: cached
             )
-            
-            return result.final_output
     
     async def generate_rubric(self, quest) -> Rubric:
         """Generate a rubric for a quest"""
@@ -225,12 +318,13 @@ class HWAgent:
                 output_type=Rubric
             )
             
-            result = await Runner.run(
+            return await self._cached_run(
+                "rubric",
                 rubric_agent,
-                f"Create a rubric for: {quest_name}"
+                f"Create a rubric for: {quest_name}",
+                dump=lambda output: output.model_dump(),
+                load=lambda cached: Rubric(**cached)
             )
-            
-            return result.final_output
     
     async def process_quest(self, quest) -> IndividualQuest:
         """Process a single quest to generate instructions and rubric"""
@@ -261,6 +355,19 @@ class HWAgent:
             )
             
             return individual_quest
+
+    async def _process_and_checkpoint(self, quest) -> IndividualQuest:
+        """Process a quest and hand the result to on_quest_done before returning it"""
+        individual_quest = await self.process_quest(quest)
+        if self.on_quest_done:
+            # The callback writes to the database; keep it off the event loop
+            try:
+                await asyncio.to_thread(self.on_quest_done, individual_quest)
+            except Exception as e:
+                self.failed_checkpoints.append((individual_quest.Week, str(e)))
+                raise CheckpointError(f"Quest for week {individual_quest.Week} was generated but not saved: {e}") from e
+        self.completed_quests.append(individual_quest)
+        return individual_quest
     
     async def _run_async(self) -> list[IndividualQuest]:
         """Process all quests in the schedule asynchronously"""
@@ -269,31 +376,56 @@ class HWAgent:
             print(f"Starting HWAgent - Processing {total_quests} quests in parallel")
             
             # Process all quests in parallel
-            tasks = [self.process_quest(quest) for quest in self.schedule]
+            tasks = [self._process_and_checkpoint(quest) for quest in self.schedule]
             detailed_quests = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Filter out exceptions and log errors
             successful_quests = []
             for i, result in enumerate(detailed_quests, 1):
-                if isinstance(result, Exception):
+                if isinstance(result, CheckpointError):
+                    print(f"✗ Error saving quest {i}: {str(result)}")
+                elif isinstance(result, Exception):
                     print(f"✗ Error processing quest {i}: {str(result)}")
                 else:
                     successful_quests.append(result)
                     print(f"✓ Completed quest {i}")
             
             print(f"\nHWAgent completed - Processed {len(successful_quests)}/{total_quests} quests successfully")
+            print(f"LLM scheduler: {llm_scheduler.stats()}")
+            print(f"LLM output cache hit rate: {llm_output_cache.hit_rate():.0%}")
             return successful_quests
 
+    async def _run_with_deadline(self) -> list[IndividualQuest]:
+        """Run _run_async, starting the timeout when the first model call gets a slot"""
+        first_slot = asyncio.Event()
+        with on_slot_acquired(first_slot.set):
+            # The task copies the context, so its model calls report back here
+            task = asyncio.ensure_future(self._run_async())
+        waiter = asyncio.ensure_future(first_slot.wait())
+        try:
+            await asyncio.wait({task, waiter}, timeout=self.queue_timeout_seconds,
+                               return_when=asyncio.FIRST_COMPLETED)
+            self.started = first_slot.is_set()
+            if not task.done() and not self.started:
+                raise asyncio.TimeoutError()
+            return await asyncio.wait_for(task, self.timeout_seconds)
+        finally:
+            waiter.cancel()
+            task.cancel()
+
     def run(self) -> list[IndividualQuest]:
         try:
-            return asyncio.run(
-                asyncio.wait_for(
-                    self._run_async(),
-                    timeout=self.timeout_seconds
+            return agent_loop.run(self._run_with_deadline())
+        except asyncio.TimeoutError:
+            if not self.started:
+                raise Exception(
+                    f"Homework generation was still waiting for an LLM slot after "
+                    f"{self.queue_timeout_seconds} seconds"
                 )
+            raise Exception(
+                f"Homework generation timed out after {self.timeout_seconds} seconds "
+                f"({len(self.completed_quests)}/{len(self.schedule)} quests completed)"
             )
-        except asyncio.TimeoutError:
-            raise Exception(f"Homework generation timed out after {self.timeout_seconds} seconds")
 
 # def run_agent(student, period_id):
 #     period = Period.get_period(period_id)
@@ -0,0 +1,102 @@
+import sys
+import os
+
+# Add the parent directory to Python path so we can import from eduquest-backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents import set_default_openai_client
+from openai import AsyncOpenAI
+import asyncio
+import concurrent.futures
+import threading
+
+try:
+    import h2  # noqa: F401  (httpx only speaks HTTP/2 when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Idle model API connections are kept open this long between agent runs
+AGENT_KEEPALIVE_SECONDS = float(os.getenv("AGENT_KEEPALIVE_SECONDS", "120"))
+AGENT_MAX_CONNECTIONS = int(os.getenv("AGENT_MAX_CONNECTIONS", "32"))
+
+
+def make_openai_client():
+    """AsyncOpenAI client with a keep-alive pool (HTTP/2 when available) for the agents SDK."""
+    import httpx
+
+    http_client = httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=AGENT_MAX_CONNECTIONS,
+            max_keepalive_connections=AGENT_MAX_CONNECTIONS,
+            keepalive_expiry=AGENT_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
+
+class AgentLoop:
+    """
+    One long-lived event loop per worker process, on its own thread.
+
+    Sync code (routes, job threads) submits agent coroutines with run(); they
+    all share the loop and therefore the async model client and its warm
+    connection pool, instead of asyncio.run() building both from scratch on
+    every call.
+    """
+
+    def __init__(self, client_factory=None):
+        self.client_factory = client_factory
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            # A forked worker inherits the parent's loop object but not its thread
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._run_forever, args=(loop,), name="agent-loop", daemon=True)
+            thread.start()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            if self.client_factory:
+                # Created here so the client's pool belongs to this process's loop
+                set_default_openai_client(self.client_factory())
+            return loop
+
+    @staticmethod
+    def _run_forever(loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def run(self, coro, timeout=None):
+        """
+        Run `coro` on the shared loop and block until it finishes.
+        On timeout the coroutine is cancelled and asyncio.TimeoutError is raised.
+        """
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AgentLoop.run() called from the agent loop itself; await the coroutine instead")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise asyncio.TimeoutError()
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None and self._thread.is_alive():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+            self._loop = self._thread = self._pid = None
+
+
+# One loop per worker process, shared by every agent
+agent_loop = AgentLoop(client_factory=make_openai_client)
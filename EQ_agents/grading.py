@@ -24,6 +24,8 @@ from typing import Dict, Any
 import asyncio
 from models.period import Period
 from models.rubric import Rubric, Scale
+from EQ_agents.llm_scheduler import run_agent
+from EQ_agents.agent_loop import agent_loop
 
 class GradingAgent:
     def __init__(self, student, period, quest, submission, timeout_seconds=300):
@@ -32,6 +34,7 @@ class GradingAgent:
         self.quest = quest
         self.submission = submission
         self.timeout_seconds = timeout_seconds
+        self.vector_store = period["vector_store_id"]
         self.grading_agent = Agent(
             name="Grading Agent",
             instructions="You are a grading agent that grades a student's quest submission.",
@@ -41,4 +44,13 @@ class GradingAgent:
                     vector_store_ids=[self.vector_store])])
 
     async def grade_quest(self, quest):
-        pass
\ No newline at end of file
+        """Grade the submission against the quest's rubric"""
+        with trace("grade_quest"):
+            result = await run_agent(
+                self.grading_agent,
+                f"Quest: {json.dumps(quest, default=str)}\n\nSubmission: {self.submission}"
+            )
+            return result.final_output
+
+    def run(self):
+        return agent_loop.run(self.grade_quest(self.quest), timeout=self.timeout_seconds)
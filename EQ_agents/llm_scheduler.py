@@ -0,0 +1,290 @@
+import sys
+import os
+
+# Add the parent directory to Python path so we can import from eduquest-backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents import Runner
+from collections import deque
+import asyncio
+import contextlib
+import contextvars
+import random
+import re
+import threading
+import time
+
+# Caps on model calls in flight across the whole worker process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MODEL_CONCURRENCY = int(os.getenv("LLM_MODEL_CONCURRENCY", "8"))
+# Requests per minute allowed for each model (token bucket)
+LLM_MODEL_RPM = int(os.getenv("LLM_MODEL_RPM", "300"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "60.0"))
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503)
+RATE_LIMIT_RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+
+# Set while a coroutine holds a slot, so a nested call (e.g. a guardrail that
+# runs inside an agent run) reuses it instead of waiting on its own caller
+_holding_slot = contextvars.ContextVar("llm_holding_slot", default=False)
+# See on_slot_acquired
+_slot_acquired_callback = contextvars.ContextVar("llm_slot_acquired_callback", default=None)
+
+
+@contextlib.contextmanager
+def on_slot_acquired(callback):
+    """
+    Call `callback()` whenever a model call started in this context (or in
+    tasks created inside it) gets its slots, i.e. stops waiting in the queue.
+    """
+    token = _slot_acquired_callback.set(callback)
+    try:
+        yield
+    finally:
+        _slot_acquired_callback.reset(token)
+
+
+def parse_model_limits(value):
+    """Parse "gpt-4o=8,gpt-4.1=4" into {"gpt-4o": 8, "gpt-4.1": 4}."""
+    limits = {}
+    for part in (value or "").split(","):
+        if "=" in part:
+            model, limit = part.split("=", 1)
+            limits[model.strip()] = int(limit)
+    return limits
+
+
+def parse_reset_duration(value):
+    """Seconds in an OpenAI reset header such as "1s", "6m0s" or "120ms"; None if unparseable."""
+    if not value:
+        return None
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+
+def retry_after_seconds(error):
+    """How long the API asked us to wait, read from the error's response headers."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    delays = [parse_reset_duration(headers.get(name)) for name in ("retry-after",) + RATE_LIMIT_RESET_HEADERS]
+    delays = [delay for delay in delays if delay is not None]
+    return max(delays) if delays else None
+
+
+def is_retryable(error):
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class _Slots:
+    """
+    Counting semaphore shared by every agent call in the process. Agent runs
+    are submitted from many job threads onto the shared agent loop (see
+    agent_loop), and waiters are woken with call_soon_threadsafe on whichever
+    loop they wait on, so the caps also hold for a caller that awaits on a
+    loop of its own.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self):
+        return len(self._waiters)
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            # A slot already handed over must be passed on; a grant still in
+            # flight is passed on by _grant when it finds the future cancelled
+            if not queued and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self.in_use -= 1
+                return
+            # The slot moves straight to the next waiter; in_use is unchanged
+            loop, future = self._waiters.popleft()
+        loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future):
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class _TokenBucket:
+    """Requests-per-minute limit that can be paused when the API reports a rate limit."""
+
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate)  # allow a burst of up to one second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class LLMScheduler:
+    """
+    Shared gate for agent model calls.
+
+    Every call waits for a global slot, a slot for its model and a token from
+    the model's rate bucket. 429/5xx responses are retried with jittered
+    exponential backoff that honours the API's retry-after and rate-limit
+    reset headers, and a 429 pauses the model's bucket so queued calls back
+    off together instead of retrying in a storm.
+    """
+
+    def __init__(self, max_concurrency=None, model_concurrency=None, model_rpm=None,
+                 max_retries=None, base_delay=None, max_delay=None):
+        self.global_slots = _Slots(max_concurrency or LLM_MAX_CONCURRENCY)
+        self.model_concurrency = model_concurrency or parse_model_limits(os.getenv("LLM_MODEL_CONCURRENCY_OVERRIDES"))
+        self.model_rpm = model_rpm or parse_model_limits(os.getenv("LLM_MODEL_RPM_OVERRIDES"))
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = LLM_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = LLM_RETRY_MAX_DELAY if max_delay is None else max_delay
+        self._models = {}
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def _model(self, model):
+        with self._lock:
+            if model not in self._models:
+                self._models[model] = (
+                    _Slots(self.model_concurrency.get(model, LLM_MODEL_CONCURRENCY)),
+                    _TokenBucket(self.model_rpm.get(model, LLM_MODEL_RPM)),
+                )
+            return self._models[model]
+
+    def _backoff(self, attempt, error):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = max(delay, min(self.max_delay, retry_after_seconds(error) or 0))
+        return delay * random.uniform(1.0, 1.5)
+
+    async def submit(self, model, call):
+        """Run `call()` (a coroutine factory) under the limits for `model` and return its result."""
+        if _holding_slot.get():
+            return await self._call_with_retries(model, call, None)
+
+        # The model slot is taken first so calls queued behind a busy model
+        # do not hold global slots that other models could use
+        model_slots, bucket = self._model(model)
+        await model_slots.acquire()
+        try:
+            await self.global_slots.acquire()
+            try:
+                callback = _slot_acquired_callback.get()
+                if callback is not None:
+                    callback()
+                token = _holding_slot.set(True)
+                try:
+                    return await self._call_with_retries(model, call, bucket)
+                finally:
+                    _holding_slot.reset(token)
+            finally:
+                self.global_slots.release()
+        finally:
+            model_slots.release()
+
+    async def _call_with_retries(self, model, call, bucket):
+        for attempt in range(self.max_retries + 1):
+            if bucket:
+                await bucket.acquire()
+            try:
+                result = await call()
+                self.completed += 1
+                return result
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.failed += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                self.retries += 1
+                if getattr(e, "status_code", None) == 429:
+                    self.rate_limited += 1
+                    if bucket:
+                        bucket.pause(delay)
+                print(f"LLM call to {model} failed with {getattr(e, 'status_code', None)}, "
+                      f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+
+    def stats(self):
+        """Queue depth and counters, for logs and health checks."""
+        with self._lock:
+            models = dict(self._models)
+        return {
+            "running": self.global_slots.in_use,
+            "queued": self.global_slots.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "models": {
+                model: {"running": slots.in_use, "queued": slots.waiting}
+                for model, (slots, _) in models.items()
+            },
+        }
+
+
+# One scheduler per worker process, shared by every agent
+llm_scheduler = LLMScheduler()
+
+
+async def run_agent(agent, input, **kwargs):
+    """Runner.run(agent, input) through the shared scheduler."""
+    return await llm_scheduler.submit(agent.model, lambda: Runner.run(agent, input, **kwargs))
@@ -0,0 +1,209 @@
+import sys
+import os
+
+# Add the parent directory to Python path so we can import from eduquest-backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from collections import OrderedDict, deque
+from pydantic import BaseModel, Field
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+# always: check every schedule; sampled: check SCHEDULE_GUARDRAIL_SAMPLE_RATE of them;
+# cache_miss: check each (period, schedule) once; off: never check
+GUARDRAIL_POLICIES = ("always", "sampled", "cache_miss", "off")
+SCHEDULE_GUARDRAIL_POLICY = os.getenv("SCHEDULE_GUARDRAIL_POLICY", "cache_miss").lower()
+SCHEDULE_GUARDRAIL_SAMPLE_RATE = float(os.getenv("SCHEDULE_GUARDRAIL_SAMPLE_RATE", "0.2"))
+SCHEDULE_GUARDRAIL_CACHE_TTL = float(os.getenv("SCHEDULE_GUARDRAIL_CACHE_TTL", str(24 * 3600)))
+# Share of weeks whose quest may miss that week's topics before a schedule is rejected
+MAX_MISALIGNED_WEEKS = float(os.getenv("SCHEDULE_GUARDRAIL_MAX_MISALIGNED", "0.25"))
+
+STOPWORDS = {"about", "with", "that", "this", "their", "from", "into", "using", "will", "your",
+             "week", "weeks", "quest", "skills", "skill", "students", "student", "learn", "practice"}
+
+
+class ScheduleReview(BaseModel):
+    approved: bool = Field(description="True if every quest matches what is taught in class that week")
+    feedback: str = Field(description="Which weeks are misaligned and why; empty if approved")
+
+
+def _keywords(text):
+    words = re.findall(r"[a-z0-9]+", str(text).lower())
+    return {re.sub(r"(ing|ed|es|s)$", "", word) for word in words if len(word) > 3 and word not in STOPWORDS}
+
+
+def _field(quest, name):
+    return quest.get(name) if isinstance(quest, dict) else getattr(quest, name, None)
+
+
+def check_against_week_map(quests, calendar):
+    """
+    Deterministic check of a schedule against the period's course calendar:
+    one quest per calendar week, and each quest shares at least one keyword
+    with what is taught that week. Returns (approved, feedback).
+    """
+    weeks = {int(week["week"]): week for week in calendar.get("weeks", [])}
+    quest_weeks = [int(_field(quest, "Week")) for quest in quests]
+    problems = []
+
+    duplicates = sorted({week for week in quest_weeks if quest_weeks.count(week) > 1})
+    if duplicates:
+        problems.append(f"more than one quest for weeks {duplicates}")
+    missing = sorted(set(weeks) - set(quest_weeks))
+    if missing:
+        problems.append(f"no quest for weeks {missing}")
+    extra = sorted(set(quest_weeks) - set(weeks))
+    if extra:
+        problems.append(f"weeks {extra} are not in the course calendar")
+
+    misaligned = []
+    for quest in quests:
+        week = weeks.get(int(_field(quest, "Week")))
+        if week is None:
+            continue
+        taught = _keywords(f"{week.get('topics', '')} {week.get('skills', '')}")
+        practised = _keywords(f"{_field(quest, 'Name')} {_field(quest, 'Skills')}")
+        if taught and not taught & practised:
+            misaligned.append(int(_field(quest, "Week")))
+    if weeks and len(misaligned) > MAX_MISALIGNED_WEEKS * len(weeks):
+        problems.append(f"quests for weeks {sorted(misaligned)} do not practise what is taught that week")
+
+    return not problems, "; ".join(problems)
+
+
+def _digest(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def schedule_cache_key(period_id, schedule, calendar=None):
+    """
+    Key of a guardrail decision. It includes the version of the period's
+    course calendar, so decisions made against an older week map (or
+    before there was one) are not reused after the calendar is rebuilt.
+    """
+    payload = schedule.model_dump() if hasattr(schedule, "model_dump") else schedule
+    calendar_version = _digest(calendar.get("weeks", []))[:16] if calendar else "none"
+    return f"{period_id}:{calendar_version}:{_digest(payload)}"
+
+
+class GuardrailCache:
+    """Bounded TTL/LRU cache of (period, schedule hash) -> guardrail decision."""
+
+    def __init__(self, max_size=1024, ttl=SCHEDULE_GUARDRAIL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, decision)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, key, decision):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, dict(decision))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class GuardrailStats:
+    """Counts and total time per decision method, plus the most recent decisions."""
+
+    def __init__(self, recent=100):
+        self.recent = deque(maxlen=recent)
+        self.by_method = {}
+        self._lock = threading.Lock()
+
+    def record(self, decision):
+        with self._lock:
+            self.recent.append(decision)
+            stats = self.by_method.setdefault(decision["method"], {"count": 0, "rejected": 0, "total_ms": 0.0})
+            stats["count"] += 1
+            stats["rejected"] += 0 if decision["approved"] else 1
+            stats["total_ms"] += decision["elapsed_ms"]
+
+    def snapshot(self):
+        with self._lock:
+            return {method: dict(stats) for method, stats in self.by_method.items()}
+
+
+guardrail_cache = GuardrailCache()
+guardrail_stats = GuardrailStats()
+
+
+class ScheduleGuardrail:
+    """
+    Decides whether a generated schedule needs checking and how.
+
+    A cached decision for the same (period, schedule) is reused unless the
+    policy is "always". With a course calendar the check is deterministic
+    and free; otherwise `model_check` (an async callable returning
+    (approved, feedback)) runs, subject to sampling. Every decision is
+    timed and recorded in guardrail_stats.
+    """
+
+    def __init__(self, policy=None, sample_rate=None, cache=None, stats=None):
+        self.policy = (policy or SCHEDULE_GUARDRAIL_POLICY).lower()
+        if self.policy not in GUARDRAIL_POLICIES:
+            raise ValueError(f"Unknown schedule guardrail policy: {self.policy}")
+        self.sample_rate = SCHEDULE_GUARDRAIL_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.cache = cache or guardrail_cache
+        self.stats = stats or guardrail_stats
+
+    async def check(self, schedule, period, model_check):
+        """Return the decision dict: approved, feedback, method, elapsed_ms, policy."""
+        started = time.perf_counter()
+        key = schedule_cache_key(period.get("period_id"), schedule, period.get("course_calendar"))
+        decision = None
+
+        if self.policy == "off":
+            decision = {"approved": True, "feedback": "", "method": "off"}
+        elif self.policy != "always":
+            cached = self.cache.get(key)
+            if cached is not None:
+                decision = {"approved": cached["approved"], "feedback": cached["feedback"], "method": "cache"}
+
+        if decision is None:
+            calendar = period.get("course_calendar")
+            if calendar:
+                approved, feedback = check_against_week_map(schedule.list_of_quests, calendar)
+                decision = {"approved": approved, "feedback": feedback, "method": "week_map"}
+            elif self.policy == "sampled" and random.random() >= self.sample_rate:
+                decision = {"approved": True, "feedback": "", "method": "not_sampled"}
+            else:
+                try:
+                    approved, feedback = await model_check(schedule)
+                    decision = {"approved": approved, "feedback": feedback, "method": "model"}
+                except Exception as e:
+                    # A failed check must not throw away a schedule that was already paid for
+                    print(f"Schedule guardrail check failed, keeping the schedule: {e}")
+                    decision = {"approved": True, "feedback": f"check failed: {e}", "method": "error"}
+            if decision["method"] not in ("not_sampled", "error"):
+                self.cache.put(key, decision)
+
+        decision["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        decision["policy"] = self.policy
+        self.stats.record(decision)
+        print(f"Schedule guardrail: {decision['method']} -> "
+              f"{'approved' if decision['approved'] else 'rejected'} in {decision['elapsed_ms']} ms")
+        return decision
@@ -12,6 +12,7 @@ from routes.teacher.routes import teacher_bp
 from routes.enrollment.routes import enrollment_bp
 from routes.quest.routes import quest_bp
 from routes.waitlist.routes import waitlist_bp
+from routes.auth_context import load_request_session
 from datetime import timedelta
 
 # Load environment variables from .env file
@@ -67,6 +68,9 @@ CORS(app, resources={r"/*": {
     "supports_credentials": True
 }})
 
+# Resolve the caller's auth token and session once per request, for every blueprint
+app.before_request(load_request_session)
+
 # Register Blueprints
 app.register_blueprint(conversation_bp, url_prefix='/conversation')
 app.register_blueprint(auth_bp, url_prefix='/auth')
@@ -6,6 +6,9 @@ import json
 from dotenv import load_dotenv
 from openai.types.shared_params.response_format_json_schema import ResponseFormatJSONSchema
 import decimal
+import hashlib
+import threading
+from collections import OrderedDict
 
 def convert_decimal(obj):
     if isinstance(obj, list):
@@ -28,41 +31,294 @@ pre_calc = {
 }
 
 
+# Run waiting shared by every assistant wrapper below.
+# Runs are streamed so the reply arrives as soon as the run finishes; if the
+# stream cannot be opened or drops, the run is polled with backoff instead.
+RUN_TIMEOUT = float(os.getenv("ASSISTANT_RUN_TIMEOUT", "300"))
+RUN_STREAMING = os.getenv("ASSISTANT_RUN_STREAMING", "true").lower() == "true"
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 2.0
+TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled", "expired", "incomplete", "requires_action")
+
+
+class RunFailedError(Exception):
+    """An assistant run ended in a status other than completed."""
+
+    def __init__(self, status, last_error=None):
+        self.status = status
+        self.last_error = last_error
+        detail = f": {last_error.code} - {last_error.message}" if last_error else ""
+        super().__init__(f"Run failed with status: {status}{detail}")
+
+
+class RunTimeoutError(RunFailedError):
+    """An assistant run did not finish before its deadline and was cancelled."""
+
+    def __init__(self, timeout):
+        self.status = "timeout"
+        self.last_error = None
+        Exception.__init__(self, f"Run did not finish within {timeout:.0f} seconds")
+
+
+def _cancel_run(thread_id, run_id):
+    try:
+        openai.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+    except Exception as e:
+        print(f"Warning: could not cancel run {run_id}: {e}")
+
+
+def _check_run(thread_id, run):
+    if run.status == "requires_action":
+        # The run stays active until it expires and blocks new runs on the thread
+        _cancel_run(thread_id, run.id)
+    if run.status != "completed":
+        raise RunFailedError(run.status, getattr(run, "last_error", None))
+    return run
+
+
+def wait_for_run(thread_id, run_id, timeout=RUN_TIMEOUT, deadline=None):
+    """
+    Poll an existing run until it reaches a terminal status, backing off from
+    POLL_INITIAL_DELAY to POLL_MAX_DELAY. Past the deadline the run is
+    cancelled and RunTimeoutError raised. Returns the final run without
+    checking its status.
+    """
+    deadline = deadline or time.monotonic() + timeout
+    delay = POLL_INITIAL_DELAY
+    while True:
+        run = openai.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
+        if run.status in TERMINAL_RUN_STATUSES:
+            return run
+        if time.monotonic() + delay > deadline:
+            _cancel_run(thread_id, run_id)
+            raise RunTimeoutError(timeout)
+        time.sleep(delay)
+        delay = min(delay * 1.5, POLL_MAX_DELAY)
+
+
+def _last_message_text(thread_id):
+    messages = openai.beta.threads.messages.list(thread_id=thread_id, limit=1)
+    return messages.data[0].content[0].text.value
+
+
+def run_assistant(thread_id, assistant_id, timeout=RUN_TIMEOUT, on_text_delta=None):
+    """
+    Run an assistant on a thread and return the text of its reply.
+
+    :param on_text_delta: Optional callback receiving each chunk of reply text
+                          as it is streamed.
+    Raises RunFailedError if the run fails, is cancelled, expires or needs
+    tool output, and RunTimeoutError if it is still running after `timeout`.
+    """
+    deadline = time.monotonic() + timeout
+    run_id = None
+    streamed = ""
+    if RUN_STREAMING:
+        try:
+            with openai.beta.threads.runs.stream(
+                thread_id=thread_id, assistant_id=assistant_id, timeout=timeout
+            ) as stream:
+                for event in stream:
+                    if event.event == "thread.run.created":
+                        run_id = event.data.id
+                    elif event.event == "thread.message.delta" and on_text_delta:
+                        for block in event.data.delta.content or []:
+                            if block.type == "text" and block.text and block.text.value:
+                                streamed += block.text.value
+                                on_text_delta(block.text.value)
+                    if run_id and time.monotonic() > deadline:
+                        _cancel_run(thread_id, run_id)
+                        raise RunTimeoutError(timeout)
+                _check_run(thread_id, stream.get_final_run())
+                for message in reversed(stream.get_final_messages()):
+                    if message.role == "assistant" and message.content:
+                        return message.content[0].text.value
+            return _last_message_text(thread_id)
+        except RunFailedError:
+            raise
+        except Exception as e:
+            # Deltas already sent are not replayed; the rest of the polled reply follows them
+            print(f"Run stream interrupted, falling back to polling: {e}")
+
+    if run_id is None:
+        run_id = openai.beta.threads.runs.create(thread_id=thread_id, assistant_id=assistant_id).id
+    _check_run(thread_id, wait_for_run(thread_id, run_id, timeout, deadline))
+    response = _last_message_text(thread_id)
+    # Send the part of the polled reply that was not streamed, so callers that
+    # join the deltas (e.g. to parse the JSON reply) still see all of it
+    if on_text_delta and response.startswith(streamed) and len(response) > len(streamed):
+        on_text_delta(response[len(streamed):])
+    return response
+
+
+class AssistantCache:
+    """
+    Bounded TTL cache of assistant_id -> Assistant object, filled lazily.
+    Runs only need the assistant ID, so the wrappers below never retrieve an
+    assistant unless something reads its metadata (name, model, tools, ...).
+    """
+
+    def __init__(self, max_size=256, ttl=600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # assistant_id -> (expires_at, assistant)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, assistant_id):
+        with self._lock:
+            entry = self._entries.get(assistant_id)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(assistant_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        assistant = openai.beta.assistants.retrieve(assistant_id)
+        with self._lock:
+            self._entries[assistant_id] = (time.time() + self.ttl, assistant)
+            self._entries.move_to_end(assistant_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return assistant
+
+    def invalidate(self, assistant_id):
+        with self._lock:
+            self._entries.pop(assistant_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+assistant_cache = AssistantCache(ttl=float(os.getenv("ASSISTANT_CACHE_TTL", "600")))
+
+
+UPLOAD_PREFIX = "eduquest-"
+# Reuse an uploaded payload for UPLOAD_REUSE_TTL; delete it once it is UPLOAD_MAX_AGE old.
+# The gap leaves conversations started from a reused file time to finish.
+UPLOAD_REUSE_TTL = float(os.getenv("OPENAI_UPLOAD_REUSE_TTL", str(12 * 3600)))
+UPLOAD_MAX_AGE = float(os.getenv("OPENAI_UPLOAD_MAX_AGE", str(48 * 3600)))
+
+
+class UploadCache:
+    """
+    Content-addressed cache of sha256(payload) -> uploaded OpenAI file, so an
+    unchanged student profile or quest list is uploaded once and reused.
+    """
+
+    def __init__(self, max_size=2048, ttl=UPLOAD_REUSE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # digest -> (expires_at, file)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= time.time():
+                self._entries.pop(digest, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, digest, uploaded):
+        with self._lock:
+            self._entries[digest] = (time.time() + self.ttl, uploaded)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard_file(self, file_id):
+        with self._lock:
+            for digest, (_, uploaded) in list(self._entries.items()):
+                if uploaded.id == file_id:
+                    del self._entries[digest]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+upload_cache = UploadCache()
+
+
+def upload_json(kind, payload):
+    """
+    Upload a JSON payload for file_search straight from memory, reusing the
+    existing file when the same content was uploaded recently.
+    Returns the OpenAI file object.
+    """
+    data = json.dumps(payload, indent=2, sort_keys=True, default=str).encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    uploaded = upload_cache.get(digest)
+    if uploaded is None:
+        uploaded = openai.files.create(
+            file=(f"{UPLOAD_PREFIX}{kind}-{digest[:16]}.json", data, "application/json"),
+            purpose="assistants"
+        )
+        upload_cache.put(digest, uploaded)
+    return uploaded
+
+
+def delete_expired_uploads(max_age=UPLOAD_MAX_AGE):
+    """
+    Delete payload files uploaded by upload_json that are older than max_age
+    seconds. Run periodically (scripts/gc_openai_files.py). Returns the
+    number of files deleted.
+    """
+    cutoff = time.time() - max_age
+    deleted = 0
+    for uploaded in openai.files.list(purpose="assistants"):
+        if not (uploaded.filename or "").startswith(UPLOAD_PREFIX) or uploaded.created_at > cutoff:
+            continue
+        try:
+            openai.files.delete(uploaded.id)
+            upload_cache.discard_file(uploaded.id)
+            deleted += 1
+        except Exception as e:
+            print(f"Warning: could not delete file {uploaded.id}: {e}")
+    return deleted
+
+
+class AssistantBacked:
+    """Base for wrappers that run one assistant; only its ID is needed up front."""
+    assistant_id = None
+
+    @property
+    def assistant(self):
+        return assistant_cache.get(self.assistant_id)
+
+
+
 # if student
 
 
 def summarize_conversation(thread_id):  # will return two pd_dataframe(student_profile and quests)
-    # Retrieve the summarization assistant
-    assistant = openai.beta.assistants.retrieve("asst_IMuSxVprkgtBXH3xLXjMAvtB")
-    thread = openai.beta.threads.retrieve(thread_id)
-    thread_id = thread.id
+    # The summarization assistant is run by ID; nothing needs to be retrieved first
+    assistant_id = "asst_IMuSxVprkgtBXH3xLXjMAvtB"
 
     content = "Extract the student user (including strengths, weaknesses, interests, learning-style and long-term goal), and the 36 quests from previous conversation. "
 
     message = openai.beta.threads.messages.create(thread_id=thread_id, role="user", content=content)
-    run = openai.beta.threads.runs.create(
-        thread_id=thread_id,
-        assistant_id=assistant.id
-    )
-    run_id = run.id
-    while True:
-        run_status = openai.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
-        # print(f"Run status: {run_status.status}")
-        if run_status.status == 'completed':
-            break
-        time.sleep(1)
-    messages = openai.beta.threads.messages.list(thread_id=thread_id)
-    last_message = messages.data[0]
-    response = last_message.content[0].text.value
+    response = run_assistant(thread_id, assistant_id)
 
     return response
 
 
-class ini_conv:
+class ini_conv(AssistantBacked):
     def __init__(self, student, thread_id=None):
         self.student = student
         self.thread_id = thread_id
-        self.assistant = openai.beta.assistants.retrieve("asst_bmsuvfNCaHJYmqTlnT52AzXE")
+        self.assistant_id = "asst_bmsuvfNCaHJYmqTlnT52AzXE"
 
     def initiate(self):
         thread = openai.beta.threads.create()
@@ -70,24 +326,8 @@ class ini_conv:
         self.thread_id = thread.id
         # Send the initial message to the thread
         message = openai.beta.threads.messages.create(thread_id=self.thread_id, role="user", content=initial_message)
-        # Create a run to get the assistant's response
-        run = openai.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id="asst_bmsuvfNCaHJYmqTlnT52AzXE"  # Pass the assistant ID as a string
-        )
-        run_id = run.id
-
-        while True:
-            run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-            # print(f"Run status: {run_status.status}")
-            if run_status.status == 'completed':
-                break
-            time.sleep(1)  # Wait for 1 second before checking again
-
-            # Get messages once the run is completed
-        messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-        last_message = messages.data[0]
-        response = last_message.content[0].text.value
+        # Run the assistant and wait for its response
+        response = run_assistant(self.thread_id, self.assistant_id)
         # self.conversation_log.append({"role": "assistant", "content": response})
 
         response_dict = json.loads(response)
@@ -95,7 +335,7 @@ class ini_conv:
 
         return response_dict
 
-    def cont_conv(self, user_input):
+    def cont_conv(self, user_input, on_text_delta=None):
         # self.conversation_log.append({"role": "user", "content": user_input})
         """"Returns message or updated student profile, + boolean indicating if the student profile is complete"""
         message = openai.beta.threads.messages.create(
@@ -103,22 +343,7 @@ class ini_conv:
             role="user",
             content=user_input
         )
-        run = openai.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id=self.assistant.id
-        )
-        run_id = run.id
-
-        while True:
-            run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-            # print(f"Run status: {run_status.status}")
-            if run_status.status == 'completed':
-                break
-            time.sleep(1)  # Wait for 1 second before checking again
-
-        messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-        last_message = messages.data[0]
-        response = last_message.content[0].text.value
+        response = run_assistant(self.thread_id, self.assistant_id, on_text_delta=on_text_delta)
         # self.conversation_log.append({"role": "assistant", "content": response})
         return_message = json.loads(response)
 
@@ -139,11 +364,11 @@ class ini_conv:
             return return_message['response'], True, profile
 
 
-class ltg:
+class ltg(AssistantBacked):
     def __init__(self, student, assistant_id):
         self.student = student
         self.thread_id = None
-        self.assistant = openai.beta.assistants.retrieve(assistant_id)
+        self.assistant_id = assistant_id
 
     def initiate(self):
         thread = openai.beta.threads.create()
@@ -161,24 +386,8 @@ class ltg:
         self.thread_id = thread.id
         # Send the initial message to the thread
         message = openai.beta.threads.messages.create(thread_id=self.thread_id, role="user", content=initial_message)
-        # Create a run to get the assistant's response
-        run = openai.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id=self.assistant.id
-        )
-        run_id = run.id
-
-        while True:
-            run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-            if run_status.status == 'completed':
-                break
-            elif run_status.status in ['failed', 'cancelled', 'expired']:
-                raise Exception(f"Run failed with status: {run_status.status}")
-            time.sleep(1)
-        
-        messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-        last_message = messages.data[0]
-        response = last_message.content[0].text.value
+        # Run the assistant and wait for its response
+        response = run_assistant(self.thread_id, self.assistant_id)
         # self.conversation_log.append({"role": "assistant", "content": response})
         return_message = json.loads(response)
         return_message["thread_id"] = self.thread_id
@@ -202,7 +411,7 @@ class ltg:
         #         "error": "Failed to parse response as JSON"
             # }
 
-    def cont_conv(self, user_input):
+    def cont_conv(self, user_input, on_text_delta=None):
         try:
             # Check for active runs first
             runs = openai.beta.threads.runs.list(thread_id=self.thread_id)
@@ -212,34 +421,14 @@ class ltg:
                 print(f"Found {len(active_runs)} active runs, waiting for completion...")
                 # Wait for active runs to complete
                 for run in active_runs:
-                    while True:
-                        run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run.id)
-                        if run_status.status in ['completed', 'failed', 'cancelled', 'expired']:
-                            break
-                        time.sleep(1)
+                    wait_for_run(self.thread_id, run.id)
             
             message = openai.beta.threads.messages.create(
                 thread_id=self.thread_id,
                 role="user",
                 content=user_input
             )
-            run = openai.beta.threads.runs.create(
-                thread_id=self.thread_id,
-                assistant_id=self.assistant.id
-            )
-            run_id = run.id
-
-            while True:
-                run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-                if run_status.status == 'completed':
-                    break
-                elif run_status.status in ['failed', 'cancelled', 'expired']:
-                    raise Exception(f"Run failed with status: {run_status.status}")
-                time.sleep(1)
-            
-            messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-            last_message = messages.data[0]
-            response = last_message.content[0].text.value
+            response = run_assistant(self.thread_id, self.assistant_id, on_text_delta=on_text_delta)
             print(f"\nRaw LTG Assistant Response: {response}")
             
             try:
@@ -266,48 +455,18 @@ class ltg:
             return f"Sorry, I encountered an error: {str(e)}", False
 
 
-class update:
+class update(AssistantBacked):
     def __init__(self, assistant_id, student, quests, instructor, week=None, submission=None, thread_id=None):
-        student = convert_decimal(student)
-        temp_student_file = "student.json"
-        with open(temp_student_file, "w") as f:
-            json.dump(student, f, indent=2)
-        self.student = openai.files.create(
-            file=open(temp_student_file, "rb"),
-            purpose="assistants"
-        )
-
-
-        # Clean up the temporary file
-
-        os.remove(temp_student_file)
-        # Create a temporary file with quests data
-        temp_quests_file = "temp_quests.json"
-
+        self.student = upload_json("student", convert_decimal(student))
         try:
             # Convert Decimal objects to float before JSON serialization
             quests_converted = convert_decimal(quests) if quests else None
-            
-            with open(temp_quests_file, "w") as f:
-                json.dump(quests_converted, f, indent=2)
-            self.quests = openai.files.create(
-                file=open(temp_quests_file, "rb"),
-                purpose="assistants"
-            )
+            self.quests = upload_json("quests", quests_converted)
         except Exception as e:
             print(f"Error creating quests file: {e}")
             raise Exception(f"Failed to create quests file: {e}")
-        finally:
-            # Clean up the temporary file
-            try:
-                if os.path.exists(temp_quests_file):
-                    os.remove(temp_quests_file)
-                if os.path.exists(temp_student_file):
-                    os.remove(temp_student_file)
-            except Exception as e:
-                print(f"Warning: Could not remove temporary file {temp_quests_file}: {e}")
-
-        self.assistant = openai.beta.assistants.retrieve(assistant_id)
+
+        self.assistant_id = assistant_id
         self.conversation_log = []
         self.instructor = bool(instructor)
         self.thread_id = thread_id  # Set thread_id if provided
@@ -366,24 +525,8 @@ class update:
                 ]
             )
 
-        # Create a run to get the assistant's response
-        run = openai.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id=self.assistant.id
-        )
-        run_id = run.id
-
-        while True:
-            run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-            # print(f"Run status: {run_status.status}")
-            if run_status.status == 'completed':
-                break
-            time.sleep(1)  # Wait for 1 second before checking again
-
-            # Get messages once the run is completed
-        messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-        last_message = messages.data[0]
-        response = last_message.content[0].text.value
+        # Run the assistant and wait for its response
+        response = run_assistant(self.thread_id, self.assistant_id)
         # print(f"EduQuest: {messages}")
         # print(f"Response: {response}")
         self.conversation_log.append({"role": "assistant", "content": response})
@@ -408,29 +551,14 @@ class update:
             # Return plain text for both instructor and student if JSON parsing fails
             return response
 
-    def cont_conv(self, user_input):
+    def cont_conv(self, user_input, on_text_delta=None):
         self.conversation_log.append({"role": "user", "content": user_input})
         message = openai.beta.threads.messages.create(
             thread_id=self.thread_id,
             role="user",
             content=user_input
         )
-        run = openai.beta.threads.runs.create(
-            thread_id=self.thread_id,
-            assistant_id=self.assistant.id
-        )
-        run_id = run.id
-
-        while True:
-            run_status = openai.beta.threads.runs.retrieve(thread_id=self.thread_id, run_id=run_id)
-            # print(f"Run status: {run_status.status}")
-            if run_status.status == 'completed':
-                break
-            time.sleep(1)  # Wait for 1 second before checking again
-
-        messages = openai.beta.threads.messages.list(thread_id=self.thread_id)
-        last_message = messages.data[0]
-        response = last_message.content[0].text.value
+        response = run_assistant(self.thread_id, self.assistant_id, on_text_delta=on_text_delta)
         self.conversation_log.append({"role": "assistant", "content": response})
         
         # Return the raw response so the conversation service can handle parsing
@@ -438,10 +566,13 @@ class update:
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 class create_class:
-    def __init__(self, class_name):
+    def __init__(self, class_name, vector_store_id=None):
         self.class_name = class_name
-        self.vector_store = client.vector_stores.create(name=self.class_name)
-        self.vector_store_id = self.vector_store.id
+        # Reuse the period's vector store when the caller already created one
+        if vector_store_id is None:
+            self.vector_store = client.vector_stores.create(name=self.class_name)
+            vector_store_id = self.vector_store.id
+        self.vector_store_id = vector_store_id
 
     #commented this out for now. routes.py and teacher_service.py are handling this.
 
@@ -469,15 +600,12 @@ class create_class:
             instructions=update_inst,
             model="o3-mini",
             tools=[{"type": "file_search"}],
+            tool_resources={"file_search": {"vector_store_ids": [self.vector_store_id]}},
             response_format={
             "type": "json_schema",
             "json_schema": json.loads(update_response_format)
         }
         )
-        self.update_assistant = client.beta.assistants.update(
-            assistant_id=self.update_assistant.id,
-            tool_resources={"file_search": {"vector_store_ids": [self.vector_store.id]}},
-        )
 
     def create_ltg_assistant(self):
         self.ltg_assistant = client.beta.assistants.create(
@@ -485,15 +613,12 @@ class create_class:
             instructions=ltg_inst,
             model="gpt-4.1-mini",
             tools=[{"type": "file_search"}],
+            tool_resources={"file_search": {"vector_store_ids": [self.vector_store_id]}},
             response_format={
             "type": "json_schema",
             "json_schema": json.loads(ltg_response_format)
         }
         )
-        self.ltg_assistant = client.beta.assistants.update(
-            assistant_id=self.ltg_assistant.id,
-            tool_resources={"file_search": {"vector_store_ids": [self.vector_store.id]}},
-            )
 
 update_response_format = '''
 {
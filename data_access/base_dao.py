@@ -1,21 +1,235 @@
 # db/base_dao.py
-from data_access.config import DynamoDBConfig
+from data_access.config import get_table, get_dynamodb_resource, get_dynamodb_client
+import base64
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import boto3
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # BaseDAO class for common database operations
-# 
+#
 # IMPORTANT: DAO method return type conventions:
 # - get_*_by_id() methods should return a single item (dict) or None
 # - get_*_by_*() methods that can return multiple items should return List[Dict]
 # - Never use [0] indexing on get_*_by_id() results as they return single items
+# - Never read response["Items"] from a multi-item query/scan directly; DynamoDB
+#   stops each page at 1 MB, so use paginate()/query_all()/scan_all() instead
+#
+# Table handles come from the process-wide registry in data_access/config.py,
+# so constructing a DAO is cheap and never opens a new connection pool.
+
+# BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_LIMIT = 25
+# TransactWriteItems accepts at most 100 actions per call
+TRANSACT_WRITE_LIMIT = 100
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_LIMIT = 100
+
+
+class ConditionalWriteError(Exception):
+    """A conditional write was rejected because the item changed since it was read."""
+
+
+def transact_write(actions: List[Dict[str, Any]]) -> None:
+    """
+    Commit Put/Update/ConditionCheck actions (built with BaseDAO.put_action /
+    update_action) across tables with TransactWriteItems.
+
+    Each chunk of 100 actions is all-or-nothing. Put the conditional actions in
+    the first chunk so a conflict aborts the save before anything is written.
+    Raises ConditionalWriteError when a condition fails.
+    """
+    # The resource's client accepts plain Python values, like Table does
+    client = get_dynamodb_client()
+    for start in range(0, len(actions), TRANSACT_WRITE_LIMIT):
+        try:
+            client.transact_write_items(TransactItems=actions[start:start + TRANSACT_WRITE_LIMIT])
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            reasons = [reason.get("Code") for reason in e.response.get("CancellationReasons", [])]
+            if error.get("Code") == "TransactionCanceledException" and "ConditionalCheckFailed" in reasons:
+                raise ConditionalWriteError(error.get("Message", "Conditional check failed")) from e
+            raise
+
+
+def encode_page_token(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Turn a LastEvaluatedKey into an opaque, URL-safe page token."""
+    if not last_evaluated_key:
+        return None
+    typed = {
+        name: ["N", str(value)] if isinstance(value, (Decimal, int)) else ["S", value]
+        for name, value in last_evaluated_key.items()
+    }
+    raw = json.dumps(typed, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(page_token: str) -> Dict[str, Any]:
+    """Turn a page token back into an ExclusiveStartKey."""
+    try:
+        padded = page_token + "=" * (-len(page_token) % 4)
+        typed = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {
+            name: Decimal(value) if kind == "N" else value
+            for name, (kind, value) in typed.items()
+        }
+    except Exception:
+        raise ValueError("Invalid page token")
+
 
 class BaseDAO:
     def __init__(self, table_name):
-        self.config = DynamoDBConfig()
-        self.table = self.config.get_table(table_name)
+        self.table_name = table_name
+        self.table = get_table(table_name)
 
     def key(self, name):
         return boto3.dynamodb.conditions.Key(name)
+
+    def paginate(self, operation: str = "query", **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every item of a query or scan, following LastEvaluatedKey.
+        Only one page is held in memory at a time.
+
+        :param operation: "query" or "scan".
+        :param kwargs: Arguments passed through to Table.query / Table.scan.
+        """
+        method = getattr(self.table, operation)
+        while True:
+            response = method(**kwargs)
+            yield from response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    def query_all(self, **kwargs) -> List[Dict[str, Any]]:
+        """Run a query across all pages and return the items as a list."""
+        return list(self.paginate("query", **kwargs))
+
+    def scan_all(self, **kwargs) -> List[Dict[str, Any]]:
+        """Run a scan across all pages and return the items as a list."""
+        return list(self.paginate("scan", **kwargs))
+
+    def fetch_page(self, operation: str, limit: int, page_token: Optional[str] = None,
+                   **kwargs) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch a single page for clients that page through results themselves.
+
+        Limit is applied before any FilterExpression, so a page can hold fewer
+        than `limit` items (or none) while a next_page_token is still returned.
+
+        :return: (items, next_page_token); the token is None on the last page.
+        """
+        kwargs["Limit"] = limit
+        if page_token:
+            kwargs["ExclusiveStartKey"] = decode_page_token(page_token)
+        response = getattr(self.table, operation)(**kwargs)
+        return response.get("Items", []), encode_page_token(response.get("LastEvaluatedKey"))
+
+    def put_action(self, item: Dict[str, Any], condition_expression: Optional[str] = None,
+                   names: Optional[Dict[str, str]] = None,
+                   values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a TransactWriteItems Put action for this table."""
+        put = {"TableName": self.table_name, "Item": item}
+        if condition_expression:
+            put["ConditionExpression"] = condition_expression
+        if names:
+            put["ExpressionAttributeNames"] = names
+        if values:
+            put["ExpressionAttributeValues"] = values
+        return {"Put": put}
+
+    def update_action(self, key: Dict[str, Any], updates: Dict[str, Any],
+                      defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build a TransactWriteItems Update action for this table.
+
+        :param updates: Attributes to SET unconditionally.
+        :param defaults: Attributes to SET only if missing (if_not_exists), so the
+                         update also creates a complete item when the key is new.
+        """
+        defaults = {k: v for k, v in (defaults or {}).items() if k not in updates}
+        parts = [f"#{k} = :{k}" for k in updates]
+        parts += [f"#{k} = if_not_exists(#{k}, :{k})" for k in defaults]
+        attrs = {**updates, **defaults}
+        return {
+            "Update": {
+                "TableName": self.table_name,
+                "Key": key,
+                "UpdateExpression": "SET " + ", ".join(parts),
+                "ExpressionAttributeNames": {f"#{k}": k for k in attrs},
+                "ExpressionAttributeValues": {f":{k}": v for k, v in attrs.items()},
+            }
+        }
+
+    def batch_put(self, items: List[Dict[str, Any]], max_retries: int = 5, base_delay: float = 0.05) -> None:
+        """
+        Write many items with BatchWriteItem, 25 per request.
+
+        Items DynamoDB reports as unprocessed (throttling, partition limits) are
+        retried with exponential backoff and jitter. Raises RuntimeError if some
+        items are still unprocessed after max_retries.
+
+        :param items: Plain item dicts (e.g. model.to_item()).
+        """
+        resource = get_dynamodb_resource()
+        for start in range(0, len(items), BATCH_WRITE_LIMIT):
+            request_items = {
+                self.table_name: [
+                    {"PutRequest": {"Item": item}}
+                    for item in items[start:start + BATCH_WRITE_LIMIT]
+                ]
+            }
+            attempt = 0
+            while request_items:
+                response = resource.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    break
+                if attempt >= max_retries:
+                    pending = sum(len(requests) for requests in request_items.values())
+                    raise RuntimeError(f"batch_put left {pending} unprocessed items in {self.table_name}")
+                delay = base_delay * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+                attempt += 1
+
+    def batch_get(self, keys: List[Dict[str, Any]], projection: Optional[List[str]] = None,
+                  max_retries: int = 5, base_delay: float = 0.05) -> List[Dict[str, Any]]:
+        """
+        Read many items by primary key with BatchGetItem, 100 keys per request.
+
+        Unprocessed keys are retried with exponential backoff and jitter, like
+        batch_put. Missing items are skipped and the result order is not the
+        order of `keys`.
+
+        :param keys: Primary key dicts, e.g. [{"student_id": "s1"}].
+        :param projection: Attribute names to return (all attributes if None).
+        """
+        resource = get_dynamodb_resource()
+        items = []
+        for start in range(0, len(keys), BATCH_GET_LIMIT):
+            request = {"Keys": keys[start:start + BATCH_GET_LIMIT]}
+            if projection:
+                request["ProjectionExpression"] = ", ".join(f"#p{i}" for i in range(len(projection)))
+                request["ExpressionAttributeNames"] = {f"#p{i}": name for i, name in enumerate(projection)}
+            request_items = {self.table_name: request}
+            attempt = 0
+            while request_items:
+                response = resource.batch_get_item(RequestItems=request_items)
+                items.extend(response.get("Responses", {}).get(self.table_name, []))
+                request_items = response.get("UnprocessedKeys") or {}
+                if not request_items:
+                    break
+                if attempt >= max_retries:
+                    pending = sum(len(request["Keys"]) for request in request_items.values())
+                    raise RuntimeError(f"batch_get left {pending} unprocessed keys in {self.table_name}")
+                delay = base_delay * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+                attempt += 1
+        return items
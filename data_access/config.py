@@ -1,5 +1,7 @@
 import os
+import threading
 import boto3
+from botocore.config import Config
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -7,14 +9,84 @@ from pathlib import Path
 _BACKEND_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(_BACKEND_DIR / '.env')
 
+# One DynamoDB resource per worker process, shared by every DAO.
+# Table actions (get_item, query, put_item, ...) delegate to the resource's
+# low-level client, which is thread-safe and owns the pooled HTTP connections.
+_lock = threading.Lock()
+_resource = None
+_resource_pid = None
+_tables = {}
+
+
+def _client_config() -> Config:
+    """Botocore settings for the shared connection pool (overridable via env)."""
+    return Config(
+        max_pool_connections=int(os.getenv('DYNAMODB_MAX_POOL_CONNECTIONS', '50')),
+        connect_timeout=float(os.getenv('DYNAMODB_CONNECT_TIMEOUT', '2')),
+        read_timeout=float(os.getenv('DYNAMODB_READ_TIMEOUT', '5')),
+        tcp_keepalive=os.getenv('DYNAMODB_TCP_KEEPALIVE', 'true').lower() == 'true',
+        retries={
+            'max_attempts': int(os.getenv('DYNAMODB_MAX_ATTEMPTS', '5')),
+            'mode': 'standard',
+        },
+    )
+
+
+def get_dynamodb_resource():
+    """Return the process-wide DynamoDB resource, creating it on first use.
+
+    The resource is rebuilt after a fork so that pre-forking servers never share
+    sockets between worker processes.
+    """
+    global _resource, _resource_pid
+    pid = os.getpid()
+    if _resource is not None and _resource_pid == pid:
+        return _resource
+
+    with _lock:
+        if _resource is None or _resource_pid != pid:
+            _resource = boto3.resource(
+                'dynamodb',
+                region_name=os.getenv('AWS_REGION', 'us-east-2'),
+                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                config=_client_config(),
+            )
+            _resource_pid = pid
+            _tables.clear()
+    return _resource
+
+
+def get_dynamodb_client():
+    """Return the low-level client backing the shared resource."""
+    return get_dynamodb_resource().meta.client
+
+
+def get_table(table_name: str):
+    """Return a cached Table handle from the process-wide registry."""
+    resource = get_dynamodb_resource()
+    table = _tables.get(table_name)
+    if table is None:
+        with _lock:
+            table = _tables.get(table_name)
+            if table is None:
+                table = resource.Table(table_name)
+                _tables[table_name] = table
+    return table
+
+
+def reset_dynamodb() -> None:
+    """Drop the shared resource and table registry (used by tests and scripts)."""
+    global _resource, _resource_pid
+    with _lock:
+        _resource = None
+        _resource_pid = None
+        _tables.clear()
+
+
 class DynamoDBConfig:
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            region_name=os.getenv('AWS_REGION', 'us-east-2'),
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        )
+        self.dynamodb = get_dynamodb_resource()
 
     def get_table(self, table_name: str):
-        return self.dynamodb.Table(table_name)
+        return get_table(table_name)
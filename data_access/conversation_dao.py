@@ -1,6 +1,5 @@
 from data_access.base_dao import BaseDAO
 from models.conversation import Conversation
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key
 from typing import List, Dict, Any
 from datetime import datetime, timezone
@@ -13,8 +12,7 @@ class ConversationDAO(BaseDAO):
         """
         Initialize the DAO with the DynamoDB 'conversation' table.
         """
-        config = DynamoDBConfig()
-        self.table = config.get_table("conversation")
+        super().__init__("conversation")
 
     def add_conversation(self, conversation: Conversation) -> None:
         """
@@ -32,10 +30,9 @@ class ConversationDAO(BaseDAO):
         :param thread_id: The partition key.
         :return: A list of conversation records (as dictionaries).
         """
-        response = self.table.query(
+        return self.query_all(
             KeyConditionExpression=Key("thread_id").eq(thread_id)
         )
-        return response["Items"]
 
     def update_conversation(self, thread_id: str, updates: Dict[str, Any]) -> None:
         """
@@ -46,10 +43,9 @@ class ConversationDAO(BaseDAO):
         :return: None
         """
         # Query for the conversation(s) with this thread_id
-        response = self.table.query(
+        items = self.query_all(
             KeyConditionExpression=Key("thread_id").eq(thread_id)
         )
-        items = response.get("Items", [])
         if not items:
             raise ValueError("Conversation not found.")
 
@@ -86,10 +82,10 @@ class ConversationDAO(BaseDAO):
         :param conversation_type: The type of conversation (e.g., 'profile').
         :return: The conversation record as a dictionary, or None if not found.
         """
-        response = self.table.query(
+        for item in self.paginate(
+            "query",
             KeyConditionExpression=Key("thread_id").eq(thread_id)
-        )
-        for item in response["Items"]:
+        ):
             if item.get("user_id") == user_id and item.get("conversation_type") == conversation_type:
                 return item
         return None
@@ -1,21 +1,29 @@
 from data_access.base_dao import BaseDAO
 from models.enrollment import Enrollment
 import boto3
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
+import os
 
 load_dotenv()
 
+# Global secondary index on the enrollment table
+# (created by scripts/migrate_enrollment_index.py)
+STUDENT_PERIOD_INDEX = "student_period_index"  # student_id / period_id
+
 # dynamodb = boto3.resource("dynamodb")
 
 
 class EnrollmentDAO(BaseDAO):
-    def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("enrollment")
+    def __init__(self, use_indexes: Optional[bool] = None):
+        super().__init__("enrollment")
         print(f"Using DynamoDB table: {self.table.name}")
+        # Filters the period's enrollments in Python until ENROLLMENT_USE_INDEXES=true
+        # is set, which must wait until scripts/migrate_enrollment_index.py has run.
+        if use_indexes is None:
+            use_indexes = os.getenv("ENROLLMENT_USE_INDEXES", "false").lower() == "true"
+        self.use_indexes = use_indexes
 
     def add_enrollment(self, enrollment: Enrollment) -> None:
         item = enrollment.model_dump()
@@ -24,15 +32,33 @@ class EnrollmentDAO(BaseDAO):
 
     def get_enrollments_by_period(self, period_id: str) -> List[Dict[str, Any]]:
         try:
-            response = self.table.query(
+            items = self.query_all(
                 KeyConditionExpression=Key("period_id").eq(str(period_id))  # force string
             )
-            print("Query response:", response)
-            return response.get("Items", [])
+            print(f"Query returned {len(items)} enrollments")
+            return items
         except Exception as e:
             print("Error querying by period_id:", e)
             raise
 
+    def get_enrollments_by_period_page(self, period_id: str, limit: int,
+                                       page_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return self.fetch_page(
+            "query", limit, page_token,
+            KeyConditionExpression=Key("period_id").eq(str(period_id))
+        )
+
+    def get_enrollment_for_student(self, period_id: str, student_id: str) -> Optional[Dict[str, Any]]:
+        """Get a student's enrollment in a period, or None if they are not enrolled."""
+        if not self.use_indexes:
+            enrollments = self.get_enrollments_by_period(period_id)
+            return next((e for e in enrollments if e.get("student_id") == student_id), None)
+        items = self.query_all(
+            IndexName=STUDENT_PERIOD_INDEX,
+            KeyConditionExpression=Key("student_id").eq(student_id) & Key("period_id").eq(str(period_id))
+        )
+        return items[0] if items else None
+
     def update_enrollment(self, period_id: str, enrolled_at: str, updates: Dict[str, Any]) -> None:
         update_expr = "SET " + ", ".join(f"{k} = :{k}" for k in updates)
         expr_attr_vals = {f":{k}": v for k, v in updates.items()}
@@ -52,6 +78,5 @@ class EnrollmentDAO(BaseDAO):
 
     def debug_scan_all(self) -> None:
         print("Scanning all items in enrollment table")
-        response = self.table.scan()
-        for item in response.get("Items", []):
+        for item in self.paginate("scan"):
             print(f" Item: {item}, period_id type: {type(item.get('period_id'))}")
\ No newline at end of file
@@ -1,22 +1,62 @@
 from data_access.base_dao import BaseDAO
 from models.individual_quest import IndividualQuest
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key, Attr
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 from dotenv import load_dotenv
+import os
 
 load_dotenv()
 
+# Global secondary indexes on the individual_quest table
+# (created by scripts/migrate_individual_quest_indexes.py)
+STUDENT_PERIOD_INDEX = "student_period_index"  # student_period_key / week
+STUDENT_INDEX = "student_index"                # student_id / week
+QUEST_ID_INDEX = "quest_id_index"              # quest_id / week
+STATUS_INDEX = "status_index"                  # status / due_date
+WEEK_INDEX = "week_index"                      # week / due_date
+
+QUEST_STATUSES = ("not_started", "in_progress", "completed")
+
 class IndividualQuestDAO(BaseDAO):
-    def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("individual_quest")
+    def __init__(self, use_indexes: Optional[bool] = None):
+        super().__init__("individual_quest")
+        # Table scans until INDIVIDUAL_QUEST_USE_INDEXES=true is set, which must wait until
+        # scripts/migrate_individual_quest_indexes.py has created and backfilled the indexes.
+        if use_indexes is None:
+            use_indexes = os.getenv("INDIVIDUAL_QUEST_USE_INDEXES", "false").lower() == "true"
+        self.use_indexes = use_indexes
+
+    def _query_index(self, index_name: str, key_condition) -> List[Dict[str, Any]]:
+        return self.query_all(
+            IndexName=index_name,
+            KeyConditionExpression=key_condition
+        )
+
+    def _scan(self, filter_expression) -> List[Dict[str, Any]]:
+        """Full-table scan; only used when indexes are disabled."""
+        return self.scan_all(
+            FilterExpression=filter_expression
+        )
 
     def add_individual_quest(self, quest: IndividualQuest) -> None:
         """Add a new individual quest to the database."""
         self.table.put_item(Item=quest.to_item())
 
+    def add_individual_quests(self, quests: List[IndividualQuest]) -> None:
+        """Add many individual quests using batched writes."""
+        self.batch_put([quest.to_item() for quest in quests])
+
+    def put_quest_action(self, quest: IndividualQuest) -> Dict[str, Any]:
+        """Build a transactional Put for a new individual quest."""
+        return self.put_action(quest.to_item())
+
+    def update_quest_action(self, individual_quest_id: str, updates: Dict[str, Any],
+                            defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a transactional Update for an individual quest (stamps last_updated_at)."""
+        updates = {**updates, "last_updated_at": datetime.now(timezone.utc).isoformat()}
+        return self.update_action({"individual_quest_id": individual_quest_id}, updates, defaults)
+
     def get_individual_quest_by_id(self, individual_quest_id: str) -> Optional[Dict[str, Any]]:
         """Get an individual quest by its individual_quest_id."""
         response = self.table.query(
@@ -27,17 +67,15 @@ class IndividualQuestDAO(BaseDAO):
 
     def get_quests_by_week(self, week: int) -> List[Dict[str, Any]]:
         """Get all quests for a specific week."""
-        response = self.table.scan(
-            FilterExpression=Attr("week").eq(week)
-        )
-        return response.get("Items", [])
+        if not self.use_indexes:
+            return self._scan(Attr("week").eq(week))
+        return self._query_index(WEEK_INDEX, Key("week").eq(week))
 
     def get_quests_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get all quests with a specific status."""
-        response = self.table.scan(
-            FilterExpression=Attr("status").eq(status)
-        )
-        return response.get("Items", [])
+        if not self.use_indexes:
+            return self._scan(Attr("status").eq(status))
+        return self._query_index(STATUS_INDEX, Key("status").eq(status))
 
     def update_individual_quest(self, individual_quest_id: str, updates: Dict[str, Any]) -> None:
         """Update an individual quest with new data."""
@@ -88,41 +126,71 @@ class IndividualQuestDAO(BaseDAO):
         """Delete an individual quest from the database."""
         self.table.delete_item(Key={"individual_quest_id": individual_quest_id})
 
+    def iter_all_quests(self) -> Iterator[Dict[str, Any]]:
+        """Stream every individual quest, one page in memory at a time."""
+        return self.paginate("scan")
+
     def get_all_quests(self) -> List[Dict[str, Any]]:
         """Get all individual quests from the database."""
-        response = self.table.scan()
-        return response.get("Items", [])
+        return list(self.iter_all_quests())
 
     def get_quests_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Get quests within a specific date range."""
-        response = self.table.scan(
-            FilterExpression=Attr("due_date").between(start_date, end_date)
-        )
-        return response.get("Items", [])
+        """Get quests within a specific date range (one index query per status)."""
+        if not self.use_indexes:
+            return self._scan(Attr("due_date").between(start_date, end_date))
+        items = []
+        for status in QUEST_STATUSES:
+            items.extend(self._query_index(
+                STATUS_INDEX,
+                Key("status").eq(status) & Key("due_date").between(start_date, end_date)
+            ))
+        return items
 
     def get_quests_by_skills(self, skills: str) -> List[Dict[str, Any]]:
         """Get quests that match specific skills."""
-        response = self.table.scan(
+        return self.scan_all(
             FilterExpression=Attr("skills").contains(skills)
         )
-        return response.get("Items", [])
 
     def get_quests_by_student(self, student_id: str) -> List[Dict[str, Any]]:
         """Get all individual quests for a specific student."""
-        response = self.table.scan(
-            FilterExpression=Attr("student_id").eq(student_id)
-        )
-        return response.get("Items", [])
+        if not self.use_indexes:
+            return self._scan(Attr("student_id").eq(student_id))
+        return self._query_index(STUDENT_INDEX, Key("student_id").eq(student_id))
 
     def get_quests_by_quest_id(self, quest_id: str) -> List[Dict[str, Any]]:
         """Get all individual quests that share the same quest_id (should be 18 quests)."""
-        response = self.table.scan(
-            FilterExpression=Attr("quest_id").eq(quest_id)
-        )
-        return response.get("Items", [])
+        if not self.use_indexes:
+            return self._scan(Attr("quest_id").eq(quest_id))
+        return self._query_index(QUEST_ID_INDEX, Key("quest_id").eq(quest_id))
 
     def get_quests_by_student_and_period(self, student_id: str, period_id: str) -> List[Dict[str, Any]]:
-        response = self.table.scan(
-            FilterExpression=Attr("student_id").eq(student_id) & Attr("period_id").eq(period_id)
+        """Get all individual quests for a student in a period, ordered by week."""
+        if not self.use_indexes:
+            return self._scan(Attr("student_id").eq(student_id) & Attr("period_id").eq(period_id))
+        return self._query_index(STUDENT_PERIOD_INDEX, Key("student_period_key").eq(f"{student_id}#{period_id}"))
+
+    def get_quests_by_student_page(self, student_id: str, limit: int,
+                                   page_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of a student's quests plus the token for the next page."""
+        if not self.use_indexes:
+            return self.fetch_page("scan", limit, page_token, FilterExpression=Attr("student_id").eq(student_id))
+        return self.fetch_page(
+            "query", limit, page_token,
+            IndexName=STUDENT_INDEX,
+            KeyConditionExpression=Key("student_id").eq(student_id)
+        )
+
+    def get_quests_by_student_and_period_page(self, student_id: str, period_id: str, limit: int,
+                                              page_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of a student's quests in a period plus the token for the next page."""
+        if not self.use_indexes:
+            return self.fetch_page(
+                "scan", limit, page_token,
+                FilterExpression=Attr("student_id").eq(student_id) & Attr("period_id").eq(period_id)
+            )
+        return self.fetch_page(
+            "query", limit, page_token,
+            IndexName=STUDENT_PERIOD_INDEX,
+            KeyConditionExpression=Key("student_period_key").eq(f"{student_id}#{period_id}")
         )
-        return response.get("Items", [])
\ No newline at end of file
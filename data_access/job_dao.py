@@ -0,0 +1,66 @@
+from data_access.base_dao import BaseDAO
+from models.job import Job
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import copy
+import json
+import os
+import threading
+
+load_dotenv()
+
+
+def _to_dynamo(value):
+    """Make a job result storable: DynamoDB rejects floats and arbitrary objects."""
+    return json.loads(json.dumps(value, default=str), parse_float=Decimal)
+
+
+class JobDAO(BaseDAO):
+    def __init__(self):
+        super().__init__("job")
+
+    def add_job(self, job: Job) -> None:
+        self.table.put_item(Item=_to_dynamo(job.to_item()))
+
+    def get_job_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.table.get_item(Key={"job_id": job_id}).get("Item")
+
+    def update_job(self, job_id: str, updates: Dict[str, Any]) -> None:
+        updates = {**updates, "updated_at": datetime.now(timezone.utc).isoformat()}
+        self.table.update_item(
+            Key={"job_id": job_id},
+            UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in updates),
+            ExpressionAttributeNames={f"#{k}": k for k in updates},
+            ExpressionAttributeValues={f":{k}": _to_dynamo(v) for k, v in updates.items()}
+        )
+
+
+class InMemoryJobDAO:
+    """JobDAO stand-in that keeps jobs in this process (tests and local runs)."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add_job(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.job_id] = job.to_item()
+
+    def get_job_by_id(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    def update_job(self, job_id: str, updates: Dict[str, Any]) -> None:
+        updates = {**updates, "updated_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            self._jobs.setdefault(job_id, {"job_id": job_id}).update(copy.deepcopy(updates))
+
+
+def get_job_dao():
+    """JOB_BACKEND=memory keeps jobs in process; the default is the DynamoDB job table."""
+    if os.getenv("JOB_BACKEND", "dynamodb").lower() == "memory":
+        return InMemoryJobDAO()
+    return JobDAO()
@@ -0,0 +1,162 @@
+from data_access.base_dao import BaseDAO
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+load_dotenv()
+
+# Cached model outputs are reused for this long (the llm_cache table's TTL removes them)
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+# Bump to invalidate every cached output at once (e.g. after a model upgrade)
+LLM_CACHE_VERSION = os.getenv("LLM_CACHE_VERSION", "1")
+
+
+def _normalize(value):
+    """Collapse whitespace in strings so prompt indentation changes do not change the key."""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def llm_cache_key(kind: str, model: str, *prompt_parts: Any) -> str:
+    """Deterministic key for a model call: sha256 of the normalized prompt inputs and model."""
+    payload = json.dumps(
+        {"version": LLM_CACHE_VERSION, "kind": kind, "model": model, "prompt": _normalize(list(prompt_parts))},
+        sort_keys=True, default=str
+    )
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class LLMCacheDAO(BaseDAO):
+    def __init__(self):
+        super().__init__("llm_cache")
+
+    def get_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        item = self.table.get_item(Key={"cache_key": cache_key}).get("Item")
+        # TTL deletion is lazy, so expired rows can still be read for a while
+        if not item or int(item.get("expires_at", 0)) <= time.time():
+            return None
+        return item
+
+    def put_entry(self, cache_key: str, kind: str, model: str, output: Any, ttl: int = LLM_CACHE_TTL) -> None:
+        self.table.put_item(Item={
+            "cache_key": cache_key,
+            "kind": kind,
+            "model": model,
+            # Stored as a JSON string: model outputs may contain floats DynamoDB rejects
+            "output": json.dumps(output),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "expires_at": int(time.time()) + ttl,
+        })
+
+    def delete_entry(self, cache_key: str) -> None:
+        self.table.delete_item(Key={"cache_key": cache_key})
+
+
+class LLMOutputCache:
+    """
+    Cache of model outputs keyed by llm_cache_key().
+
+    A bounded in-process LRU sits in front of the shared llm_cache table, so
+    a rerun on any worker reuses outputs whose prompt inputs have not
+    changed. Store errors are logged and treated as misses; the cache never
+    fails a generation.
+    """
+
+    def __init__(self, dao=None, max_size: int = 2048, ttl: int = LLM_CACHE_TTL):
+        self.dao = dao
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # cache_key -> (expires_at, output)
+        self._lock = threading.Lock()
+        self.hits = 0          # served from this process
+        self.store_hits = 0    # served from the llm_cache table
+        self.misses = 0
+        self.errors = 0
+
+    def _remember(self, cache_key: str, output: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[cache_key] = (expires_at, output)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        """Return the cached output (JSON-compatible), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return json.loads(entry[1])
+            self._entries.pop(cache_key, None)
+
+        if self.dao is not None:
+            try:
+                item = self.dao.get_entry(cache_key)
+            except Exception as e:
+                print(f"LLM cache read failed for {cache_key}: {e}")
+                item = None
+                self.errors += 1
+            if item:
+                self._remember(cache_key, item["output"], float(item["expires_at"]))
+                with self._lock:
+                    self.store_hits += 1
+                return json.loads(item["output"])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, cache_key: str, kind: str, model: str, output: Any) -> None:
+        self._remember(cache_key, json.dumps(output), time.time() + self.ttl)
+        if self.dao is not None:
+            try:
+                self.dao.put_entry(cache_key, kind, model, output, self.ttl)
+            except Exception as e:
+                print(f"LLM cache write failed for {cache_key}: {e}")
+                self.errors += 1
+
+    def invalidate(self, cache_key: str) -> None:
+        with self._lock:
+            self._entries.pop(cache_key, None)
+        if self.dao is not None:
+            self.dao.delete_entry(cache_key)
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.store_hits + self.misses
+        return (self.hits + self.store_hits) / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Empty this process's LRU and reset the counters (the table is untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.store_hits = 0
+            self.misses = 0
+            self.errors = 0
+
+
+def get_llm_cache_dao():
+    """LLM_CACHE_BACKEND=memory keeps outputs in process only; the default is the llm_cache table."""
+    if os.getenv("LLM_CACHE_BACKEND", "dynamodb").lower() == "memory":
+        return None
+    return LLMCacheDAO()
+
+
+# Shared by every agent in the process
+llm_output_cache = LLMOutputCache(
+    dao=get_llm_cache_dao(),
+    max_size=int(os.getenv("LLM_CACHE_MAX_SIZE", "2048")),
+)
@@ -1,22 +1,109 @@
 from data_access.base_dao import BaseDAO
 from models.period import Period
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.conditions import Attr
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+import copy
+import os
+import threading
+import time
 
 load_dotenv()
 
+# Global secondary index on the period table
+# (created by scripts/migrate_period_teacher_index.py)
+TEACHER_INDEX = "teacher_index"  # teacher_id / created_at, projects course
+
+# Attributes the teacher dashboard lists for each period
+DASHBOARD_FIELDS = ["period_id", "course", "created_at"]
+
+
+class PeriodCache:
+    """
+    Bounded in-process LRU cache of period_id -> period.
+
+    The cache keeps its own copy of each period and hands every caller a
+    fresh (deep) copy, so callers get plain, JSON-serializable dicts they may
+    change without affecting each other. This worker's writes invalidate
+    their entry; writes made by other workers are picked up after at most
+    `ttl` seconds.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # period_id -> (expires_at, period)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, period_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached period, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(period_id)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[period_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(period_id)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, period_id: str, period: Dict[str, Any]) -> None:
+        period = copy.deepcopy(period)
+        with self._lock:
+            self._entries[period_id] = (time.time() + self.ttl, period)
+            self._entries.move_to_end(period_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, period_id: str) -> None:
+        with self._lock:
+            self._entries.pop(period_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every PeriodDAO in the process
+period_cache = PeriodCache(
+    max_size=int(os.getenv("PERIOD_CACHE_MAX_SIZE", "1000")),
+    ttl=float(os.getenv("PERIOD_CACHE_TTL", "300")),
+)
+
 class PeriodDAO(BaseDAO):
-    def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("period")
+    def __init__(self, use_indexes: Optional[bool] = None):
+        super().__init__("period")
+        # Table scans until PERIOD_USE_INDEXES=true is set, which must wait
+        # until scripts/migrate_period_teacher_index.py reports the index ACTIVE.
+        if use_indexes is None:
+            use_indexes = os.getenv("PERIOD_USE_INDEXES", "false").lower() == "true"
+        self.use_indexes = use_indexes
 
     def add_period(self, period: Period) -> None:
+        if period.created_at is None:
+            # created_at is the teacher_index sort key; it cannot be stored as null
+            period.created_at = datetime.now(timezone.utc).isoformat()
         self.table.put_item(Item=period.to_item())
+        period_cache.invalidate(period.period_id)
+
+    def get_period_by_id(self, period_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return the period as a dict (a copy of the cached entry), or None.
+        use_cache=False always reads the table, for fields another worker
+        may be updating.
+        """
+        period = period_cache.get(period_id) if use_cache else None
+        if period is not None:
+            return period
 
-    def get_period_by_id(self, period_id: str) -> Dict[str, Any]:
         response = self.table.query(
             KeyConditionExpression=Key("period_id").eq(period_id)
         )
@@ -25,8 +112,9 @@ class PeriodDAO(BaseDAO):
             return None
         
         # Convert DynamoDB item to Period model and then back to dict to ensure proper typing
-        period = Period(**items[0])
-        return period.model_dump()
+        period = Period(**items[0]).model_dump()
+        period_cache.put(period_id, period)
+        return period
 
     def update_period(self, period_id: str, updates: Dict[str, Any]) -> None:
         # Convert any empty lists to DynamoDB format
@@ -44,17 +132,38 @@ class PeriodDAO(BaseDAO):
             ExpressionAttributeValues=expr_attr_vals,
             ExpressionAttributeNames=expr_attr_names
         )
+        period_cache.invalidate(period_id)
 
     def delete_period(self, period_id: str) -> None:
         self.table.delete_item(Key={"period_id": period_id})
+        period_cache.invalidate(period_id)
 
-    def get_periods_by_teacher_id(self, teacher_id):
-        try:
-            response = self.table.scan(
-            FilterExpression=Attr("teacher_id").eq(teacher_id)
+    def _teacher_query_args(self, teacher_id: str) -> Dict[str, Any]:
+        names = {f"#p{i}": name for i, name in enumerate(DASHBOARD_FIELDS)}
+        args = {
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+        if not self.use_indexes:
+            args["FilterExpression"] = Attr("teacher_id").eq(teacher_id)
+            return args
+        args.update(
+            IndexName=TEACHER_INDEX,
+            KeyConditionExpression=Key("teacher_id").eq(teacher_id),
+            ScanIndexForward=False,  # newest first
         )
-            items = response.get("Items", [])
-            return [Period(**item) for item in items]
-        except Exception as e:
-            print(f"Error in get_periods_by_teacher_id: {e}")
-            return []
\ No newline at end of file
+        return args
+
+    def get_periods_by_teacher_id(self, teacher_id: str) -> List[Dict[str, Any]]:
+        """Dashboard fields of a teacher's periods, newest first."""
+        operation = "query" if self.use_indexes else "scan"
+        items = list(self.paginate(operation, **self._teacher_query_args(teacher_id)))
+        if not self.use_indexes:
+            items.sort(key=lambda item: item.get("created_at", ""), reverse=True)
+        return items
+
+    def get_periods_by_teacher_id_page(self, teacher_id: str, limit: int,
+                                       page_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of a teacher's periods plus the token for the next page."""
+        operation = "query" if self.use_indexes else "scan"
+        return self.fetch_page(operation, limit, page_token, **self._teacher_query_args(teacher_id))
@@ -1,25 +1,101 @@
 from data_access.base_dao import BaseDAO
 from models.session import Session
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
+import os
+import threading
+import time
 
 load_dotenv()
 
+
+class SessionCache:
+    """
+    Bounded in-process TTL/LRU cache of auth_token -> session items.
+
+    Unknown tokens are cached as empty lists for a shorter TTL so repeated
+    requests with a bad token do not each hit DynamoDB. Entries never outlive
+    the session's own expires_at. Each worker process has its own cache, so a
+    logout handled by another worker is seen here after at most `ttl` seconds.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0, negative_ttl: float = 5.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # auth_token -> (expires_at, sessions)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, auth_token: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached sessions (possibly []), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(auth_token)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[auth_token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(auth_token)
+            self.hits += 1
+            return [dict(session) for session in entry[1]]
+
+    def put(self, auth_token: str, sessions: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl if sessions else self.negative_ttl)
+        for session in sessions:
+            if session.get("expires_at") is not None:
+                expires_at = min(expires_at, float(session["expires_at"]))
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[auth_token] = (expires_at, [dict(session) for session in sessions])
+            self._entries.move_to_end(auth_token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, auth_token: str) -> None:
+        with self._lock:
+            self._entries.pop(auth_token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every SessionDAO in the process
+session_cache = SessionCache(
+    max_size=int(os.getenv("SESSION_CACHE_MAX_SIZE", "10000")),
+    ttl=float(os.getenv("SESSION_CACHE_TTL", "60")),
+    negative_ttl=float(os.getenv("SESSION_CACHE_NEGATIVE_TTL", "5")),
+)
+
+
 class SessionDAO(BaseDAO):
     def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("session")
+        super().__init__("session")
 
     def add_session(self, session: Session) -> None:
         self.table.put_item(Item=session.to_item())
+        # A login replaces any negative entry for this token
+        session_cache.invalidate(session.auth_token)
 
     def get_sessions_by_auth_token(self, auth_token: str) -> List[Session]:
-        response = self.table.query(
+        if not auth_token:
+            return []
+        sessions = session_cache.get(auth_token)
+        if sessions is not None:
+            return sessions
+        sessions = self.query_all(
             KeyConditionExpression=Key("auth_token").eq(auth_token)
         )
-        return response["Items"]
+        session_cache.put(auth_token, sessions)
+        return sessions
 
     def update_session(self, auth_token: str, user_id: str, updates: Dict[str, Any]) -> None:
         update_expr = "SET " + ", ".join(f"#{k} = :{k}" for k in updates)
@@ -32,7 +108,9 @@ class SessionDAO(BaseDAO):
             ExpressionAttributeValues=expr_attr_vals,
             ExpressionAttributeNames=expr_attr_names
         )
+        session_cache.invalidate(auth_token)
 
 
     def delete_session(self, auth_token: str, user_id: str) -> None:
-        self.table.delete_item(Key={"auth_token": auth_token, "user_id": user_id})
\ No newline at end of file
+        self.table.delete_item(Key={"auth_token": auth_token, "user_id": user_id})
+        session_cache.invalidate(auth_token)
@@ -1,7 +1,6 @@
 from typing import List, Dict
 from data_access.base_dao import BaseDAO
-from data_access.config import DynamoDBConfig
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 from typing import Any, Optional
 from datetime import datetime, timezone
 from models.student import Student
@@ -11,8 +10,7 @@ load_dotenv()
 
 class StudentDAO(BaseDAO):
     def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("student")
+        super().__init__("student")
 
     def add_student(self, student: Student) -> None:
         self.table.put_item(Item=student.to_item())
@@ -24,6 +22,15 @@ class StudentDAO(BaseDAO):
         items = response.get("Items", [])
         return items[0] if items else None
 
+    def get_students_by_ids(self, student_ids: List[str],
+                            projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get many students with BatchGetItem (100 per request); missing ids are skipped."""
+        keys = [{"student_id": student_id} for student_id in dict.fromkeys(student_ids)]
+        return self.batch_get(keys, projection=projection)
+
+    def get_students_by_email(self, email: str) -> List[Dict[str, Any]]:
+        return self.scan_all(FilterExpression=Attr("email").eq(email))
+
     def update_student(self, student_id: str, updates: Dict[str, Any]) -> None:
         updates["last_login"] = datetime.now(timezone.utc).isoformat()
         update_expr = "SET " + ", ".join(f"#{k} = :{k}" for k in updates)
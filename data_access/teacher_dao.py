@@ -1,7 +1,6 @@
 from data_access.base_dao import BaseDAO
 from models.teacher import Teacher
-from data_access.config import DynamoDBConfig
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 
@@ -9,8 +8,7 @@ load_dotenv()
 
 class TeacherDAO(BaseDAO):
     def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("teacher")
+        super().__init__("teacher")
 
     def add_teacher(self, teacher: Teacher) -> None:
         self.table.put_item(Item=teacher.to_item())
@@ -22,6 +20,9 @@ class TeacherDAO(BaseDAO):
         items = response.get("Items", [])
         return items[0] if items else None
 
+    def get_teachers_by_email(self, email: str) -> List[Dict[str, Any]]:
+        return self.scan_all(FilterExpression=Attr("email").eq(email))
+
     def update_teacher(self, teacher_id: str, updates: Dict[str, Any]) -> None:
         update_expr = "SET " + ", ".join(f"{k} = :{k}" for k in updates)
         expr_attr_vals = {f":{k}": v for k, v in updates.items()}
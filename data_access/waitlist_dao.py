@@ -1,13 +1,12 @@
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
-from data_access.base_dao import BaseDAO
-from data_access.config import DynamoDBConfig
+from data_access.base_dao import BaseDAO, TRANSACT_WRITE_LIMIT, transact_write
 from datetime import datetime, timezone
+from typing import List, Set
 
 class WaitlistDAO(BaseDAO):
     def __init__(self):
-        cfg = DynamoDBConfig()
-        self.table = cfg.get_table("waitlist")
+        super().__init__("waitlist")
         self.email_index = "email-index"
 
     def get_by_email(self, email: str):
@@ -19,17 +18,17 @@ class WaitlistDAO(BaseDAO):
         ).get("Items") or [None])[0]
 
     def get_by_code(self, waitlist_code: str):
-        """Get a waitlist entry by its code (waitlistID)"""
+        """Get a waitlist entry by its code (waitlistID, the table's partition key)"""
         try:
-            scan_response = self.table.scan()
-            all_items = scan_response.get('Items', [])
-            for item in all_items:
-                if item.get('waitlistID') == waitlist_code:
-                    return item
-            return None
+            return self.table.get_item(Key={"waitlistID": waitlist_code}).get("Item")
         except ClientError:
             return None
 
+    def get_existing_codes(self, waitlist_codes: List[str]) -> Set[str]:
+        """Return the subset of waitlist_codes that already exist in the table"""
+        keys = [{"waitlistID": code} for code in dict.fromkeys(waitlist_codes)]
+        return {item["waitlistID"] for item in self.batch_get(keys, projection=["waitlistID"])}
+
     def validate_code(self, waitlist_code: str) -> dict:
         """
         Validate a waitlist code.
@@ -89,3 +88,18 @@ class WaitlistDAO(BaseDAO):
             ExpressionAttributeNames={"#n": "name"},
             ExpressionAttributeValues={":name": name.strip()},
         )
+
+    def put_codes(self, waitlist_codes: List[str]) -> None:
+        """
+        Write up to 100 unassigned codes (no email/name) in one transaction.
+        Each put is conditioned on the code not existing, so a code allocated
+        concurrently (e.g. by join) is never overwritten: the transaction
+        raises ConditionalWriteError and nothing is written.
+        """
+        if len(waitlist_codes) > TRANSACT_WRITE_LIMIT:
+            raise ValueError(f"At most {TRANSACT_WRITE_LIMIT} codes can be written at once")
+        transact_write([
+            self.put_action({"waitlistID": code, "used": False},
+                            condition_expression="attribute_not_exists(waitlistID)")
+            for code in waitlist_codes
+        ])
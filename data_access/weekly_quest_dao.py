@@ -1,8 +1,8 @@
-from data_access.base_dao import BaseDAO
+from data_access.base_dao import BaseDAO, ConditionalWriteError
+from botocore.exceptions import ClientError
 from models.weekly_quest import WeeklyQuest
-from data_access.config import DynamoDBConfig
 from boto3.dynamodb.conditions import Key, Attr
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
@@ -10,11 +10,46 @@ load_dotenv()
 
 class WeeklyQuestDAO(BaseDAO):
     def __init__(self):
-        config = DynamoDBConfig()
-        self.table = config.get_table("weekly_quest")
+        super().__init__("weekly_quest")
+
+    # Only lets a full-document write through if nobody has written since it was read
+    VERSION_CONDITION = "attribute_not_exists(#version) OR #version = :expected_version"
 
     def add_weekly_quest(self, quest: WeeklyQuest) -> None:
-        self.table.put_item(Item=quest.to_item())
+        """
+        Write the whole weekly quest document, conditioned on quest.version.
+        Raises ConditionalWriteError if the stored document changed since it was
+        read; on success quest.version is bumped to the stored value.
+        """
+        item = quest.to_item()
+        item["version"] = quest.version + 1
+        try:
+            self.table.put_item(
+                Item=item,
+                ConditionExpression=self.VERSION_CONDITION,
+                ExpressionAttributeNames={"#version": "version"},
+                ExpressionAttributeValues={":expected_version": quest.version},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ConditionalWriteError(f"Weekly quest {quest.quest_id} was modified concurrently") from e
+            raise
+        quest.version += 1
+
+    def versioned_put_action(self, quest: WeeklyQuest) -> Dict[str, Any]:
+        """
+        Build a transactional Put of the whole weekly quest document that only
+        succeeds if the stored version still matches quest.version.
+        The written item carries version + 1.
+        """
+        item = quest.to_item()
+        item["version"] = quest.version + 1
+        return self.put_action(
+            item,
+            condition_expression=self.VERSION_CONDITION,
+            names={"#version": "version"},
+            values={":expected_version": quest.version},
+        )
 
     def get_weekly_quest_by_id(self, quest_id: str) -> WeeklyQuest:
         response = self.table.query(
@@ -41,6 +76,12 @@ class WeeklyQuestDAO(BaseDAO):
             if k in ["year", "last_updated_at"]:
                 expr_attr_names[attr_name] = k
 
+        # Every write bumps the version so stale full-document writes are rejected
+        update_expr_parts.append("#version = if_not_exists(#version, :zero) + :one")
+        expr_attr_names["#version"] = "version"
+        expr_attr_vals[":zero"] = 0
+        expr_attr_vals[":one"] = 1
+
         update_expr = "SET " + ", ".join(update_expr_parts)
 
         kwargs = {
@@ -54,25 +95,79 @@ class WeeklyQuestDAO(BaseDAO):
 
         self.table.update_item(**kwargs)
 
-    def update_individual_quest_in_weekly_quest(self, quest_id: str, individual_quest_id: str, updates: Dict[str, Any]) -> None:
-        """Update a specific individual quest within a weekly quest list."""
-        weekly_quest = self.get_weekly_quest_by_id(quest_id)
-        if not weekly_quest:
+    def _find_quest_position(self, quest_id: str, individual_quest_id: str) -> Optional[int]:
+        """
+        Look up where an individual quest sits in the quests list.
+        Reads only the matching quest_index entry; documents written before the
+        index map existed fall back to reading the ids of the list.
+        """
+        response = self.table.get_item(
+            Key={"quest_id": quest_id},
+            ProjectionExpression="quest_id, quest_index.#iq",
+            ExpressionAttributeNames={"#iq": individual_quest_id},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if not item:
             raise ValueError(f"Weekly quest with id {quest_id} not found")
-        
-        quest_updated = False
-        for quest in weekly_quest.quests:
-            if quest.individual_quest_id == individual_quest_id:
-                for key, value in updates.items():
-                    setattr(quest, key, value)
-                quest.last_updated_at = datetime.now(timezone.utc).isoformat()
-                quest_updated = True
-                break
-        
-        if not quest_updated:
-            raise ValueError(f"Individual quest with id {individual_quest_id} not found in weekly quest {quest_id}")
-        
-        self.add_weekly_quest(weekly_quest)
+
+        position = item.get("quest_index", {}).get(individual_quest_id)
+        if position is not None:
+            return int(position)
+
+        response = self.table.get_item(
+            Key={"quest_id": quest_id},
+            ProjectionExpression="quests",
+            ConsistentRead=True,
+        )
+        for i, quest in enumerate(response.get("Item", {}).get("quests", [])):
+            if quest.get("individual_quest_id") == individual_quest_id:
+                return i
+        return None
+
+    def update_individual_quest_in_weekly_quest(self, quest_id: str, individual_quest_id: str, updates: Dict[str, Any]) -> None:
+        """
+        Update a specific individual quest within a weekly quest list.
+
+        Only the changed fields of quests[i] are written (SET quests[i].status = ...),
+        guarded by a condition that quests[i] is still the same quest. If the list
+        was rewritten in between, the position is looked up again once before
+        raising ConditionalWriteError.
+        """
+        for attempt in range(2):
+            position = self._find_quest_position(quest_id, individual_quest_id)
+            if position is None:
+                raise ValueError(f"Individual quest with id {individual_quest_id} not found in weekly quest {quest_id}")
+
+            now = datetime.now(timezone.utc).isoformat()
+            fields = {**updates, "last_updated_at": now}
+            update_expr_parts = [f"quests[{position}].#f_{k} = :f_{k}" for k in fields]
+            update_expr_parts.append("#last_updated_at = :now")
+            update_expr_parts.append("#version = if_not_exists(#version, :zero) + :one")
+            expr_attr_names = {f"#f_{k}": k for k in fields}
+            expr_attr_names.update({
+                "#last_updated_at": "last_updated_at",
+                "#version": "version",
+                "#iqid": "individual_quest_id",
+            })
+            expr_attr_vals = {f":f_{k}": v for k, v in fields.items()}
+            expr_attr_vals.update({":now": now, ":zero": 0, ":one": 1, ":iqid": individual_quest_id})
+
+            try:
+                self.table.update_item(
+                    Key={"quest_id": quest_id},
+                    UpdateExpression="SET " + ", ".join(update_expr_parts),
+                    ConditionExpression=f"quests[{position}].#iqid = :iqid",
+                    ExpressionAttributeNames=expr_attr_names,
+                    ExpressionAttributeValues=expr_attr_vals,
+                )
+                return
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+                print(f"DEBUG: Quest {individual_quest_id} moved in weekly quest {quest_id} (attempt {attempt + 1})")
+
+        raise ConditionalWriteError(f"Weekly quest {quest_id} was modified concurrently")
 
     def delete_weekly_quest(self, quest_id: str) -> None:
         self.table.delete_item(Key={"quest_id": quest_id})
@@ -80,11 +175,10 @@ class WeeklyQuestDAO(BaseDAO):
     def get_quests_by_student_and_period(self, student_id: str, period_id: str) -> List[WeeklyQuest]:
         """Get all weekly quests for a student in a specific period."""
         composite_key = f"{student_id}#{period_id}"
-        response = self.table.query(
+        items = self.query_all(
             IndexName="student_period_index",
             KeyConditionExpression=Key("student_period_key").eq(composite_key)
         )
-        items = response.get("Items", [])
         return [WeeklyQuest.from_item(item) for item in items]
 
     def get_weekly_quest_by_student_and_period(self, student_id: str, period_id: str) -> WeeklyQuest:
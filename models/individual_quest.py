@@ -18,7 +18,10 @@ class IndividualQuest(BaseModel):
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     due_date: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     last_updated_at: Optional[str] = Field(default=None, description="Last update timestamp")
-      
+    student_period_key: Optional[str] = Field(default=None, description="Composite key for GSI: \"student_id#period_id\"")
+
     def to_item(self):
-        return self.model_dump()
+        item = self.model_dump()
+        item["student_period_key"] = self.student_period_key or f"{self.student_id}#{self.period_id}"
+        return item
 
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Literal, Optional
+from datetime import datetime, timezone
+import time
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+# Finished jobs are removed by the table's TTL on expires_at
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+class Job(BaseModel):
+    job_id: str  # Partition Key
+    job_type: str
+    user_id: str
+    period_id: Optional[str] = None
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    progress: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    expires_at: int = Field(default_factory=lambda: int(time.time()) + JOB_RETENTION_SECONDS)
+
+    def to_item(self):
+        return self.model_dump(exclude_none=True)
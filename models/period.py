@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List, Optional
 
 class Period(BaseModel):
     period_id: str  # Partition Key
@@ -10,6 +10,13 @@ class Period(BaseModel):
     vector_store_id: str
     course: str
     file_urls: List[str] = []
+    # Week -> topics/skills map built from the course materials (see TeacherService.build_course_calendar)
+    course_calendar: Optional[Dict[str, Any]] = None
+    # Per-file S3 / vector store status while the period is provisioned (see TeacherService.provision_period)
+    ingestion: Optional[Dict[str, Any]] = None
+    # Stamped when the period is created; None for periods written before the field
+    # existed, until scripts/migrate_period_teacher_index.py backfills them
+    created_at: Optional[str] = None
 
 
     def to_item(self):
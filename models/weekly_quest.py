@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List
 from datetime import datetime, timezone
 
 from models.weekly_quest_item import WeeklyQuestItem
@@ -14,10 +14,14 @@ class WeeklyQuest(BaseModel):
     semester: str = "Fall 2025"  # Default semester
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     last_updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    version: int = 0  # Optimistic-concurrency counter, bumped on every conditional write
+    quest_index: Dict[str, int] = Field(default_factory=dict)  # individual_quest_id -> position in quests
 
     def to_item(self):
         item = self.model_dump()
         item['quests'] = [quest.to_dict() for quest in self.quests]
+        # Always rebuilt from the list, so targeted updates can address quests[i] directly
+        item['quest_index'] = {quest.individual_quest_id: i for i, quest in enumerate(self.quests)}
         return item
 
     @classmethod
@@ -7,6 +7,7 @@ from data_access.session_dao import SessionDAO
 from data_access.student_dao import StudentDAO
 from data_access.teacher_dao import TeacherDAO
 from models.session import Session
+from routes.auth_context import get_request_sessions
 from routes.conversation.conversation_service import ConversationService
 
 auth_bp = Blueprint('auth', __name__)
@@ -33,8 +34,8 @@ def signup():
     if not username or not password or not role or not first_name or not last_name or not email or not waitlist_code or (role == 'student' and not grade):
         return jsonify({'message': 'Username, password, role, first_name, last_name, email, waitlist code' + (', and grade' if role == 'student' else '') + ' required'}), 400
 
-    student_items = student_dao.table.scan(FilterExpression="email = :email", ExpressionAttributeValues={":email": email}).get("Items", [])
-    teacher_items = teacher_dao.table.scan(FilterExpression="email = :email", ExpressionAttributeValues={":email": email}).get("Items", [])
+    student_items = student_dao.get_students_by_email(email)
+    teacher_items = teacher_dao.get_teachers_by_email(email)
     if student_items or teacher_items:
         return jsonify({'message': 'Email address already in use'}), 409
 
@@ -101,4 +102,24 @@ def login():
             )
         return resp
     else:
-        return jsonify({'message': 'Invalid credentials'}), 401
\ No newline at end of file
+        return jsonify({'message': 'Invalid credentials'}), 401
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    sessions = get_request_sessions()
+    if not sessions:
+        return jsonify({'message': 'Invalid or expired token'}), 401
+
+    # Deleting the sessions also drops the token from the session cache
+    for session in sessions:
+        session_dao.delete_session(session['auth_token'], session['user_id'])
+
+    resp = make_response(jsonify({'message': 'Logged out'}), 200)
+    is_development = request.headers.get('Origin', '').startswith('http://localhost') or \
+                    request.headers.get('Host', '').startswith('localhost') or \
+                    request.headers.get('Host', '').startswith('127.0.0.1')
+    if is_development:
+        resp.delete_cookie('auth_token', path="/")
+    else:
+        resp.delete_cookie('auth_token', domain='eduquestai.org', path="/", secure=True, samesite='None')
+    return resp
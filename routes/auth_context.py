@@ -0,0 +1,49 @@
+from flask import g, request
+from data_access.session_dao import SessionDAO
+
+session_dao = SessionDAO()
+
+
+def get_request_auth_token():
+    """
+    Read the auth token from `Authorization: Bearer <token>`, falling back to the
+    last auth_token in the Cookie header (browsers can send several).
+    """
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header and auth_header.lower().startswith('bearer '):
+        token = auth_header.split(' ', 1)[1].strip()
+        if token:
+            return token
+
+    raw_cookie = request.headers.get('Cookie', '')
+    if 'auth_token=' in raw_cookie:
+        parts = [p.strip() for p in raw_cookie.split(';')]
+        auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
+        if auth_tokens:
+            return auth_tokens[-1]
+    return None
+
+
+def load_request_session():
+    """
+    before_request hook shared by every blueprint: resolves the caller's token
+    and sessions once per request into g.auth_token / g.sessions.
+
+    Session lookups go through the SessionDAO cache, so a known token costs no
+    DynamoDB round trip. Requests without a token (login, signup, CORS
+    preflight) never touch the session table. Routes still decide for
+    themselves whether a missing session is an error.
+    """
+    g.auth_token = get_request_auth_token()
+    g.sessions = None
+    if g.auth_token and request.method != 'OPTIONS':
+        g.sessions = session_dao.get_sessions_by_auth_token(g.auth_token)
+
+
+def get_request_sessions():
+    """Sessions for the current request's token ([] if the token is unknown)."""
+    if getattr(g, 'sessions', None) is None:
+        if 'auth_token' not in g:
+            g.auth_token = get_request_auth_token()
+        g.sessions = session_dao.get_sessions_by_auth_token(g.auth_token)
+    return g.sessions
@@ -7,6 +7,7 @@ from data_access.period_dao import PeriodDAO
 from data_access.student_dao import StudentDAO
 from data_access.conversation_dao import ConversationDAO
 from data_access.teacher_dao import TeacherDAO
+from data_access.individual_quest_dao import IndividualQuestDAO
 from models.conversation import Conversation
 from datetime import datetime, timezone
 from assistants import ini_conv
@@ -35,6 +36,7 @@ class ConversationService:
         self.conversation_dao = ConversationDAO()
         self.teacher_dao = TeacherDAO()
         self.period_dao = PeriodDAO()
+        self.individual_quest_dao = IndividualQuestDAO()
 
     def start_profile_assistant(self, auth_token: str, conversation_type: str = "profile"):
         # Validate session
@@ -77,7 +79,7 @@ class ConversationService:
             'response': response.get('response')
         }
 
-    def continue_profile_assistant(self, auth_token, conversation_type, thread_id, message):
+    def continue_profile_assistant(self, auth_token, conversation_type, thread_id, message, on_text_delta=None):
         # Validate session and get user_id
         sessions = self.session_dao.get_sessions_by_auth_token(auth_token)
         if not sessions:
@@ -111,7 +113,7 @@ class ConversationService:
 
         try:
             if conversation_type == "profile":
-                reply, is_complete, updated_profile = conv.cont_conv(message)
+                reply, is_complete, updated_profile = conv.cont_conv(message, on_text_delta=on_text_delta)
                 if is_complete and updated_profile:
                     self.student_dao.update_student(user_id, updated_profile)
                 return {
@@ -119,7 +121,7 @@ class ConversationService:
                     "profile_complete": is_complete
                 }
             elif conversation_type == "update":
-                reply = conv.cont_conv(message)
+                reply = conv.cont_conv(message, on_text_delta=on_text_delta)
                 return {
                     "response": reply
                 }
@@ -260,16 +262,13 @@ Recommended Changes: {response_json.get('recommended_change', 'None')}"""
                 
                 # Use direct quest lookup if individual_quest_id is provided (much more efficient)
                 if individual_quest_id:
-                    from data_access.individual_quest_dao import IndividualQuestDAO
-                    quest_dao = IndividualQuestDAO()
-                    
                     # Store both the detailed grade object and the overall score
                     grade_data = {
                         "detailed_grade": grade,
                         "overall_score": overall_score
                     }
                     
-                    quest_dao.update_quest_grade_and_feedback(
+                    self.individual_quest_dao.update_quest_grade_and_feedback(
                         individual_quest_id,
                         json.dumps(grade_data),  # Store as JSON string
                         feedback
@@ -299,16 +298,13 @@ Recommended Changes: {response_json.get('recommended_change', 'None')}"""
                                 break
                     
                     if target_quest:
-                        from data_access.individual_quest_dao import IndividualQuestDAO
-                        quest_dao = IndividualQuestDAO()
-                        
                         # Store both the detailed grade object and the overall score
                         grade_data = {
                             "detailed_grade": grade,
                             "overall_score": overall_score
                         }
                         
-                        quest_dao.update_quest_grade_and_feedback(
+                        self.individual_quest_dao.update_quest_grade_and_feedback(
                             target_quest['individual_quest_id'],
                             json.dumps(grade_data),  # Store as JSON string
                             feedback
@@ -454,7 +450,8 @@ Recommended Changes: {response_json.get('recommended_change', 'None')}"""
         }
 
 
-    def continue_update_assistant(self, auth_token: str, thread_id: str, message: str, student_id: str = None):
+    def continue_update_assistant(self, auth_token: str, thread_id: str, message: str, student_id: str = None,
+                                  on_text_delta=None):
         """
         Continue the update assistant conversation.
         Args:
@@ -462,6 +459,7 @@ Recommended Changes: {response_json.get('recommended_change', 'None')}"""
             thread_id (str): The thread ID for the conversation.
             message (str): The user's message to continue the conversation.
             student_id (str, optional): The student ID if the user is a teacher.
+            on_text_delta (callable, optional): Receives the reply text as it streams.
         Returns:
             dict: Assistant's response.
         """
@@ -519,7 +517,7 @@ Recommended Changes: {response_json.get('recommended_change', 'None')}"""
         update_conv = UpdateAssistant(update_assistant_id, student, quests_data, role == "teacher", thread_id=thread_id)
 
         try:
-            response = update_conv.cont_conv(message)
+            response = update_conv.cont_conv(message, on_text_delta=on_text_delta)
             
 
             # If this is a teacher conversation, check for change recommendations
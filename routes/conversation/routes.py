@@ -1,5 +1,5 @@
 # routes/conversation.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from flask_cors import CORS
 import json
 import time
@@ -12,6 +12,8 @@ from openai import OpenAI
 import os
 from dotenv import load_dotenv
 from routes.conversation.conversation_service import ConversationService
+from routes.sse import stream_assistant_reply
+from data_access.individual_quest_dao import IndividualQuestDAO
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -23,6 +25,7 @@ assistant_ids = {
 
 conversation_bp = Blueprint('conversation', __name__)
 conversation_service = ConversationService()
+individual_quest_dao = IndividualQuestDAO()
 
 
 def convert_decimals(obj):
@@ -41,25 +44,7 @@ def convert_decimals(obj):
 @conversation_bp.route('/initiate-profile-assistant', methods=['POST'])
 def profile_assistant():
     try:
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
 
         result = conversation_service.start_profile_assistant(auth_token)
         #always returns json
@@ -71,31 +56,14 @@ def profile_assistant():
         return jsonify({"error": str(e)}), 500
 
 
-@conversation_bp.route('/continue-profile-assistant', methods=['POST'])
-def continue_profile_assistant():
+@conversation_bp.route('/continue-profile-assistant', methods=['POST'], defaults={'stream': False})
+@conversation_bp.route('/continue-profile-assistant/stream', methods=['POST'], defaults={'stream': True})
+def continue_profile_assistant(stream):
     try:
         data = request.json
         print("Received data:", data)  # Debug log
         
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for continue-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
 
         conversation_type = data.get('conversation_type')
         thread_id = data.get('thread_id')
@@ -112,6 +80,12 @@ def continue_profile_assistant():
         if not user_message:
             return jsonify({"error": "user_message is required"}), 400
 
+        if stream:
+            return stream_assistant_reply(
+                lambda on_text_delta: conversation_service.continue_profile_assistant(
+                    auth_token, conversation_type, thread_id, user_message, on_text_delta=on_text_delta)
+            )
+
         result = conversation_service.continue_profile_assistant(auth_token, conversation_type, thread_id, user_message)
 
         print("Service result:", result)  # Debug log
@@ -127,29 +101,8 @@ def continue_profile_assistant():
 @conversation_bp.route('/initiate-update-assistant', methods=['POST'])
 def initiate_update():
     try:
-        
-        
+        auth_token = g.auth_token
 
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-        
         # Check if this is a file upload (FormData) or JSON request
         if request.files:
             # Handle file upload from student
@@ -180,9 +133,7 @@ def initiate_update():
             
             # Get the specific quest directly using individual_quest_id (much more efficient)
             try:
-                from data_access.individual_quest_dao import IndividualQuestDAO
-                quest_dao = IndividualQuestDAO()
-                quest_data = quest_dao.get_individual_quest_by_id(individual_quest_id)
+                quest_data = individual_quest_dao.get_individual_quest_by_id(individual_quest_id)
                 
                 if not quest_data:
                     return jsonify({"error": "Quest not found"}), 404
@@ -261,32 +212,14 @@ def initiate_update():
     print("DEBUG user profile keys:", user_profile_dict.keys())
     print("DEBUG full user profile:", user_profile_dict)
 
-@conversation_bp.route('/continue-update-assistant', methods=['POST'])
-def continue_update():
+@conversation_bp.route('/continue-update-assistant', methods=['POST'], defaults={'stream': False})
+@conversation_bp.route('/continue-update-assistant/stream', methods=['POST'], defaults={'stream': True})
+def continue_update(stream):
     try:
         data = request.json
         print("[DEBUG] Received data:", data)
 
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-        print("[DEBUG] Auth token:", auth_token)
+        auth_token = g.auth_token
 
         thread_id = data.get('thread_id')
         user_message = data.get('message')
@@ -302,6 +235,17 @@ def continue_update():
             print("[DEBUG] Missing message")
             return jsonify({"error": "message is required"}), 400
 
+        if stream:
+            return stream_assistant_reply(
+                lambda on_text_delta: conversation_service.continue_update_assistant(
+                    auth_token=auth_token,
+                    thread_id=thread_id,
+                    message=user_message,
+                    student_id=student_id,
+                    on_text_delta=on_text_delta
+                )
+            )
+
         result = conversation_service.continue_update_assistant(
             auth_token=auth_token,
             thread_id=thread_id,
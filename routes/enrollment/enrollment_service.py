@@ -4,6 +4,12 @@ from data_access.period_dao import PeriodDAO
 from models.enrollment import Enrollment
 from datetime import datetime
 
+# Student attributes shown on the class roster (never the password hash)
+ROSTER_FIELDS = [
+    "student_id", "first_name", "last_name", "email", "grade",
+    "interest", "strength", "weakness", "learning_style",
+]
+
 class EnrollmentService:
     def __init__(self):
         self.enrollment_dao = EnrollmentDAO()
@@ -36,19 +42,48 @@ class EnrollmentService:
 
         return {"message": f"Student {student_id} enrolled in {period_id} successfully"}
     
-    def get_enrollments_for_period(self, period_id: str):
-        enrollments = self.enrollment_dao.get_enrollments_by_period(period_id)
+    def get_period(self, period_id: str):
+        return self.period_dao.get_period_by_id(period_id)
+
+    def get_enrollments_for_period(self, period_id: str, limit: int = None, page_token: str = None):
+        next_page_token = None
+        if limit:
+            enrollments, next_page_token = self.enrollment_dao.get_enrollments_by_period_page(period_id, limit, page_token)
+        else:
+            enrollments = self.enrollment_dao.get_enrollments_by_period(period_id)
         period = self.period_dao.get_period_by_id(period_id)
         
         print(f"DEBUG: Period ID: {period_id}")
         print(f"DEBUG: Period data: {period}")
         print(f"DEBUG: Period file_urls: {period.get('file_urls', []) if period else 'No period found'}")
 
-        return {
+        result = {
             "students": enrollments,
             "file_urls": period.get("file_urls", []) if period else []
         }
+        if limit:
+            result["next_page_token"] = next_page_token
+        return result
     
+    def get_roster(self, period_id: str, limit: int = None, page_token: str = None):
+        """
+        Enrollments for a period, each with the student's roster profile.
+        Students are loaded with one BatchGetItem per 100 enrollments instead
+        of one lookup per student.
+        """
+        result = self.get_enrollments_for_period(period_id, limit, page_token)
+        enrollments = result["students"]
+        students = self.student_dao.get_students_by_ids(
+            [e["student_id"] for e in enrollments if e.get("student_id")],
+            projection=ROSTER_FIELDS
+        )
+        students_by_id = {student["student_id"]: student for student in students}
+        result["students"] = [
+            {**enrollment, "profile": students_by_id.get(enrollment.get("student_id"))}
+            for enrollment in enrollments
+        ]
+        return result
+
     def get_enrollment_by_id(self, enrollment_id: str):
         return self.enrollment_dao.get_enrollment_by_id(enrollment_id)
 
@@ -58,12 +93,7 @@ class EnrollmentService:
 
     def get_student_profile(self, period_id: str, student_id: str):
         try:
-            enrollments = self.enrollment_dao.get_enrollments_by_period(period_id)
-            if not enrollments:
-                print(f"No enrollments found for period {period_id}")
-                return None
-
-            matched_enrollment = next((e for e in enrollments if e.get("student_id") == student_id), None)
+            matched_enrollment = self.enrollment_dao.get_enrollment_for_student(period_id, student_id)
             if not matched_enrollment:
                 print(f"Student ID {student_id} not found in period {period_id}")
                 return None
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from routes.enrollment.enrollment_service import EnrollmentService
+from routes.pagination import get_page_args
 
 enrollment_bp = Blueprint('enrollment', __name__)
 service = EnrollmentService()
@@ -29,13 +31,45 @@ def enroll():
 @enrollment_bp.route('/enrollments/<period_id>', methods=['GET'])
 def get_enrollments(period_id):
     try:
-        enrollments = service.get_enrollments_for_period(period_id)
+        page_args = get_page_args()
+        if page_args:
+            limit, page_token = page_args
+            enrollments = service.get_enrollments_for_period(period_id, limit, page_token)
+        else:
+            enrollments = service.get_enrollments_for_period(period_id)
         return jsonify(enrollments), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         print("GET ENROLLMENTS ERROR:", str(e))
         return jsonify({"error": "Failed to fetch enrollments"}), 500
 
 
+@enrollment_bp.route('/roster/<period_id>', methods=['GET'])
+@jwt_required()
+def get_roster(period_id):
+    """Students' contact details and learning profiles; only the period's teacher may list them."""
+    try:
+        period = service.get_period(period_id)
+        if not period:
+            return jsonify({"error": "Period not found"}), 404
+        if period.get("teacher_id") != get_jwt_identity():
+            return jsonify({"error": "Unauthorized"}), 403
+
+        page_args = get_page_args()
+        if page_args:
+            limit, page_token = page_args
+            roster = service.get_roster(period_id, limit, page_token)
+        else:
+            roster = service.get_roster(period_id)
+        return jsonify(roster), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        print("GET ROSTER ERROR:", str(e))
+        return jsonify({"error": "Failed to fetch roster"}), 500
+
+
 @enrollment_bp.route('/student-profile/<period_id>/<student_id>', methods=['GET'])
 def get_student_profile(period_id, student_id):
     try:
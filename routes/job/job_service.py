@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from data_access.job_dao import get_job_dao
+from models.job import Job
+import os
+import threading
+import time
+import traceback
+import uuid
+
+# A queued/running job whose row has not changed for this long belonged to a
+# worker process that died; it is reported as failed. Live jobs are touched
+# every JOB_HEARTBEAT_SECONDS however long they run, so the stale threshold
+# only needs to cover a few missed heartbeats.
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))
+
+
+class JobService:
+    """
+    Runs long agent work off the request thread.
+
+    Job rows live in the job table, so any worker process can answer status
+    requests; the work itself runs on this process's thread pool.
+    """
+
+    def __init__(self, job_dao=None, max_workers=None, heartbeat_seconds=None):
+        self.job_dao = job_dao or get_job_dao()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("JOB_WORKERS", "4")),
+            thread_name_prefix="job"
+        )
+        self.heartbeat_seconds = heartbeat_seconds or JOB_HEARTBEAT_SECONDS
+        # Queued and running jobs of this process, kept fresh by the heartbeat
+        self._active_jobs = set()
+        self._lock = threading.Lock()
+        self._heartbeat_thread = None
+
+    def enqueue(self, job_type, user_id, run, period_id=None):
+        """
+        Record a queued job and start `run(progress)` on the worker pool.
+        `run` returns the job's result dict; `progress(message)` records how
+        far it has got. Returns the job as a dict.
+        """
+        job = Job(job_id=str(uuid.uuid4()), job_type=job_type, user_id=user_id, period_id=period_id)
+        self.job_dao.add_job(job)
+        with self._lock:
+            self._active_jobs.add(job.job_id)
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(
+                    target=self._heartbeat, name="job-heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+        self.executor.submit(self._run, job.job_id, run)
+        return job.to_item()
+
+    def _heartbeat(self):
+        """Refresh updated_at of every live job so get_job never sees it as stale."""
+        while True:
+            time.sleep(self.heartbeat_seconds)
+            with self._lock:
+                job_ids = list(self._active_jobs)
+            for job_id in job_ids:
+                try:
+                    self.job_dao.update_job(job_id, {})
+                except Exception as e:
+                    print(f"Job {job_id}: heartbeat failed: {str(e)}")
+
+    def _run(self, job_id, run):
+        try:
+            self._run_job(job_id, run)
+        finally:
+            with self._lock:
+                self._active_jobs.discard(job_id)
+
+    def _run_job(self, job_id, run):
+        self.job_dao.update_job(job_id, {"status": "running"})
+
+        def progress(message):
+            print(f"Job {job_id}: {message}")
+            self.job_dao.update_job(job_id, {"progress": message})
+
+        try:
+            result = run(progress)
+            self.job_dao.update_job(job_id, {"status": "succeeded", "result": result or {}})
+        except Exception as e:
+            traceback.print_exc()
+            self.job_dao.update_job(job_id, {"status": "failed", "error": str(e)})
+
+    def get_job(self, job_id, user_id):
+        """The job if it exists and belongs to user_id, else None."""
+        job = self.job_dao.get_job_by_id(job_id)
+        if not job or job.get("user_id") != user_id:
+            return None
+        if job.get("status") in ("queued", "running"):
+            updated_at = datetime.fromisoformat(job["updated_at"])
+            if datetime.now(timezone.utc) - updated_at > timedelta(seconds=JOB_STALE_SECONDS):
+                job["status"] = "failed"
+                job["error"] = "Job was interrupted before it finished"
+        return job
+
+
+# One worker pool per process, shared by every blueprint
+job_service = JobService()
@@ -0,0 +1,26 @@
+from flask import request
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def get_page_args():
+    """
+    Read optional `limit` / `page_token` query parameters.
+
+    Returns (limit, page_token) when the client asked for a paged response,
+    or None so routes keep returning their full, unpaged payload.
+    Raises ValueError for a malformed limit.
+    """
+    raw_limit = request.args.get('limit')
+    page_token = request.args.get('page_token') or None
+    if raw_limit is None and page_token is None:
+        return None
+
+    try:
+        limit = int(raw_limit) if raw_limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE), page_token
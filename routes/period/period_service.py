@@ -10,6 +10,7 @@ from assistants import ltg
 from datetime import datetime, timezone
 from EQ_agents.agent import SchedulesAgent, HWAgent
 from routes.quest.quest_service import QuestService
+from routes.job.job_service import job_service
 
 # Tutorial period constant
 TUTORIAL_PERIOD_ID = "PRECALC-58F9-88F5"
@@ -146,7 +147,8 @@ class PeriodService:
             "response": response
         }
 
-    def continue_ltg_conversation(self, auth_token: str, conversation_type: str, thread_id: str, message: str) -> Any:
+    def continue_ltg_conversation(self, auth_token: str, conversation_type: str, thread_id: str, message: str,
+                                  on_text_delta=None) -> Any:
         print(f"\n=== Starting LTG Conversation ===")
         print(f"Thread ID: {thread_id}")
         print(f"Message: {message}")
@@ -190,7 +192,7 @@ class PeriodService:
         conv = ltg(student, assistant_id=ltg_assistant_id)
         conv.thread_id = thread_id
         try:
-            reply, goal_chosen = conv.cont_conv(message)
+            reply, goal_chosen = conv.cont_conv(message, on_text_delta=on_text_delta)
             print(f"\nLTG Assistant Response:")
             print(f"Reply: {reply}")
             print(f"Goal chosen: {goal_chosen}")
@@ -221,13 +223,49 @@ class PeriodService:
             print(f"\nError in continue_ltg_conversation: {str(e)}")
             return {"error": str(e)}
         
+    def _get_session_user_id(self, auth_token: str) -> str:
+        sessions = self.session_dao.get_sessions_by_auth_token(auth_token)
+        if not sessions:
+            raise Exception("Invalid auth token")
+        return sessions[0]['user_id']
+
+    def _check_student_and_period(self, user_id: str, period_id: str) -> None:
+        """Fail fast, before a job is queued, when the student or period is missing."""
+        if not self.student_dao.get_student_by_id(user_id):
+            raise Exception("Student not found")
+        if not self.period_dao.get_period_by_id(period_id):
+            raise Exception("Period not found")
+
+    def enqueue_schedules_agent(self, auth_token: str, period_id: str) -> Dict[str, Any]:
+        """Queue run_schedules_agent as a background job and return the job."""
+        user_id = self._get_session_user_id(auth_token)
+        self._check_student_and_period(user_id, period_id)
+        return job_service.enqueue(
+            "schedules_agent", user_id,
+            lambda progress: self.run_schedules_agent(user_id, period_id, progress),
+            period_id=period_id
+        )
+
+    def enqueue_homework_agent(self, auth_token: str, period_id: str) -> Dict[str, Any]:
+        """Queue run_homework_agent as a background job and return the job."""
+        user_id = self._get_session_user_id(auth_token)
+        self._check_student_and_period(user_id, period_id)
+        if not self.quest_service.get_weekly_quests_for_student(user_id, period_id):
+            raise Exception("No weekly quest found. Please run the schedules agent first.")
+
+        def run(progress):
+            result = self.run_homework_agent(user_id, period_id, progress)
+            # The quests themselves are saved through QuestService; keep the job row small
+            return {"message": result["message"], "saved_quests": result["saved_quests"]}
+
+        return job_service.enqueue("homework_agent", user_id, run, period_id=period_id)
+
     def start_schedules_agent(self, auth_token: str, period_id: str):
-        try:
-            sessions = self.session_dao.get_sessions_by_auth_token(auth_token)
-            if not sessions:
-                raise Exception("Invalid auth token")
-            user_id = sessions[0]['user_id']
+        return self.run_schedules_agent(self._get_session_user_id(auth_token), period_id)
 
+    def run_schedules_agent(self, user_id: str, period_id: str, progress=None):
+        progress = progress or (lambda message: None)
+        try:
             student = self.student_dao.get_student_by_id(user_id)
             if not student:
                 raise Exception("Student not found")
@@ -236,6 +274,7 @@ class PeriodService:
             if not period:
                 raise Exception("Period not found")
 
+            progress("Generating schedule")
             schedules_agent = SchedulesAgent(student, period)
             schedule = schedules_agent.run()
             print(schedule)
@@ -243,25 +282,26 @@ class PeriodService:
             print(schedule.model_dump_json())
             
             # Save schedule to database
+            progress("Saving schedule")
             schedule_dict = schedule.model_dump()
             save_result = self.quest_service.save_schedule_to_weekly_quests(schedule_dict, user_id, period_id)
             
             return {
                 "schedule": schedule_dict,
                 "message": "Schedule generated and saved successfully",
-                "saved_quests": save_result
+                "saved_quests": save_result,
+                "guardrail": schedules_agent.guardrail_decision
             }
         except Exception as e:
-            print(f"Error in start_schedules_agent: {str(e)}")
+            print(f"Error in run_schedules_agent: {str(e)}")
             raise Exception(f"Failed to generate schedule: {str(e)}")
     
     def start_homework_agent(self, auth_token: str, period_id: str):
+        return self.run_homework_agent(self._get_session_user_id(auth_token), period_id)
+
+    def run_homework_agent(self, user_id: str, period_id: str, progress=None):
+        progress = progress or (lambda message: None)
         try:
-            sessions = self.session_dao.get_sessions_by_auth_token(auth_token)
-            if not sessions:
-                raise Exception("Invalid auth token")
-            user_id = sessions[0]['user_id']
-            
             student = self.student_dao.get_student_by_id(user_id)
             if not student:
                 raise Exception("Student not found")
@@ -278,77 +318,86 @@ class PeriodService:
             
             print(f"DEBUG: Found weekly quest with {len(weekly_quest.quests)} quests")
             
+            # Resume: weeks that already have instructions and a rubric were
+            # checkpointed by an earlier run and are not generated again
+            pending_items = [item for item in weekly_quest.quests if not self.quest_service.has_homework(item)]
+            total_quests = len(weekly_quest.quests)
+            skipped_count = total_quests - len(pending_items)
+            if skipped_count:
+                print(f"DEBUG: Resuming homework generation, {skipped_count} quests already have homework")
+
             # Convert weekly quest to schedule format for homework agent
             schedule_quests = []
-            for quest_item in weekly_quest.quests:
+            for quest_item in pending_items:
                 schedule_quests.append({
                     "Name": quest_item.name,
                     "Skills": quest_item.skills,
                     "Week": quest_item.week
                 })
+
+            # Only weeks whose checkpoint write succeeded count as saved
+            saved_weeks = []
+            failed_checkpoints = []
+
+            def checkpoint(quest):
+                # Runs as each quest finishes, so a timeout or crash only loses unfinished weeks
+                self.quest_service.save_quest_homework(weekly_quest, quest.model_dump())
+                saved_weeks.append(quest.Week)
+                progress(f"Saved week {quest.Week} ({skipped_count + len(saved_weeks)}/{total_quests} quests ready)")
+
+            if schedule_quests:
+                progress(f"Generating homework for {len(schedule_quests)} of {total_quests} quests")
+                homework_agent = HWAgent(
+                    student,
+                    period,
+                    schedule_quests,
+                    on_quest_done=checkpoint
+                )
+                homework_agent.run()
+                failed_checkpoints = [week for week, _ in homework_agent.failed_checkpoints]
+                if failed_checkpoints:
+                    print(f"DEBUG: Homework was generated but not saved for weeks {failed_checkpoints}")
+
+            # Report what was stored: weeks that already had homework plus the weeks saved now
+            pending_weeks = {item.week for item in pending_items}
+            saved_items = [item for item in weekly_quest.quests
+                           if item.week not in pending_weeks or item.week in saved_weeks]
+            homework_dict = {
+                "list_of_quests": [
+                    {
+                        "Name": item.description or item.name,
+                        "Skills": item.skills,
+                        "Week": item.week,
+                        "instructions": item.instructions,
+                        "rubric": item.rubric
+                    }
+                    for item in saved_items
+                ]
+            }
+            missing_weeks = [item.week for item in pending_items if item.week not in saved_weeks]
+            print(f"DEBUG: Homework quests count: {len(homework_dict['list_of_quests'])}, missing weeks: {missing_weeks}")
+
+            save_result = {
+                "message": f"Saved homework for {len(saved_weeks)} quests, {skipped_count} already had homework",
+                "quest_id": weekly_quest.quest_id,
+                "updated_quests_count": len(saved_weeks),
+                "skipped_quests_count": skipped_count,
+                "missing_weeks": missing_weeks,
+                "failed_checkpoints": failed_checkpoints,
+                "total_quests": total_quests
+            }
             
-            # schedule_dict = {"list_of_quests": schedule_quests}
-            # print(f"DEBUG: Schedule dict for homework agent: {schedule_dict}")
-            
-            # Use improved HWAgent with timeout and error handling
-            homework_agent = HWAgent(
-                student, 
-                period, 
-                schedule_quests
-            )
-            homework = homework_agent.run()
-            
-            print(f"Homework type: {type(homework)}")
-            print(f"Homework content: {homework}")
-            
-            # Handle list of IndividualQuest objects
-            if isinstance(homework, list):
-                # Convert list of IndividualQuest objects to the expected dict format
-                homework_dict = {
-                    "list_of_quests": []
-                }
-                for quest in homework:
-                    if hasattr(quest, 'model_dump'):
-                        homework_dict["list_of_quests"].append(quest.model_dump())
-                    elif isinstance(quest, dict):
-                        homework_dict["list_of_quests"].append(quest)
-                    else:
-                        # Try to convert to dict manually if it's an IndividualQuest object
-                        quest_dict = {
-                            "Name": getattr(quest, 'Name', ''),
-                            "Skills": getattr(quest, 'Skills', ''),
-                            "Week": getattr(quest, 'Week', 1),
-                            "instructions": getattr(quest, 'instructions', ''),
-                            "rubric": getattr(quest, 'rubric', {})
-                        }
-                        homework_dict["list_of_quests"].append(quest_dict)
-            elif hasattr(homework, 'model_dump'):
-                homework_dict = homework.model_dump()
-            elif isinstance(homework, dict):
-                homework_dict = homework
-            else:
-                raise Exception(f"Invalid homework format: {type(homework)}")
-            
-            print(f"Homework dict: {homework_dict}")
-            print(f"DEBUG: Homework quests count: {len(homework_dict.get('list_of_quests', []))}")
-            
-            # Update the weekly quest with detailed homework information
-            save_result = self.quest_service.update_weekly_quest_with_homework(homework_dict, user_id, period_id)
-            
-            # Check if individual quests were created, if not create them
-            individual_quests = self.quest_service.get_individual_quests_for_student_and_period(user_id, period_id)
-            if not individual_quests:
-                print("DEBUG: No individual quests found, creating them from homework data")
-                create_result = self.quest_service.create_individual_quests_from_homework(homework_dict, user_id, period_id)
-                print(f"DEBUG: Created individual quests: {create_result}")
-            
+            message = "Homework generated and saved successfully"
+            if missing_weeks:
+                message = f"Homework saved for {total_quests - len(missing_weeks)}/{total_quests} quests; run again to generate weeks {missing_weeks}"
+
             return {
                 "homework": homework_dict,
-                "message": "Homework generated and saved successfully",
+                "message": message,
                 "saved_quests": save_result
             }
         except Exception as e:
-            print(f"Error in start_homework_agent: {str(e)}")
+            print(f"Error in run_homework_agent: {str(e)}")
             import traceback
             traceback.print_exc()
             raise Exception(f"Failed to generate homework: {str(e)}")
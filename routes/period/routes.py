@@ -1,5 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from .period_service import PeriodService
+from routes.sse import stream_assistant_reply
+from routes.auth_context import get_request_sessions
+from routes.job.job_service import job_service
 
 period_bp = Blueprint('period', __name__)
 period_service = PeriodService()
@@ -7,27 +10,7 @@ period_service = PeriodService()
 @period_bp.route('/verify-period', methods=['POST'])
 def verify_period():
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
 
         data = request.json
         period_id = data.get('period_id')
@@ -49,27 +32,7 @@ def verify_period():
 @period_bp.route('/initiate-ltg-conversation', methods=['POST'])
 def initiate_ltg_conversation():
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
 
         data = request.json
         period_id = data.get('period_id')
@@ -91,31 +54,14 @@ def initiate_ltg_conversation():
         print(f"Unexpected error: {e}")
         return jsonify({"error": "An unexpected error occurred"}), 500
 
-@period_bp.route('/continue-ltg-conversation', methods=['POST'])
-def continue_ltg_conversation():
+@period_bp.route('/continue-ltg-conversation', methods=['POST'], defaults={'stream': False})
+@period_bp.route('/continue-ltg-conversation/stream', methods=['POST'], defaults={'stream': True})
+def continue_ltg_conversation(stream):
     try:
         data = request.json
         
         
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
 
         conversation_type = data.get('conversation_type')
         thread_id = data.get('thread_id')
@@ -128,6 +74,13 @@ def continue_ltg_conversation():
         if not user_message:
             return jsonify({"error": "message is required"}), 400
 
+        if stream:
+            return stream_assistant_reply(
+                lambda on_text_delta: period_service.continue_ltg_conversation(
+                    auth_token, conversation_type, thread_id, user_message, on_text_delta=on_text_delta),
+                field="message"
+            )
+
         result = period_service.continue_ltg_conversation(auth_token, conversation_type, thread_id, user_message)
         return jsonify(result), 200
     except Exception as e:
@@ -136,34 +89,21 @@ def continue_ltg_conversation():
 @period_bp.route('/initiate-schedules-agent', methods=['POST'])
 def initiate_schedules_agent():
     try:
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
+
         data = request.json
         
         period_id = data.get('period_id')  
         if not period_id:
             return jsonify({"error": "period_id is required"}), 400
         
-        result = period_service.start_schedules_agent(auth_token, period_id)
-        return jsonify(result), 200
+        # Older clients can still wait for the schedule with {"async": false}
+        if data.get('async', True) is False:
+            result = period_service.start_schedules_agent(auth_token, period_id)
+            return jsonify(result), 200
+
+        job = period_service.enqueue_schedules_agent(auth_token, period_id)
+        return jsonify(job), 202
     except Exception as e:
         print(f"Error in initiate-schedules-agent: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -171,35 +111,37 @@ def initiate_schedules_agent():
 @period_bp.route('/initiate-homework-agent', methods=['POST'])
 def initiate_homework_agent():
     try:
-        
-        
-            
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
+        auth_token = g.auth_token
+
         data = request.json
         period_id = data.get('period_id')
         if not period_id:
             return jsonify({"error": "period_id is required"}), 400
         
-        result = period_service.start_homework_agent(auth_token, period_id)
-        return jsonify(result), 200
+        # Older clients can still wait for the homework with {"async": false}
+        if data.get('async', True) is False:
+            result = period_service.start_homework_agent(auth_token, period_id)
+            return jsonify(result), 200
+
+        job = period_service.enqueue_homework_agent(auth_token, period_id)
+        return jsonify(job), 202
     except Exception as e:
         print(f"Error in initiate-homework-agent: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@period_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress and result of a background agent job."""
+    try:
+        sessions = get_request_sessions()
+        if not sessions:
+            return jsonify({"error": "Invalid auth token"}), 401
+
+        job = job_service.get_job(job_id, sessions[0]['user_id'])
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job), 200
+    except Exception as e:
+        print(f"Error getting job {job_id}: {e}")
+        return jsonify({"error": "Failed to get job"}), 500
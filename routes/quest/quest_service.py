@@ -1,5 +1,6 @@
 from data_access.weekly_quest_dao import WeeklyQuestDAO
 from data_access.individual_quest_dao import IndividualQuestDAO
+from data_access.base_dao import transact_write, ConditionalWriteError
 from models.weekly_quest import WeeklyQuest
 from models.weekly_quest_item import WeeklyQuestItem
 from models.individual_quest import IndividualQuest
@@ -58,8 +59,7 @@ class QuestService:
             self.weekly_quest_dao.add_weekly_quest(weekly_quest)
             print(f"DEBUG: Successfully saved weekly quest to database")
             
-            for individual_quest in individual_quests:
-                self.individual_quest_dao.add_individual_quest(individual_quest)
+            self.individual_quest_dao.add_individual_quests(individual_quests)
             
             return {
                 "message": f"Successfully saved weekly quest list with {len(quest_items)} individual quests",
@@ -80,6 +80,7 @@ class QuestService:
             print(f"DEBUG: list_of_quests: {homework_data.get('list_of_quests', [])}")
             
             saved_quests = []
+            individual_quests = []
             
             for quest_data in homework_data.get("list_of_quests", []):
                 print(f"DEBUG: Processing quest_data: {quest_data}")
@@ -101,9 +102,11 @@ class QuestService:
                 
                 print(f"DEBUG: Created IndividualQuest: {individual_quest.model_dump()}")
                 
-                self.individual_quest_dao.add_individual_quest(individual_quest)
+                individual_quests.append(individual_quest)
                 saved_quests.append(quest_id)
             
+            self.individual_quest_dao.add_individual_quests(individual_quests)
+            
             return {
                 "message": f"Successfully saved {len(saved_quests)} individual quests",
                 "quest_ids": saved_quests
@@ -113,85 +116,78 @@ class QuestService:
             print(f"Error saving homework to individual quests: {str(e)}")
             raise Exception(f"Failed to save homework: {str(e)}")
 
-    def update_weekly_quest_with_homework(self, homework_data: dict, student_id: str, period_id: str) -> dict:
-        """Update both weekly quest table and individual quest table with detailed homework information from HomeworkAgent."""
-        try:
-            print(f"DEBUG: Updating weekly quest with homework_data: {homework_data}")
-            
-            weekly_quest = self.weekly_quest_dao.get_weekly_quest_by_student_and_period(student_id, period_id)
-            if not weekly_quest:
-                raise Exception(f"No weekly quest found for student {student_id} and period {period_id}")
-            
-            print(f"DEBUG: Found existing weekly quest: {weekly_quest.quest_id}")
-            print(f"DEBUG: Existing quests count: {len(weekly_quest.quests)}")
-            
-            homework_by_week = {}
-            for quest_data in homework_data.get("list_of_quests", []):
-                week = quest_data.get("Week", 1)
-                homework_by_week[week] = quest_data
-            
-            print(f"DEBUG: Homework data by week: {homework_by_week}")
-            
-            updated_count = 0
-            for quest_item in weekly_quest.quests:
-                week = quest_item.week
-                if week in homework_by_week:
-                    homework_quest = homework_by_week[week]
-                    
-                    # Update the weekly quest item
-                    quest_item.description = homework_quest.get("Name", quest_item.name)
-                    quest_item.instructions = homework_quest.get("instructions", "")
-                    quest_item.rubric = homework_quest.get("rubric", {})
-                    quest_item.last_updated_at = datetime.now(timezone.utc).isoformat()
-                    
-                    # Update the individual quest in the database
-                    try:
-                        self.individual_quest_dao.update_individual_quest_by_individual_id(
-                            quest_item.individual_quest_id,
-                            {
-                                "description": homework_quest.get("Name", quest_item.name),
-                                "instructions": homework_quest.get("instructions", ""),
-                                "rubric": homework_quest.get("rubric", {})
-                            }
-                        )
-                        print(f"DEBUG: Successfully updated individual quest {quest_item.individual_quest_id} for week {week}")
-                    except Exception as e:
-                        print(f"DEBUG: Error updating individual quest {quest_item.individual_quest_id}: {str(e)}")
-                        # Try to create a new individual quest if update fails
-                        try:
-                            individual_quest = IndividualQuest(
-                                individual_quest_id=quest_item.individual_quest_id,
-                                quest_id=weekly_quest.quest_id,
-                                student_id=student_id,
-                                period_id=period_id,
-                                description=homework_quest.get("Name", quest_item.name),
-                                skills=quest_item.skills,
-                                week=week,
-                                instructions=homework_quest.get("instructions", ""),
-                                rubric=homework_quest.get("rubric", {}),
-                                status="not_started"
-                            )
-                            self.individual_quest_dao.add_individual_quest(individual_quest)
-                            print(f"DEBUG: Created new individual quest {quest_item.individual_quest_id} for week {week}")
-                        except Exception as create_error:
-                            print(f"DEBUG: Error creating individual quest {quest_item.individual_quest_id}: {str(create_error)}")
-                    
-                    updated_count += 1
-                    print(f"DEBUG: Updated quest for week {week}")
-            
-            # Save the updated weekly quest
-            self.weekly_quest_dao.add_weekly_quest(weekly_quest)
-            
-            return {
-                "message": f"Successfully updated {updated_count} quests in both weekly quest list and individual quest table",
+    def _homework_action(self, weekly_quest: WeeklyQuest, quest_item: WeeklyQuestItem, homework: dict) -> dict:
+        """
+        Return the transactional upsert of a weekly quest item's individual
+        quest: the identifying fields are filled in if the row is missing,
+        otherwise only the homework content changes.
+        """
+        return self.individual_quest_dao.update_quest_action(
+            quest_item.individual_quest_id,
+            homework,
+            defaults={
                 "quest_id": weekly_quest.quest_id,
-                "updated_quests_count": updated_count,
-                "total_quests": len(weekly_quest.quests)
+                "student_id": weekly_quest.student_id,
+                "period_id": weekly_quest.period_id,
+                "student_period_key": f"{weekly_quest.student_id}#{weekly_quest.period_id}",
+                "skills": quest_item.skills,
+                "week": quest_item.week,
+                "status": "not_started",
+                "created_at": quest_item.created_at,
+                "due_date": quest_item.due_date or quest_item.created_at
             }
-            
-        except Exception as e:
-            print(f"Error updating weekly quest with homework: {str(e)}")
-            raise Exception(f"Failed to update weekly quest: {str(e)}")
+        )
+
+    @staticmethod
+    def has_homework(quest_item: WeeklyQuestItem) -> bool:
+        """True once a quest has both its instructions and its rubric."""
+        return bool(quest_item.instructions) and bool(quest_item.rubric)
+
+    def save_quest_homework(self, weekly_quest: WeeklyQuest, homework_quest: dict) -> WeeklyQuestItem:
+        """
+        Checkpoint the homework for a single week as soon as it is generated.
+
+        The individual quest is written first and the weekly quest item second,
+        and the in-memory item is only updated once both writes succeed, so an
+        item that has_homework() always has its homework stored.
+        Only quests[i] of the weekly quest is touched, so checkpoints for
+        different weeks can be written concurrently.
+        """
+        week = homework_quest.get("Week", 1)
+        quest_item = next((item for item in weekly_quest.quests if item.week == week), None)
+        if quest_item is None:
+            raise ValueError(f"Week {week} is not in weekly quest {weekly_quest.quest_id}")
+
+        homework = {
+            "description": homework_quest.get("Name", quest_item.name),
+            "instructions": homework_quest.get("instructions", ""),
+            "rubric": homework_quest.get("rubric", {})
+        }
+        transact_write([self._homework_action(weekly_quest, quest_item, homework)])
+        self.weekly_quest_dao.update_individual_quest_in_weekly_quest(
+            weekly_quest.quest_id,
+            quest_item.individual_quest_id,
+            homework
+        )
+        quest_item.description = homework["description"]
+        quest_item.instructions = homework["instructions"]
+        quest_item.rubric = homework["rubric"]
+        quest_item.last_updated_at = datetime.now(timezone.utc).isoformat()
+        print(f"DEBUG: Checkpointed homework for week {week} of weekly quest {weekly_quest.quest_id}")
+        return quest_item
+
+    def _save_weekly_quest_transactionally(self, weekly_quest: WeeklyQuest, quest_actions: list) -> None:
+        """
+        Write the weekly quest document and its individual quest changes in one
+        transaction. The weekly quest write is conditioned on the version that
+        was read, so a concurrent save raises ConditionalWriteError and nothing
+        is written.
+        """
+        weekly_quest.last_updated_at = datetime.now(timezone.utc).isoformat()
+        actions = [self.weekly_quest_dao.versioned_put_action(weekly_quest)] + quest_actions
+        transact_write(actions)
+        weekly_quest.version += 1
+        print(f"DEBUG: Saved weekly quest {weekly_quest.quest_id} (version {weekly_quest.version}) with {len(quest_actions)} individual quest writes")
 
     def get_weekly_quests_for_student(self, student_id: str, period_id: str) -> WeeklyQuest:
         """Get the weekly quest list for a student in a specific period."""
@@ -204,6 +200,15 @@ class QuestService:
     def get_individual_quests_for_student_and_period(self, student_id: str, period_id: str) -> list:
         return self.individual_quest_dao.get_quests_by_student_and_period(student_id, period_id)
 
+    def get_individual_quests_for_student_page(self, student_id: str, limit: int, page_token: str = None) -> tuple:
+        """Get one page of a student's individual quests and the next page token."""
+        return self.individual_quest_dao.get_quests_by_student_page(student_id, limit, page_token)
+
+    def get_individual_quests_for_student_and_period_page(self, student_id: str, period_id: str,
+                                                          limit: int, page_token: str = None) -> tuple:
+        """Get one page of a student's individual quests in a period and the next page token."""
+        return self.individual_quest_dao.get_quests_by_student_and_period_page(student_id, period_id, limit, page_token)
+
     def update_individual_quest_status(self, quest_id: str, individual_quest_id: str, status: str) -> dict:
         """Update the status of a specific individual quest within a weekly quest list."""
         try:
@@ -220,6 +225,8 @@ class QuestService:
                 "status": status
             }
             
+        except ConditionalWriteError:
+            raise
         except Exception as e:
             print(f"Error updating individual quest status: {str(e)}")
             raise Exception(f"Failed to update quest status: {str(e)}")
@@ -286,7 +293,7 @@ class QuestService:
                 raise Exception(f"No weekly quest found for student {student_id} and period {period_id}")
             
             quest_id = weekly_quest.quest_id
-            created_count = 0
+            individual_quests = []
             
             for quest_data in homework_data.get("list_of_quests", []):
                 individual_quest_id = str(uuid.uuid4())
@@ -304,10 +311,12 @@ class QuestService:
                     status="not_started"
                 )
                 
-                self.individual_quest_dao.add_individual_quest(individual_quest)
-                created_count += 1
+                individual_quests.append(individual_quest)
                 print(f"DEBUG: Created individual quest {individual_quest_id} for week {quest_data.get('Week', 1)}")
             
+            self.individual_quest_dao.add_individual_quests(individual_quests)
+            created_count = len(individual_quests)
+            
             return {
                 "message": f"Successfully created {created_count} individual quests",
                 "quest_id": quest_id,
@@ -344,51 +353,23 @@ class QuestService:
             # Get weekly quest
             weekly_quest = self.weekly_quest_dao.get_weekly_quest_by_student_and_period(student_id, period_id)
             if not weekly_quest and existing_quests:
-                # Create a weekly quest structure from existing individual quests
+                # Build a weekly quest structure from existing individual quests;
+                # it is written together with the quest changes below
                 print("DEBUG: No weekly quest found but individual quests exist - creating weekly quest structure")
                 
                 # Use the quest_id from the first existing quest (they should all have the same quest_id)
-                quest_id = existing_quests[0]['quest_id']
-                
-                # Create weekly quest items from existing quests
-                quest_items = []
-                for quest in existing_quests:
-                    quest_item = WeeklyQuestItem(
-                        individual_quest_id=quest['individual_quest_id'],
-                        name=quest.get('description', ''),
-                        skills=quest.get('skills', ''),
-                        week=quest['week'],
-                        status=quest.get('status', 'not_started'),
-                        description=quest.get('description', ''),
-                        instructions=quest.get('instructions', ''),
-                        rubric=quest.get('rubric', {})
-                    )
-                    quest_items.append(quest_item)
-                
-                # Create and save weekly quest
                 weekly_quest = WeeklyQuest(
-                    quest_id=quest_id,
+                    quest_id=existing_quests[0]['quest_id'],
                     student_id=student_id,
                     period_id=period_id,
-                    quests=quest_items
+                    student_period_key=f"{student_id}#{period_id}",
+                    quests=[]
                 )
-                self.weekly_quest_dao.add_weekly_quest(weekly_quest)
-                print(f"DEBUG: Created weekly quest structure with {len(quest_items)} existing quests")
                 
             elif not weekly_quest:
-                # If no weekly quest exists and no individual quests, use the regular save method
+                # If no weekly quest exists and no individual quests, create the whole structure at once
                 print("DEBUG: No existing weekly quest or individual quests found, creating new structure")
-                schedule_result = self.save_schedule_to_weekly_quests(schedule_data, student_id, period_id)
-                homework_result = self.update_weekly_quest_with_homework(homework_data, student_id, period_id)
-                return {
-                    "message": "Created new quest structure",
-                    "schedule_result": schedule_result,
-                    "homework_result": homework_result,
-                    "preserved_quests": 0,
-                    "updated_quests": 0,
-                    "created_quests": len(schedule_data.get("list_of_quests", [])),
-                    "total_quests": len(schedule_data.get("list_of_quests", []))
-                }
+                return self._create_quest_structure(schedule_data, homework_data, student_id, period_id)
             
             # Process homework data by week for easier lookup
             homework_by_week = {}
@@ -396,6 +377,11 @@ class QuestService:
                 week = quest_data.get("Week", 1)
                 homework_by_week[week] = quest_data
             
+            # Current state of every individual quest, kept in memory so the
+            # weekly quest can be rebuilt without reading the table again
+            current_quests = {quest['individual_quest_id']: dict(quest) for quest in existing_quests}
+            quest_actions = []
+            
             # Update quests preserving completed data
             updated_count = 0
             preserved_count = 0
@@ -428,10 +414,11 @@ class QuestService:
                         # as this could invalidate the work that was already graded
                         
                         if updates:
-                            self.individual_quest_dao.update_individual_quest(
+                            quest_actions.append(self.individual_quest_dao.update_quest_action(
                                 existing_quest['individual_quest_id'],
                                 updates
-                            )
+                            ))
+                            current_quests[existing_quest['individual_quest_id']].update(updates)
                             print(f"DEBUG: Updated metadata for preserved quest week {week}")
                         
                         preserved_count += 1
@@ -447,10 +434,11 @@ class QuestService:
                             "rubric": homework_quest.get("rubric", {})
                         }
                         
-                        self.individual_quest_dao.update_individual_quest(
+                        quest_actions.append(self.individual_quest_dao.update_quest_action(
                             existing_quest['individual_quest_id'],
                             updates
-                        )
+                        ))
+                        current_quests[existing_quest['individual_quest_id']].update(updates)
                         updated_count += 1
                 else:
                     # New quest - create it
@@ -470,15 +458,13 @@ class QuestService:
                         status="not_started"
                     )
                     
-                    self.individual_quest_dao.add_individual_quest(individual_quest)
+                    quest_actions.append(self.individual_quest_dao.put_quest_action(individual_quest))
+                    current_quests[individual_quest_id] = individual_quest.to_item()
                     created_count += 1
             
-            # Update weekly quest structure if needed
-            # We'll rebuild the weekly quest items from current individual quests
-            updated_individual_quests = self.get_individual_quests_for_student_and_period(student_id, period_id)
+            # Rebuild the weekly quest items from the in-memory quest state
             quest_items = []
-            
-            for quest in updated_individual_quests:
+            for quest in sorted(current_quests.values(), key=lambda quest: int(quest['week'])):
                 quest_item = WeeklyQuestItem(
                     individual_quest_id=quest['individual_quest_id'],
                     name=quest.get('description', ''),
@@ -487,28 +473,88 @@ class QuestService:
                     status=quest.get('status', 'not_started'),
                     description=quest.get('description', ''),
                     instructions=quest.get('instructions', ''),
-                    rubric=quest.get('rubric', {})
+                    rubric=quest.get('rubric', {}),
+                    grade=quest.get('grade'),
+                    feedback=quest.get('feedback'),
+                    due_date=quest.get('due_date')
                 )
                 quest_items.append(quest_item)
             
-            # Update weekly quest with new structure
+            # Save the weekly quest and all individual quest changes together
             weekly_quest.quests = quest_items
-            weekly_quest.last_updated_at = datetime.now(timezone.utc).isoformat()
-            self.weekly_quest_dao.add_weekly_quest(weekly_quest)
+            self._save_weekly_quest_transactionally(weekly_quest, quest_actions)
             
             return {
                 "message": f"Successfully updated quests preserving completed data",
                 "preserved_quests": preserved_count,
                 "updated_quests": updated_count,
                 "created_quests": created_count,
-                "total_quests": len(updated_individual_quests),
+                "total_quests": len(quest_items),
                 "quest_id": weekly_quest.quest_id
             }
             
+        except ConditionalWriteError:
+            print(f"Weekly quest for student {student_id} and period {period_id} changed concurrently")
+            raise
         except Exception as e:
             print(f"Error updating quests while preserving data: {str(e)}")
             raise Exception(f"Failed to update quests safely: {str(e)}")
 
+    def _create_quest_structure(self, schedule_data: dict, homework_data: dict, student_id: str, period_id: str) -> dict:
+        """Create the weekly quest and its individual quests, with homework merged in, in one transaction."""
+        quest_id = str(uuid.uuid4())
+        
+        homework_by_week = {}
+        for quest_data in homework_data.get("list_of_quests", []):
+            homework_by_week[quest_data.get("Week", 1)] = quest_data
+        
+        quest_items = []
+        quest_actions = []
+        for quest_data in schedule_data.get("list_of_quests", []):
+            week = quest_data.get("Week", 1)
+            homework_quest = homework_by_week.get(week, {})
+            individual_quest = IndividualQuest(
+                individual_quest_id=str(uuid.uuid4()),
+                quest_id=quest_id,
+                student_id=student_id,
+                period_id=period_id,
+                description=homework_quest.get("Name", quest_data.get("Name", "")),
+                skills=quest_data.get("Skills", ""),
+                week=week,
+                instructions=homework_quest.get("instructions", ""),
+                rubric=homework_quest.get("rubric", {}),
+                status="not_started"
+            )
+            quest_items.append(WeeklyQuestItem(
+                individual_quest_id=individual_quest.individual_quest_id,
+                name=quest_data.get("Name", ""),
+                skills=individual_quest.skills,
+                week=week,
+                status="not_started",
+                description=individual_quest.description,
+                instructions=individual_quest.instructions,
+                rubric=individual_quest.rubric
+            ))
+            quest_actions.append(self.individual_quest_dao.put_quest_action(individual_quest))
+        
+        weekly_quest = WeeklyQuest(
+            quest_id=quest_id,
+            student_id=student_id,
+            period_id=period_id,
+            student_period_key=f"{student_id}#{period_id}",
+            quests=quest_items
+        )
+        self._save_weekly_quest_transactionally(weekly_quest, quest_actions)
+        
+        return {
+            "message": "Created new quest structure",
+            "quest_id": quest_id,
+            "preserved_quests": 0,
+            "updated_quests": 0,
+            "created_quests": len(quest_items),
+            "total_quests": len(quest_items)
+        }
+
     @staticmethod
     def parse_grade_data(grade_str: str) -> dict:
         """
@@ -1,38 +1,20 @@
 from flask import Blueprint, request, jsonify
 from routes.quest.quest_service import QuestService
-from data_access.session_dao import SessionDAO
+from routes.auth_context import get_request_sessions
+from data_access.individual_quest_dao import IndividualQuestDAO
+from data_access.base_dao import ConditionalWriteError
+from routes.pagination import get_page_args
 import boto3
 import os
 
 quest_bp = Blueprint('quest', __name__)
 quest_service = QuestService()
-session_dao = SessionDAO()
+individual_quest_dao = IndividualQuestDAO()
 
 @quest_bp.route('/weekly-quests/<period_id>', methods=['GET'])
 def get_weekly_quests(period_id):
     try:
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         user_id = sessions[0]['user_id']
@@ -49,33 +31,27 @@ def get_weekly_quests(period_id):
 @quest_bp.route('/individual-quests', methods=['GET'])
 def get_individual_quests():
     try:
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         user_id = sessions[0]['user_id']
 
+        try:
+            page_args = get_page_args()
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+
         period_id = request.args.get('period_id')
-        if period_id:
+        next_page_token = None
+        if page_args:
+            limit, page_token = page_args
+            if period_id:
+                quests, next_page_token = quest_service.get_individual_quests_for_student_and_period_page(
+                    user_id, period_id, limit, page_token)
+            else:
+                quests, next_page_token = quest_service.get_individual_quests_for_student_page(
+                    user_id, limit, page_token)
+        elif period_id:
             quests = quest_service.get_individual_quests_for_student_and_period(user_id, period_id)
         else:
             quests = quest_service.get_individual_quests_for_student(user_id)
@@ -90,7 +66,12 @@ def get_individual_quests():
                 quest['grade_info'] = quest_service.parse_grade_data(None)
                 quest['display_grade'] = "Not graded"
         
+        if page_args:
+            return jsonify({"items": quests, "next_page_token": next_page_token}), 200
         return jsonify(quests), 200
+    except ValueError as ve:
+        # Malformed page_token
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         print(f"Error getting individual quests: {str(e)}")
         return jsonify({"error": "Failed to get individual quests"}), 500
@@ -99,29 +80,7 @@ def get_individual_quests():
 def get_student_individual_quests(student_id):
     """Get individual quests for a specific student (for teachers)."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         teacher_id = sessions[0]['user_id']
@@ -129,7 +88,17 @@ def get_student_individual_quests(student_id):
         # we still need to add authorization check to ensure the teacher has access to this student. 
         # for now, any authenticated user can view any student's quests
         
-        quests = quest_service.get_individual_quests_for_student(student_id)
+        try:
+            page_args = get_page_args()
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+
+        next_page_token = None
+        if page_args:
+            limit, page_token = page_args
+            quests, next_page_token = quest_service.get_individual_quests_for_student_page(student_id, limit, page_token)
+        else:
+            quests = quest_service.get_individual_quests_for_student(student_id)
         
         # Add grade parsing for each quest
         for quest in quests:
@@ -141,7 +110,12 @@ def get_student_individual_quests(student_id):
                 quest['grade_info'] = quest_service.parse_grade_data(None)
                 quest['display_grade'] = "Not graded"
         
+        if page_args:
+            return jsonify({"items": quests, "next_page_token": next_page_token}), 200
         return jsonify(quests), 200
+    except ValueError as ve:
+        # Malformed page_token
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         print(f"Error getting student individual quests: {str(e)}")
         return jsonify({"error": "Failed to get student individual quests"}), 500
@@ -150,29 +124,7 @@ def get_student_individual_quests(student_id):
 def update_individual_quest_status(quest_id, individual_quest_id):
     """Update the status of a specific individual quest within a weekly quest list."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
 
@@ -186,6 +138,8 @@ def update_individual_quest_status(quest_id, individual_quest_id):
 
         result = quest_service.update_individual_quest_status(quest_id, individual_quest_id, status)
         return jsonify(result), 200
+    except ConditionalWriteError:
+        return jsonify({"error": "Quest list was modified concurrently, please retry"}), 409
     except Exception as e:
         print(f"Error updating individual quest status: {str(e)}")
         return jsonify({"error": "Failed to update quest status"}), 500
@@ -194,29 +148,7 @@ def update_individual_quest_status(quest_id, individual_quest_id):
 def get_individual_quest(quest_id, individual_quest_id):
     """Get a specific individual quest from a weekly quest list."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
 
@@ -233,29 +165,7 @@ def get_individual_quest(quest_id, individual_quest_id):
 def verify_quest_structure(period_id):
     """Verify that quests are saved correctly in both tables."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         user_id = sessions[0]['user_id']
@@ -270,36 +180,12 @@ def verify_quest_structure(period_id):
 def get_individual_quest_details(individual_quest_id):
     """Get a specific individual quest details from the individual_quest table."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
 
         # Get the individual quest directly from the individual_quest table
-        from data_access.individual_quest_dao import IndividualQuestDAO
-        quest_dao = IndividualQuestDAO()
-        quest = quest_dao.get_individual_quest_by_id(individual_quest_id)
+        quest = individual_quest_dao.get_individual_quest_by_id(individual_quest_id)
         
         if quest:
             # Parse grade data for frontend display
@@ -344,7 +230,7 @@ def parse_grade_data():
         print(f"Error parsing grade data: {e}")
         return jsonify({"error": "Failed to parse grade data"}), 500 
 
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         
@@ -384,29 +270,7 @@ def parse_grade_data():
 def grade_individual_quest(individual_quest_id):
     """Grade an individual quest (for teachers)."""
     try:
-        
-        
-        # Prefer Authorization: Bearer <token>
-        auth_token = None
-        token = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header and auth_header.lower().startswith('bearer '):
-            token = auth_header.split(' ', 1)[1].strip()
-            auth_token = token
-
-
-        # Fallback: parse the last auth_token from Cookie header if multiple exist
-        if not token:
-            raw_cookie = request.headers.get('Cookie', '')
-            if 'auth_token=' in raw_cookie:
-                parts = [p.strip() for p in raw_cookie.split(';')]
-                auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-                if auth_tokens:
-                    auth_token = auth_tokens[-1]
-
-        print(f"Auth token for initiate-profile-assistant: {auth_token}")
-
-        sessions = session_dao.get_sessions_by_auth_token(auth_token)
+        sessions = get_request_sessions()
         if not sessions:
             return jsonify({"error": "Invalid auth token"}), 401
         teacher_id = sessions[0]['user_id']
@@ -421,9 +285,7 @@ def grade_individual_quest(individual_quest_id):
             return jsonify({"error": "feedback is required"}), 400
 
         # Update the individual quest with grade and feedback
-        from data_access.individual_quest_dao import IndividualQuestDAO
-        quest_dao = IndividualQuestDAO()
-        quest_dao.update_quest_grade_and_feedback(individual_quest_id, grade, feedback)
+        individual_quest_dao.update_quest_grade_and_feedback(individual_quest_id, grade, feedback)
         
         return jsonify({
             "message": "Grade and feedback submitted successfully",
@@ -0,0 +1,126 @@
+import json
+import queue
+import threading
+from flask import Response
+
+_DONE = object()
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class JsonFieldDeltas:
+    """
+    Turn streamed chunks of an assistant's JSON reply into the decoded text of
+    one top-level string field (e.g. "response"), as it arrives. Students see
+    the reply itself rather than raw JSON fragments.
+    """
+
+    def __init__(self, field, emit):
+        self.field = field
+        self.emit = emit
+        self.raw = ""
+        self._pos = None    # index of the next unread character of the field value
+        self._done = False
+
+    def feed(self, chunk):
+        self.raw += chunk
+        if self._done:
+            return
+        if self._pos is None:
+            self._pos = self._find_value_start()
+            if self._pos is None:
+                return
+
+        out = []
+        i = self._pos
+        while i < len(self.raw):
+            ch = self.raw[i]
+            if ch == '"':
+                self._done = True
+                break
+            if ch != '\\':
+                out.append(ch)
+                i += 1
+                continue
+            # Wait for the rest of a split escape sequence
+            if i + 1 >= len(self.raw):
+                break
+            code = self.raw[i + 1]
+            if code == 'u':
+                if i + 6 > len(self.raw):
+                    break
+                out.append(chr(int(self.raw[i + 2:i + 6], 16)))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+        self._pos = i
+        if out:
+            self.emit("".join(out))
+
+    def _find_value_start(self):
+        key = self.raw.find(f'"{self.field}"')
+        if key == -1:
+            return None
+        colon = self.raw.find(':', key + len(self.field) + 2)
+        if colon == -1:
+            return None
+        rest = self.raw[colon + 1:]
+        stripped = rest.lstrip()
+        if not stripped:
+            return None
+        if stripped[0] != '"':
+            # Not a string value; nothing to stream
+            self._done = True
+            return None
+        return colon + 1 + (len(rest) - len(stripped)) + 1
+
+
+def stream_assistant_reply(call, field="response"):
+    """
+    Stream an assistant turn as server-sent events.
+
+    `call(on_text_delta)` runs the turn and returns the service's result dict.
+    Events: `delta` ({"text": ...}) for each piece of the reply's `field`,
+    then one `done` carrying the result plus the parsed assistant JSON under
+    "assistant_output", or `error` ({"error": ...}). The `done` response is
+    final; services may add to the streamed text (e.g. quest update notes).
+    """
+    events = queue.Queue()
+    deltas = JsonFieldDeltas(field, lambda text: events.put(sse_event("delta", {"text": text})))
+
+    def worker():
+        try:
+            result = call(deltas.feed)
+            if isinstance(result, dict) and result.get("error"):
+                events.put(sse_event("error", {"error": result["error"]}))
+                return
+            try:
+                parsed = json.loads(deltas.raw) if deltas.raw else None
+            except ValueError:
+                parsed = None
+            events.put(sse_event("done", {**(result or {}), "assistant_output": parsed}))
+        except Exception as e:
+            print(f"Error in streamed assistant turn: {e}")
+            events.put(sse_event("error", {"error": str(e)}))
+        finally:
+            events.put(_DONE)
+
+    # The turn runs to completion (and saves its results) even if the client disconnects
+    threading.Thread(target=worker, daemon=True).start()
+
+    def generate():
+        while True:
+            item = events.get()
+            if item is _DONE:
+                return
+            yield item
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
@@ -1,17 +1,22 @@
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify, Response, redirect
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from routes.teacher.teacher_service import TeacherService
+from botocore.exceptions import ClientError
+from routes.teacher.teacher_service import TeacherService, initial_ingestion, course_material_key, period_id_of_key
 from openai import OpenAI
-import boto3
 import shutil
 import tempfile, os
-from assistants import create_class
-from s3 import upload_file_to_s3
+from s3 import upload_files_to_s3, presigned_download_url, get_object
+from routes.pagination import get_page_args
+from routes.job.job_service import job_service
 
 teacher_bp = Blueprint("teacher", __name__)
 teacher_service = TeacherService()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# get-file default: "redirect" to a presigned S3 URL, or "stream" through this worker
+FILE_SERVING_MODE = os.getenv("FILE_SERVING_MODE", "redirect")
+FILE_CHUNK_SIZE = 64 * 1024
+
 
 @teacher_bp.route("/create-period", methods=["POST"])
 @jwt_required()
@@ -25,80 +30,54 @@ def create_period():
 
         teacher_id = get_jwt_identity()
 
+        # The provisioning job runs on this worker's job pool (job_service) and reads
+        # these local temp files, so they are lost if the process dies before they
+        # reach S3; retry_provisioning re-ingests from S3 only what was uploaded,
+        # and the rest has to be added again through add-files-to-period.
         temp_dir = tempfile.mkdtemp()
-        file_paths = []
-
-        # Save files to temp directory first
-        for file in files:
-            file_path = os.path.join(temp_dir, file.filename)
-            file.save(file_path)
-            file_paths.append(file_path)
-
-        print("Received files:", file_paths)
-
-        vector_store = client.vector_stores.create(name=course)
-        file_streams = [open(path, "rb") for path in file_paths]
-        client.vector_stores.file_batches.upload_and_poll(
-            vector_store_id=vector_store.id,
-            files=file_streams
-        )
-        print("Uploaded files to vector store:", vector_store.id)
-
-        # Check if OpenAI API key is available
-        if not os.getenv("OPENAI_API_KEY"):
-            print("WARNING: OPENAI_API_KEY not set. Skipping assistant creation.")
-            update_assistant_id = "placeholder_update_assistant_id"
-            ltg_assistant_id = "placeholder_ltg_assistant_id"
-        else:
-            class_instance = create_class(course)
-            class_instance.vector_store = vector_store  
-            
-            class_instance.create_update_assistant()
-            class_instance.create_ltg_assistant()
-            
-            update_assistant_id = class_instance.update_assistant.id
-            ltg_assistant_id = class_instance.ltg_assistant.id
-
-            #printing this for test only
-            print("Created update assistant:", update_assistant_id)
-            print("Created LTG assistant:", ltg_assistant_id)
-
-        # Create the period first (this generates the actual period_id)
-        period = teacher_service.create_period(
-            course=course,
-            teacher_id=teacher_id,
-            vector_store_id=vector_store.id,
-            file_urls=[]  # We'll update this after S3 uploads
-        )
-        
-        # Now upload files to S3 using the actual period_id
-        period_id = period['period_id']
-        s3_urls = []
-        
-        for file_path in file_paths:
-            s3_url = upload_file_to_s3(file_path, folder=f"periods/{period_id}/course materials")
-            if s3_url is None:
-                print(f"WARNING: S3 upload failed for {os.path.basename(file_path)}. Check AWS credentials.")
-                s3_url = f"local/{os.path.basename(file_path)}"  # Fallback for testing
-            print(f"DEBUG: Uploaded to S3: {s3_url}")
-            s3_urls.append(s3_url)
-
-        print(f"DEBUG: All S3 URLs: {s3_urls}")
-        print(f"DEBUG: Filtered S3 URLs: {[url for url in s3_urls if url is not None]}")
-
-        # Update the period with the S3 URLs
-        teacher_service.update_period_files(period_id, [url for url in s3_urls if url is not None])
-        
-        teacher_service.update_period_assistants(period['period_id'], update_assistant_id, ltg_assistant_id)
-        
-        # cleanup
-        for f in file_streams:
-            f.close()
-        shutil.rmtree(temp_dir)
+        try:
+            file_paths = []
+
+            # Save files to temp directory first
+            for file in files:
+                file_path = os.path.join(temp_dir, file.filename)
+                file.save(file_path)
+                file_paths.append(file_path)
+
+            print("Received files:", file_paths)
+
+            vector_store = client.vector_stores.create(name=course)
+            file_names = [os.path.basename(path) for path in file_paths]
+
+            # Create the period first (this generates the actual period_id);
+            # files and assistants are filled in by the provisioning job
+            period = teacher_service.create_period(
+                course=course,
+                teacher_id=teacher_id,
+                vector_store_id=vector_store.id,
+                file_urls=[],
+                ingestion=initial_ingestion(file_names)
+            )
+            period_id = period['period_id']
+
+            def provision(progress):
+                # The job owns the temp files from here on
+                try:
+                    return teacher_service.provision_period(
+                        period_id, course, vector_store.id, file_paths, progress=progress
+                    )
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+
+            provisioning_job = job_service.enqueue("period_provisioning", teacher_id, provision, period_id=period_id)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
 
         return jsonify({
-            "message": "Period created successfully",
-            "period": period
+            "message": "Period created; course materials are being uploaded",
+            "period": period,
+            "provisioning_job": provisioning_job
         }), 201
 
     except ValueError as ve:
@@ -112,10 +91,18 @@ def create_period():
 def periods():
     try:
         teacher_id = get_jwt_identity()
-        periods = teacher_service.get_periods_by_teacher(teacher_id)
+        page_args = get_page_args()
+        if page_args:
+            limit, page_token = page_args
+            periods, next_page_token = teacher_service.get_periods_by_teacher_page(teacher_id, limit, page_token)
+            return jsonify({"items": periods, "next_page_token": next_page_token}), 200
 
+        periods = teacher_service.get_periods_by_teacher(teacher_id)
         return jsonify(periods), 200
 
+    except ValueError as ve:
+        # Malformed limit or page_token
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         print(f"Error in get_teacher_periods: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -124,23 +111,73 @@ def periods():
 @teacher_bp.route('/get-file/<path:key>', methods=['GET'])
 @jwt_required()
 def get_file(key):
+    """
+    Serve a period file without buffering it in the worker.
+
+    The period's teacher may read any of its files, enrolled students its
+    course materials, and a student their own submissions. The default
+    (FILE_SERVING_MODE, "redirect") answers with a short-lived presigned S3
+    URL; ?mode=stream streams the body in chunks, honouring Range and
+    If-None-Match so repeat views get a 304.
+    """
     try:
-        print(f"DEBUG: File download requested for key: {key}")
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_REGION")
-        )
-        BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
-        print(f"DEBUG: Using S3 bucket: {BUCKET_NAME}")
+        period_id = period_id_of_key(key)
+        period = teacher_service.get_period_by_id(period_id) if period_id else None
+        if not period:
+            return jsonify({"error": "File not found"}), 404
+        if not teacher_service.can_read_period_file(period, key, get_jwt_identity()):
+            return jsonify({"error": "Unauthorized"}), 403
 
-        file_obj = s3.get_object(Bucket=BUCKET_NAME, Key=key)
-        print(f"DEBUG: Successfully retrieved file from S3")
+        filename = key.split('/')[-1]
+        mode = request.args.get("mode", FILE_SERVING_MODE)
+        if mode == "redirect":
+            return redirect(presigned_download_url(key, filename=filename), code=302)
+        if mode != "stream":
+            return jsonify({"error": "mode must be 'stream' or 'redirect'"}), 400
+
+        try:
+            file_obj = get_object(
+                key,
+                byte_range=request.headers.get("Range"),
+                if_none_match=request.headers.get("If-None-Match")
+            )
+        except ClientError as e:
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            code = e.response.get("Error", {}).get("Code")
+            if status == 304 or code in ("304", "NotModified"):
+                etag = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("etag")
+                return Response(status=304, headers={"ETag": etag or request.headers.get("If-None-Match")})
+            if code == "InvalidRange" or status == 416:
+                return Response(status=416)
+            if code in ("NoSuchKey", "404") or status == 404:
+                return jsonify({"error": "File not found"}), 404
+            raise
+
+        body = file_obj["Body"]
+
+        def generate():
+            try:
+                for chunk in body.iter_chunks(chunk_size=FILE_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                body.close()
+
+        headers = {
+            "Content-Disposition": f'inline; filename="{filename}"',
+            "Content-Length": str(file_obj["ContentLength"]),
+            "Accept-Ranges": "bytes",
+            "ETag": file_obj.get("ETag"),
+            # Cached by the browser, but revalidated with If-None-Match on every view
+            "Cache-Control": "private, no-cache"
+        }
+        if file_obj.get("ContentRange"):
+            headers["Content-Range"] = file_obj["ContentRange"]
         return Response(
-            file_obj['Body'].read(),
-            content_type=file_obj['ContentType'],
-            headers={"Content-Disposition": f"inline; filename={key.split('/')[-1]}"}
+            generate(),
+            status=206 if file_obj.get("ContentRange") else 200,
+            content_type=file_obj.get("ContentType", "application/octet-stream"),
+            headers={name: value for name, value in headers.items() if value},
+            direct_passthrough=True
         )
     except Exception as e:
         print(f"DEBUG: Error retrieving file: {e}")
@@ -170,36 +207,102 @@ def add_files_to_period():
 
         course = period.get('course', 'unknown')
         temp_dir = tempfile.mkdtemp()
-        file_paths = []
-        s3_urls = []
+        try:
+            file_paths = []
+
+            for file in files:
+                file_path = os.path.join(temp_dir, file.filename)
+                file.save(file_path)
+                file_paths.append(file_path)
+
+            s3_upload = upload_files_to_s3(file_paths, folder=course_material_key(period_id))
+            s3_urls = []
+            for result in s3_upload["results"]:
+                s3_url = result["key"]
+                if s3_url is None:
+                    print(f"WARNING: S3 upload failed for {result['filename']}. Check AWS credentials.")
+                    s3_url = f"local/{result['filename']}"  # Fallback for testing
+                s3_urls.append(s3_url)
+
+            print(f"DEBUG: All S3 URLs: {s3_urls}")
+
+            existing_file_urls = list(period.get('file_urls', []))
+            new_file_urls = [url for url in s3_urls if url is not None]
+            updated_file_urls = existing_file_urls + new_file_urls
+
+            teacher_service.update_period_files(period_id, updated_file_urls)
+
+            def ingest(progress):
+                # The job owns the temp files from here on
+                try:
+                    return teacher_service.add_course_materials(period_id, file_paths, progress=progress)
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+
+            calendar_job = job_service.enqueue("course_calendar", teacher_id, ingest, period_id=period_id)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        return jsonify({
+            "message": f"Successfully added {len(new_file_urls)} files to period",
+            "added_files": new_file_urls,
+            "upload": s3_upload["metrics"],
+            "calendar_job": calendar_job
+        }), 200
+    except Exception as e:
+        print(f"Error in add_files_to_period: {e}")
+        return jsonify({"error": "Failed to add files to period"}), 500
 
-        for file in files:
-            file_path = os.path.join(temp_dir, file.filename)
-            file.save(file_path)
-            file_paths.append(file_path)
 
-            s3_url = upload_file_to_s3(file_path, folder=f"periods/{period_id}/course materials")
-            if s3_url is None:
-                print(f"WARNING: S3 upload failed for {file.filename}. Check AWS credentials.")
-                s3_url = f"local/{file.filename}"  # Fallback for testing
-            print(f"DEBUG: Uploaded to S3: {s3_url}")
-            s3_urls.append(s3_url)
+@teacher_bp.route("/period-status/<period_id>", methods=["GET"])
+@jwt_required()
+def period_status(period_id):
+    """Per-file ingestion status of a period while it is being provisioned."""
+    try:
+        status = teacher_service.get_period_status(period_id)
+        if status.pop("teacher_id") != get_jwt_identity():
+            return jsonify({"error": "Unauthorized"}), 403
+        return jsonify(status), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 404
+    except Exception as e:
+        print(f"Error getting status of period {period_id}: {e}")
+        return jsonify({"error": "Failed to get period status"}), 500
 
-        print(f"DEBUG: All S3 URLs: {s3_urls}")
-        print(f"DEBUG: Filtered S3 URLs: {[url for url in s3_urls if url is not None]}")
 
-        existing_file_urls = period.get('file_urls', [])
-        new_file_urls = [url for url in s3_urls if url is not None]
-        updated_file_urls = existing_file_urls + new_file_urls
+@teacher_bp.route("/period-status/<period_id>/retry", methods=["POST"])
+@jwt_required()
+def retry_provisioning(period_id):
+    """Re-run a failed or partial provisioning; only what failed is redone."""
+    try:
+        teacher_id = get_jwt_identity()
+        period = teacher_service.get_period_by_id(period_id)
+        if not period:
+            return jsonify({"error": "Period not found"}), 404
+        if period.get('teacher_id') != teacher_id:
+            return jsonify({"error": "Unauthorized"}), 403
 
-        teacher_service.update_period_files(period_id, updated_file_urls)
+        provisioning_job = job_service.enqueue(
+            "period_provisioning", teacher_id,
+            lambda progress: teacher_service.retry_provisioning(period_id, progress=progress),
+            period_id=period_id
+        )
+        return jsonify({"provisioning_job": provisioning_job}), 202
+    except Exception as e:
+        print(f"Error retrying provisioning of period {period_id}: {e}")
+        return jsonify({"error": "Failed to retry provisioning"}), 500
 
-        shutil.rmtree(temp_dir)
 
-        return jsonify({
-            "message": f"Successfully added {len(new_file_urls)} files to period",
-            "added_files": new_file_urls
-        }), 200
+@teacher_bp.route("/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def get_job(job_id):
+    """Status and progress of a period provisioning or course calendar job."""
+    try:
+        job = job_service.get_job(job_id, get_jwt_identity())
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job), 200
     except Exception as e:
-        print(f"Error in add_files_to_period: {e}")
-        return jsonify({"error": "Failed to add files to period"}), 500
\ No newline at end of file
+        print(f"Error getting job {job_id}: {e}")
+        return jsonify({"error": "Failed to get job"}), 500
@@ -1,14 +1,116 @@
 from data_access.period_dao import PeriodDAO
+from data_access.enrollment_dao import EnrollmentDAO
 from models.period import Period
 import os
 import assistants
 from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from EQ_agents.agent import CourseCalendarAgent
+from s3 import upload_files_to_s3, download_file_from_s3
+import copy
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
 import uuid
 import re
 
+# Uploads (S3 and vector store) and assistant creations run concurrently per period
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "8"))
+# Per-file status changes are written to the period at most this often
+INGESTION_FLUSH_SECONDS = float(os.getenv("INGESTION_FLUSH_SECONDS", "2"))
+PLACEHOLDER_ASSISTANT_IDS = ("placeholder_update_assistant_id", "placeholder_ltg_assistant_id")
+
+
+def initial_ingestion(file_names):
+    """Ingestion status of a period whose files have been received but not uploaded yet."""
+    return {
+        "status": "processing",
+        "files": {name: {"s3": "pending", "vector_store": "pending"} for name in file_names},
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+def course_material_key(period_id, file_name=None):
+    """S3 key of a course file (or, without a name, the folder holding them)."""
+    folder = f"periods/{period_id}/course materials"
+    return f"{folder}/{file_name}" if file_name else folder
+
+
+def period_id_of_key(key):
+    """Course materials and submissions are stored under periods/<period_id>/..."""
+    parts = key.split("/")
+    if len(parts) < 3 or parts[0] != "periods" or ".." in parts:
+        return None
+    return parts[1]
+
+
+def course_material_source(period_id, path):
+    """Identify a local course file by its S3 key and the sha256 of its content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return {"key": course_material_key(period_id, os.path.basename(path)), "sha256": digest.hexdigest()}
+
+
+class IngestionStatus:
+    """
+    A period's `ingestion` field while it is provisioned.
+
+    Upload threads report per-file changes with update(); they are written
+    to the period at most every INGESTION_FLUSH_SECONDS, by whichever thread
+    is due, instead of one whole-map write per change. Call flush() at the
+    end to write the final state.
+    """
+
+    def __init__(self, period_dao, period_id, ingestion, flush_interval=None):
+        self.period_dao = period_dao
+        self.period_id = period_id
+        self.ingestion = ingestion
+        self.flush_interval = INGESTION_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self._lock = threading.Lock()  # guards ingestion
+        self._flush_lock = threading.Lock()  # one write at a time, in order
+        self._dirty = True
+        self._last_flush = 0.0
+
+    def update(self, name=None, **fields):
+        """Set fields of one file (or of the whole ingestion); a field set to None is removed."""
+        with self._lock:
+            target = self.ingestion["files"][name] if name is not None else self.ingestion
+            for field, value in fields.items():
+                if value is None:
+                    target.pop(field, None)
+                else:
+                    target[field] = value
+            self.ingestion["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            # Don't make upload threads queue behind a write already in progress
+            self.flush(block=False)
+
+    def flush(self, block=True):
+        if not self._flush_lock.acquire(blocking=block):
+            return
+        try:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = copy.deepcopy(self.ingestion)
+                self._dirty = False
+                self._last_flush = time.monotonic()
+            self.period_dao.update_period(self.period_id, {"ingestion": snapshot})
+        finally:
+            self._flush_lock.release()
+
+
 class TeacherService:
     def __init__(self):
         self.period_dao = PeriodDAO()
+        self.enrollment_dao = EnrollmentDAO()
+        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     def generate_period_id(self, course_name: str) -> str:
         clean_course = re.sub(r'[^a-zA-Z0-9]', '', course_name).upper()
@@ -21,7 +123,7 @@ class TeacherService:
         period_id = f"{clean_course}-{random_part1}-{random_part2}"
         return period_id
 
-    def create_period(self, course, teacher_id, vector_store_id, file_urls):
+    def create_period(self, course, teacher_id, vector_store_id, file_urls, ingestion=None):
         period_id = self.generate_period_id(course)
         
         existing = self.period_dao.get_period_by_id(period_id)
@@ -48,7 +150,9 @@ class TeacherService:
             vector_store_id=vector_store_id,
             ltg_assistant_id=ltg_id,
             teacher_id=teacher_id,
-            file_urls=file_urls
+            file_urls=file_urls,
+            ingestion=ingestion,
+            created_at=datetime.now(timezone.utc).isoformat()
         )
         print(f"Created Period object with file_urls: {new_period.file_urls}")
 
@@ -59,13 +163,19 @@ class TeacherService:
 
     def get_periods_by_teacher(self, teacher_id):
         periods = self.period_dao.get_periods_by_teacher_id(teacher_id)
-        return [
-            {
-                "period_id": p.period_id,
-                "course": p.course
-            }
-            for p in periods
-        ]
+        return [self._dashboard_period(p) for p in periods]
+
+    def get_periods_by_teacher_page(self, teacher_id, limit, page_token=None):
+        periods, next_page_token = self.period_dao.get_periods_by_teacher_id_page(teacher_id, limit, page_token)
+        return [self._dashboard_period(p) for p in periods], next_page_token
+
+    @staticmethod
+    def _dashboard_period(period):
+        return {
+            "period_id": period["period_id"],
+            "course": period.get("course"),
+            "created_at": period.get("created_at")
+        }
     
     def get_period_by_id(self, period_id):
         """Get a period by its ID"""
@@ -77,6 +187,19 @@ class TeacherService:
         self.period_dao.update_period(period_id, updates)
         print(f"DEBUG: Updated period {period_id} with {len(file_urls)} files")
     
+    def can_read_period_file(self, period, key, user_id):
+        """
+        Whether `user_id` may download `key`, a file of `period`: its teacher
+        may read every file, enrolled students the course materials, and a
+        student their own files under periods/<period_id>/students/<student_id>/.
+        """
+        if period.get("teacher_id") == user_id:
+            return True
+        parts = key.split("/")
+        if key.startswith(course_material_key(period["period_id"]) + "/"):
+            return self.enrollment_dao.get_enrollment_for_student(period["period_id"], user_id) is not None
+        return len(parts) > 4 and parts[2] == "students" and parts[3] == user_id
+
     def get_vector_store_id_for_period(self, period_id):
         period = self.period_dao.get_period_by_id(period_id)
         if not period:
@@ -88,4 +211,226 @@ class TeacherService:
             "update_assistant_id": update_assistant_id,
             "ltg_assistant_id": ltg_assistant_id
         }
-        self.period_dao.update_period(period_id, updates)
\ No newline at end of file
+        self.period_dao.update_period(period_id, updates)
+
+    def build_course_calendar(self, period_id, sources, incremental=False, progress=None):
+        """
+        Build the period's week -> topics/skills calendar from its course
+        materials and store it on the period, where every student's schedule
+        prompt reads it instead of searching the files again.
+
+        `sources` are the files in the vector store, as {"key", "sha256"}
+        dicts (see course_material_source); the calendar records which
+        versions it was built from. With incremental=True the stored
+        calendar is revised using only files it has not seen yet, including
+        files re-uploaded under the same key with different content; if
+        there are none, nothing is rebuilt.
+        """
+        progress = progress or (lambda message: None)
+        period = self.period_dao.get_period_by_id(period_id)
+        if not period:
+            raise ValueError("Period not found")
+
+        existing = period.get("course_calendar") if incremental else None
+        # key -> content hash; calendars built before hashes were recorded list bare file names
+        seen = {}
+        for source in (existing or {}).get("source_files", []):
+            if isinstance(source, dict):
+                seen[source["key"]] = source.get("sha256")
+        sources = list({source["key"]: source for source in sources}.values())
+        new_sources = [source for source in sources
+                       if source["key"] not in seen or seen[source["key"]] != source.get("sha256")]
+        if existing and not new_sources:
+            progress("Course calendar is already up to date")
+            return {"message": "Course calendar is already up to date", "weeks": len(existing.get("weeks", []))}
+
+        new_files = [os.path.basename(source["key"]) for source in new_sources]
+        progress(f"Updating course calendar with {len(new_files)} new files" if existing else "Building course calendar")
+        calendar = CourseCalendarAgent(period, existing_calendar=existing, new_files=new_files).run()
+
+        # A full build only covers the files passed in, i.e. those that reached the vector store
+        seen.update({source["key"]: source.get("sha256") for source in new_sources})
+        weeks = sorted(calendar.list_of_weeks, key=lambda week: week.Week)
+        self.period_dao.update_period(period_id, {
+            "course_calendar": {
+                "weeks": [{"week": week.Week, "topics": week.Topics, "skills": week.Skills} for week in weeks],
+                "source_files": [{"key": key, "sha256": sha256} for key, sha256 in seen.items()],
+                "built_at": datetime.now(timezone.utc).isoformat()
+            }
+        })
+        print(f"DEBUG: Saved course calendar with {len(weeks)} weeks for period {period_id}")
+        return {"message": "Course calendar saved", "weeks": len(weeks)}
+
+    def _upload_to_vector_store(self, vector_store_id, path):
+        """Add one file to the vector store; returns None on success, else the error message."""
+        try:
+            with open(path, "rb") as f:
+                vector_file = self.openai_client.vector_stores.files.upload_and_poll(
+                    vector_store_id=vector_store_id, file=f
+                )
+        except Exception as e:
+            print(f"WARNING: Vector store upload failed for {os.path.basename(path)}: {e}")
+            return str(e)
+        if vector_file.status != "completed":
+            return getattr(vector_file.last_error, "message", None) or vector_file.status
+        return None
+
+    def add_course_materials(self, period_id, file_paths, progress=None):
+        """Add new files to the period's vector store, then update its course calendar with them."""
+        progress = progress or (lambda message: None)
+        vector_store_id = self.get_vector_store_id_for_period(period_id)
+
+        progress(f"Adding {len(file_paths)} files to the course vector store")
+        with ThreadPoolExecutor(max_workers=INGESTION_WORKERS) as pool:
+            errors = list(pool.map(lambda path: self._upload_to_vector_store(vector_store_id, path), file_paths))
+        ingested = [path for path, error in zip(file_paths, errors) if error is None]
+        if len(ingested) < len(file_paths):
+            progress(f"{len(file_paths) - len(ingested)} files could not be added to the vector store")
+
+        return self.build_course_calendar(
+            period_id, [course_material_source(period_id, path) for path in ingested],
+            incremental=True, progress=progress
+        )
+
+    def provision_period(self, period_id, course, vector_store_id, file_paths, progress=None):
+        """
+        Upload a period's files and create its assistants, off the request thread.
+
+        Every file goes to S3 and to the vector store concurrently, and the
+        update/ltg assistants are created alongside them. Each file's status
+        is kept in the period's `ingestion` field, so the teacher can follow
+        it through GET /teacher/period-status/<period_id>. The course
+        calendar is built from the files that made it into the vector store.
+
+        Provisioning is idempotent: files already uploaded or ingested and
+        assistants already created are skipped, so running it again (see
+        retry_provisioning) only redoes what failed. What did succeed is
+        recorded on the period even when assistant creation fails.
+        """
+        progress = progress or (lambda message: None)
+        period = self.period_dao.get_period_by_id(period_id, use_cache=False)
+        if not period:
+            raise ValueError("Period not found")
+
+        ingestion = period.get("ingestion") or initial_ingestion([])
+        for path in file_paths:
+            ingestion["files"].setdefault(os.path.basename(path), {"s3": "pending", "vector_store": "pending"})
+        ingestion["status"] = "processing"
+        ingestion.pop("error", None)
+        status = IngestionStatus(self.period_dao, period_id, ingestion)
+        files = ingestion["files"]
+
+        s3_paths = [path for path in file_paths if files[os.path.basename(path)]["s3"] != "uploaded"]
+        vector_paths = [path for path in file_paths
+                        if files[os.path.basename(path)]["vector_store"] != "completed"]
+        missing_assistants = [kind for kind in ("update", "ltg")
+                              if period.get(f"{kind}_assistant_id") in PLACEHOLDER_ASSISTANT_IDS]
+
+        def on_s3_result(result):
+            if result["key"] is None:
+                status.update(result["filename"], s3="failed", error=result["error"])
+            else:
+                status.update(result["filename"], s3="uploaded", key=result["key"], error=None)
+
+        def upload_to_vector_store(path):
+            name = os.path.basename(path)
+            error = self._upload_to_vector_store(vector_store_id, path)
+            if error is not None:
+                status.update(name, vector_store="failed", error=error)
+            else:
+                # The content hash tells the course calendar which version it has seen
+                status.update(name, vector_store="completed", error=None,
+                              sha256=course_material_source(period_id, path)["sha256"])
+
+        progress(f"Uploading {len(s3_paths)} files to S3 and {len(vector_paths)} to the vector store")
+        class_instance, assistant_futures = None, {}
+        with ThreadPoolExecutor(max_workers=INGESTION_WORKERS) as pool:
+            if missing_assistants and os.getenv("OPENAI_API_KEY"):
+                class_instance = assistants.create_class(course, vector_store_id=vector_store_id)
+                assistant_futures = {kind: pool.submit(getattr(class_instance, f"create_{kind}_assistant"))
+                                     for kind in missing_assistants}
+            elif missing_assistants:
+                print("WARNING: OPENAI_API_KEY not set. Skipping assistant creation.")
+            s3_future = pool.submit(upload_files_to_s3, s3_paths,
+                                    folder=course_material_key(period_id), on_result=on_s3_result)
+            for path in vector_paths:
+                pool.submit(upload_to_vector_store, path)
+            s3_upload = s3_future.result()
+
+        # Record what was uploaded before looking at the assistants, so a retry keeps it
+        file_urls = list(period.get("file_urls", []))
+        file_urls += [result["key"] for result in s3_upload["results"]
+                      if result["key"] and result["key"] not in file_urls]
+        self.update_period_files(period_id, file_urls)
+
+        assistant_ids = {kind: period.get(f"{kind}_assistant_id") for kind in ("update", "ltg")}
+        errors = []
+        for kind, future in assistant_futures.items():
+            try:
+                future.result()
+                assistant_ids[kind] = getattr(class_instance, f"{kind}_assistant").id
+            except Exception as e:
+                errors.append(e)
+        if assistant_futures:
+            self.update_period_assistants(period_id, assistant_ids["update"], assistant_ids["ltg"])
+        if errors:
+            status.update(status="failed", error=f"Assistant creation failed: {errors[0]}")
+            status.flush()
+            raise errors[0]
+
+        failed = [name for name, file_status in files.items()
+                  if "failed" in (file_status["s3"], file_status["vector_store"])]
+        status.update(status="partial" if failed else "ready")
+        status.flush()
+        progress(f"Uploaded {len(files) - len(failed)}/{len(files)} files")
+
+        result = {"files": len(files), "failed_files": failed, "status": ingestion["status"],
+                  "s3": s3_upload["metrics"]}
+        ingested = [{"key": course_material_key(period_id, name), "sha256": file_status.get("sha256")}
+                    for name, file_status in files.items() if file_status["vector_store"] == "completed"]
+        if ingested:
+            result["course_calendar"] = self.build_course_calendar(
+                period_id, ingested, incremental=True, progress=progress
+            )
+        return result
+
+    def retry_provisioning(self, period_id, progress=None):
+        """
+        Finish a period whose provisioning failed part-way: create the missing
+        assistants and re-ingest, from S3, the files that did not reach the
+        vector store. Files that never reached S3 have to be added again
+        through add-files-to-period.
+        """
+        period = self.period_dao.get_period_by_id(period_id, use_cache=False)
+        if not period:
+            raise ValueError("Period not found")
+
+        files = (period.get("ingestion") or {}).get("files", {})
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_paths = []
+            for name, file_status in files.items():
+                if file_status.get("key") and file_status["vector_store"] != "completed":
+                    path = os.path.join(temp_dir, name)
+                    if download_file_from_s3(file_status["key"], path):
+                        file_paths.append(path)
+            return self.provision_period(
+                period_id, period["course"], period["vector_store_id"], file_paths, progress=progress
+            )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def get_period_status(self, period_id):
+        """Provisioning status of a period: per-file ingestion, assistants and course calendar."""
+        # The provisioning job may be running on another worker, so skip the period cache
+        period = self.period_dao.get_period_by_id(period_id, use_cache=False)
+        if not period:
+            raise ValueError("Period not found")
+        return {
+            "period_id": period_id,
+            "teacher_id": period.get("teacher_id"),
+            "ingestion": period.get("ingestion"),
+            "assistants_ready": (period.get("update_assistant_id") not in PLACEHOLDER_ASSISTANT_IDS
+                                 and period.get("ltg_assistant_id") not in PLACEHOLDER_ASSISTANT_IDS),
+            "course_calendar_ready": bool(period.get("course_calendar"))
+        }
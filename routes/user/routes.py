@@ -1,39 +1,22 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, g
 from .user_service import UserService
 from flask_jwt_extended import jwt_required, get_jwt_identity, decode_token
 from data_access.student_dao import StudentDAO
 from data_access.teacher_dao import TeacherDAO
-from data_access.session_dao import SessionDAO
+from routes.auth_context import get_request_sessions
 
 
 user_bp = Blueprint('user', __name__)
 user_service = UserService()
 student_dao = StudentDAO()
 teacher_dao = TeacherDAO()
-session_dao = SessionDAO()
 
 @user_bp.route('/profile', methods=['GET'])
 def get_profile_cookie():
     print("get_profile_cookie called")
-    print(f"Request headers: {request.headers}")
 
-    # Prefer Authorization: Bearer <token>
-    token = None
-    auth_header = request.headers.get('Authorization', '')
-    if auth_header and auth_header.lower().startswith('bearer '):
-        token = auth_header.split(' ', 1)[1].strip()
+    token = g.auth_token
 
-
-    # Fallback: parse the last auth_token from Cookie header if multiple exist
-    if not token:
-        raw_cookie = request.headers.get('Cookie', '')
-        if 'auth_token=' in raw_cookie:
-            parts = [p.strip() for p in raw_cookie.split(';')]
-            auth_tokens = [p.split('=', 1)[1] for p in parts if p.startswith('auth_token=')]
-            if auth_tokens:
-                token = auth_tokens[-1]
-
-    print(f"Resolved auth token: {token}")
     if not token:
         return jsonify({'message': 'Missing token'}), 401
     try:
@@ -47,7 +30,7 @@ def get_profile_cookie():
 
         # Fallback to session store lookup
         if not username:
-            session_data = session_dao.get_sessions_by_auth_token(token)
+            session_data = get_request_sessions()
             print(f"Session data retrieved: {session_data}")
             username = session_data[0]['user_id'] if session_data else None
             print(f"Username from session: {username}")
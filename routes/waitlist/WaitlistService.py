@@ -1,8 +1,10 @@
 import os, base64, re
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from data_access.base_dao import ConditionalWriteError, TRANSACT_WRITE_LIMIT
 from data_access.waitlist_dao import WaitlistDAO
 
 EMAIL_REGEX = re.compile(r"^\S+@\S+\.\S+$")
+MAX_BULK_CODES = int(os.getenv("WAITLIST_MAX_BULK_CODES", "1000"))
 
 def _gen_code(n: int = 8) -> str:
     import os, base64
@@ -38,3 +40,36 @@ class WaitlistService:
                 return {"waitlistID": code, "email": email, "name": name}
 
         raise RuntimeError("Could not allocate a unique waitlist code, please retry.")
+
+    def generate_codes(self, count: int) -> List[str]:
+        """
+        Allocate `count` unused codes not tied to any email.
+        Codes are written in conditional transactions of up to 100; see
+        _allocate_codes.
+        """
+        if isinstance(count, bool) or not isinstance(count, int) or count < 1 or count > MAX_BULK_CODES:
+            raise ValueError(f"count must be between 1 and {MAX_BULK_CODES}")
+
+        codes = []
+        for start in range(0, count, TRANSACT_WRITE_LIMIT):
+            codes += self._allocate_codes(min(TRANSACT_WRITE_LIMIT, count - start))
+        return sorted(codes)
+
+    def _allocate_codes(self, count: int) -> List[str]:
+        """
+        Allocate up to 100 codes. Collisions with existing codes are found with
+        one BatchGetItem and regenerated; a code taken between that check and
+        the conditional write makes the transaction fail, and it is replaced too.
+        """
+        codes = set()
+        for _ in range(5):
+            candidates = {_gen_code(8) for _ in range(count - len(codes))} - codes
+            codes |= candidates - self.dao.get_existing_codes(list(candidates))
+            if len(codes) == count:
+                try:
+                    self.dao.put_codes(sorted(codes))
+                    return sorted(codes)
+                except ConditionalWriteError:
+                    codes -= self.dao.get_existing_codes(list(codes))
+
+        raise RuntimeError("Could not allocate unique waitlist codes, please retry.")
@@ -1,7 +1,7 @@
 # routes/waitlist/routes.py
 from flask import Blueprint, jsonify, request
 from .WaitlistService import WaitlistService  
-import traceback, sys
+import traceback, sys, os, hmac
 
 waitlist_bp = Blueprint('waitlist', __name__)
 svc = WaitlistService()
@@ -25,3 +25,19 @@ def join_waitlist():
     except Exception:
         traceback.print_exc(file=sys.stderr)
         return jsonify({"message": "Failed to join waitlist"}), 500
+
+@waitlist_bp.route('/codes', methods=['POST'])
+def generate_codes():
+    # Bulk allocation is an operator action; disabled unless WAITLIST_ADMIN_KEY is set
+    admin_key = os.getenv('WAITLIST_ADMIN_KEY')
+    if not admin_key or not hmac.compare_digest(request.headers.get('X-Admin-Key', ''), admin_key):
+        return jsonify({"message": "Forbidden"}), 403
+    try:
+        data = request.get_json(silent=True) or {}
+        codes = svc.generate_codes(data.get('count'))
+        return jsonify({"codes": codes, "count": len(codes)}), 201
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        return jsonify({"message": "Failed to generate waitlist codes"}), 500
@@ -1,16 +1,44 @@
 import boto3
 import os
+import time
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+MB = 1024 * 1024
+
+# Files uploaded at once by upload_files_to_s3, across all requests in this process
+S3_UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", "8"))
+# Files above the threshold are sent as multipart uploads, several parts at a time
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "16")) * MB
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "16")) * MB
+S3_MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+
+transfer_config = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+    max_concurrency=S3_MULTIPART_CONCURRENCY,
+    use_threads=True
+)
+
+# One client shared by every upload (boto3 clients are thread-safe); its
+# connection pool is sized so concurrent multipart uploads don't wait on it
 s3 = boto3.client(
     "s3",
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    region_name=os.getenv("AWS_REGION")
+    region_name=os.getenv("AWS_REGION"),
+    config=Config(max_pool_connections=max(10, S3_UPLOAD_WORKERS * S3_MULTIPART_CONCURRENCY))
 )
 
 BUCKET_NAME = os.getenv("S3_BUCKET_NAME")  
 
+# How long a presigned download link stays valid
+S3_PRESIGNED_URL_TTL = int(os.getenv("S3_PRESIGNED_URL_TTL", "300"))
+
+_upload_pool = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+
 def upload_to_s3(file_obj, filename=None, folder=None):
     """
     Uploads a file-like object to S3 and returns its key (not URL).
@@ -22,7 +50,8 @@ def upload_to_s3(file_obj, filename=None, folder=None):
             Fileobj=file_obj,
             Bucket=BUCKET_NAME,
             Key=key,
-            ExtraArgs={"ACL": "private"}  
+            ExtraArgs={"ACL": "private"},
+            Config=transfer_config
         )
 
         # returning only the key and serving it through our own endpoint in teacher/routes.py
@@ -43,7 +72,8 @@ def upload_file_to_s3(file_path, filename=None, folder=None):
             Filename=file_path,
             Bucket=BUCKET_NAME,
             Key=key,
-            ExtraArgs={"ACL": "private"}  
+            ExtraArgs={"ACL": "private"},
+            Config=transfer_config
         )
 
         # returning only the key and serving it through our own endpoint in teacher/routes.py
@@ -51,4 +81,106 @@ def upload_file_to_s3(file_path, filename=None, folder=None):
 
     except (NoCredentialsError, ClientError) as e:
         print("S3 upload failed:", e)
-        return None
\ No newline at end of file
+        return None
+
+
+def download_file_from_s3(key, file_path):
+    """
+    Downloads an object to a local path. Returns True on success, False if
+    the download failed.
+    """
+    try:
+        s3.download_file(Bucket=BUCKET_NAME, Key=key, Filename=file_path, Config=transfer_config)
+        return True
+    except Exception as e:
+        print(f"S3 download failed for {key}:", e)
+        return False
+
+
+def _upload_one(file_path, folder):
+    name = os.path.basename(file_path)
+    result = {"file_path": file_path, "filename": name, "key": None, "bytes": 0, "seconds": 0.0, "error": None}
+    started = time.perf_counter()
+    try:
+        result["bytes"] = os.path.getsize(file_path)
+        key = f"{folder}/{name}" if folder else name
+        s3.upload_file(
+            Filename=file_path,
+            Bucket=BUCKET_NAME,
+            Key=key,
+            ExtraArgs={"ACL": "private"},
+            Config=transfer_config
+        )
+        result["key"] = key
+    except Exception as e:
+        # One bad file must not fail the rest of the batch
+        print(f"S3 upload failed for {name}:", e)
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def upload_files_to_s3(file_paths, folder=None, on_result=None):
+    """
+    Uploads many files to S3 concurrently and returns per-file results plus throughput metrics:
+
+        {"results": [{"file_path", "filename", "key", "bytes", "seconds", "error"}, ...],
+         "metrics": {"files", "uploaded", "failed", "bytes", "seconds", "mb_per_second"}}
+
+    Results are in the order of file_paths; a failed file has key None and
+    its error message. `on_result(result)` is called as each file finishes.
+    """
+    started = time.perf_counter()
+    futures = {_upload_pool.submit(_upload_one, path, folder): index for index, path in enumerate(file_paths)}
+    results = [None] * len(file_paths)
+    for future in as_completed(futures):
+        result = future.result()
+        results[futures[future]] = result
+        if on_result is not None:
+            on_result(result)
+
+    seconds = time.perf_counter() - started
+    uploaded_bytes = sum(result["bytes"] for result in results if result["key"])
+    metrics = {
+        "files": len(results),
+        "uploaded": sum(1 for result in results if result["key"]),
+        "failed": sum(1 for result in results if not result["key"]),
+        "bytes": uploaded_bytes,
+        "seconds": round(seconds, 3),
+        "mb_per_second": round(uploaded_bytes / MB / seconds, 2) if seconds > 0 else 0.0
+    }
+    print(f"S3 bulk upload: {metrics['uploaded']}/{metrics['files']} files, "
+          f"{uploaded_bytes / MB:.1f} MB in {metrics['seconds']} s ({metrics['mb_per_second']} MB/s)")
+    return {"results": results, "metrics": metrics}
+
+
+def presigned_download_url(key, expires_in=None, filename=None):
+    """
+    Returns a short-lived URL the browser can download the object from
+    directly, shown inline under `filename` (default: the key's last part).
+    """
+    filename = filename or key.split("/")[-1]
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": BUCKET_NAME,
+            "Key": key,
+            "ResponseContentDisposition": f'inline; filename="{filename}"'
+        },
+        ExpiresIn=expires_in or S3_PRESIGNED_URL_TTL
+    )
+
+
+def get_object(key, byte_range=None, if_none_match=None):
+    """
+    Starts a GET of the object and returns the boto3 response without reading
+    the body, so callers can stream it. `byte_range` is an HTTP Range header
+    value; `if_none_match` an ETag list, for which S3 answers 304 (raised as
+    a ClientError) when the object has not changed.
+    """
+    params = {"Bucket": BUCKET_NAME, "Key": key}
+    if byte_range:
+        params["Range"] = byte_range
+    if if_none_match:
+        params["IfNoneMatch"] = if_none_match
+    return s3.get_object(**params)
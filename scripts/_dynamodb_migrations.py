@@ -0,0 +1,56 @@
+"""
+Helpers shared by the migrate_*_index(es).py scripts.
+"""
+
+import time
+
+
+def wait_until_active(client, table_name, poll_seconds=10):
+    """Wait until the table and all of its indexes are ACTIVE."""
+    while True:
+        table = client.describe_table(TableName=table_name)["Table"]
+        statuses = [table["TableStatus"]] + [
+            gsi["IndexStatus"] for gsi in table.get("GlobalSecondaryIndexes", [])
+        ]
+        if all(status == "ACTIVE" for status in statuses):
+            return
+        print(f"Waiting for {table_name} to become ACTIVE: {statuses}")
+        time.sleep(poll_seconds)
+
+
+def create_gsi(client, table_name, index_name, partition_key, sort_key, attribute_types, projection=None):
+    """
+    Create a global secondary index unless it already exists, then wait until
+    it is ACTIVE. `attribute_types` maps each key attribute to its DynamoDB
+    type ("S" / "N"); `projection` defaults to ALL. Returns False if the
+    index already existed.
+    """
+    table = client.describe_table(TableName=table_name)["Table"]
+    if index_name in {gsi["IndexName"] for gsi in table.get("GlobalSecondaryIndexes", [])}:
+        print(f"Index {index_name} already exists")
+        return False
+
+    index = {
+        "IndexName": index_name,
+        "KeySchema": [
+            {"AttributeName": partition_key, "KeyType": "HASH"},
+            {"AttributeName": sort_key, "KeyType": "RANGE"},
+        ],
+        "Projection": projection or {"ProjectionType": "ALL"},
+    }
+    billing_mode = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED")
+    if billing_mode != "PAY_PER_REQUEST":
+        index["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+
+    print(f"Creating index {index_name} ({partition_key}, {sort_key})...")
+    client.update_table(
+        TableName=table_name,
+        AttributeDefinitions=[
+            {"AttributeName": name, "AttributeType": attribute_types[name]}
+            for name in (partition_key, sort_key)
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": index}],
+    )
+    wait_until_active(client, table_name)
+    print(f"Index {index_name} is ACTIVE")
+    return True
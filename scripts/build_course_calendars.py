@@ -0,0 +1,41 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from data_access.period_dao import PeriodDAO
+from routes.teacher.teacher_service import TeacherService
+
+
+def build_missing_course_calendars():
+    """
+    Build the course calendar for every period created before calendars
+    existed. Periods that already have one are left alone.
+    """
+    period_dao = PeriodDAO()
+    teacher_service = TeacherService()
+    periods = period_dao.scan_all(ProjectionExpression="period_id, file_urls, course_calendar")
+
+    built = failed = 0
+    for period in periods:
+        if period.get("course_calendar"):
+            continue
+        period_id = period["period_id"]
+        # file_urls hold S3 keys; the content of these older uploads was never hashed
+        sources = [{"key": key, "sha256": None} for key in period.get("file_urls", [])]
+        try:
+            result = teacher_service.build_course_calendar(period_id, sources)
+            print(f"{period_id}: {result['message']} ({result['weeks']} weeks)")
+            built += 1
+        except Exception as e:
+            print(f"{period_id}: failed to build course calendar: {e}")
+            failed += 1
+
+    print(f"Built {built} course calendars, {failed} failed")
+
+
+if __name__ == "__main__":
+    build_missing_course_calendars()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from data_access.config import get_dynamodb_client
+
+TABLE_NAME = "job"
+
+
+def create_job_table():
+    """
+    Create the job table used by background agent jobs, with a TTL on
+    expires_at so finished jobs are removed after a week.
+    """
+    client = get_dynamodb_client()
+    if TABLE_NAME in client.list_tables()["TableNames"]:
+        print(f"Table {TABLE_NAME} already exists")
+    else:
+        print(f"Creating table {TABLE_NAME}...")
+        client.create_table(
+            TableName=TABLE_NAME,
+            AttributeDefinitions=[{"AttributeName": "job_id", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "job_id", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        client.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+        print(f"Table {TABLE_NAME} is ACTIVE")
+
+    client.update_time_to_live(
+        TableName=TABLE_NAME,
+        TimeToLiveSpecification={"Enabled": True, "AttributeName": "expires_at"},
+    )
+    print(f"TTL enabled on {TABLE_NAME}.expires_at")
+
+
+if __name__ == "__main__":
+    create_job_table()
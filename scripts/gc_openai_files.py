@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from assistants import delete_expired_uploads, UPLOAD_MAX_AGE
+
+
+def gc_openai_files():
+    """
+    Delete the student/quest JSON files the update assistant uploaded more
+    than OPENAI_UPLOAD_MAX_AGE seconds ago. Meant to run from cron, e.g. hourly.
+    """
+    print(f"Deleting uploaded payload files older than {UPLOAD_MAX_AGE / 3600:.0f} hours...")
+    deleted = delete_expired_uploads()
+    print(f"GC completed. {deleted} files deleted.")
+
+
+if __name__ == "__main__":
+    gc_openai_files()
@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from _dynamodb_migrations import create_gsi
+from data_access.config import get_dynamodb_client
+from data_access.enrollment_dao import STUDENT_PERIOD_INDEX
+
+TABLE_NAME = "enrollment"
+
+
+def create_student_period_index():
+    """
+    Create the student_id / period_id index used to find one student's
+    enrollment in a period. Every enrollment already has both attributes,
+    so no backfill is needed.
+    """
+    create_gsi(
+        get_dynamodb_client(), TABLE_NAME, STUDENT_PERIOD_INDEX, "student_id", "period_id",
+        {"student_id": "S", "period_id": "S"},
+    )
+
+
+if __name__ == "__main__":
+    create_student_period_index()
+    print("Migration complete; set ENROLLMENT_USE_INDEXES=true to query the index.")
@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from _dynamodb_migrations import create_gsi
+from data_access.config import get_dynamodb_client
+from data_access.individual_quest_dao import (
+    IndividualQuestDAO,
+    STUDENT_PERIOD_INDEX,
+    STUDENT_INDEX,
+    QUEST_ID_INDEX,
+    STATUS_INDEX,
+    WEEK_INDEX,
+)
+
+TABLE_NAME = "individual_quest"
+
+ATTRIBUTE_TYPES = {
+    "student_period_key": "S",
+    "student_id": "S",
+    "quest_id": "S",
+    "status": "S",
+    "due_date": "S",
+    "week": "N",
+}
+
+# (index name, partition key, sort key)
+INDEXES = [
+    (STUDENT_PERIOD_INDEX, "student_period_key", "week"),
+    (STUDENT_INDEX, "student_id", "week"),
+    (QUEST_ID_INDEX, "quest_id", "week"),
+    (STATUS_INDEX, "status", "due_date"),
+    (WEEK_INDEX, "week", "due_date"),
+]
+
+
+def create_indexes():
+    """
+    Create the individual_quest global secondary indexes that do not exist yet.
+    DynamoDB only allows one index creation per UpdateTable call, so the
+    indexes are created one at a time.
+    """
+    client = get_dynamodb_client()
+    for index_name, partition_key, sort_key in INDEXES:
+        create_gsi(client, TABLE_NAME, index_name, partition_key, sort_key, ATTRIBUTE_TYPES)
+
+
+def backfill_student_period_keys():
+    """
+    Add student_period_key to individual quests written before the
+    student_period_index existed. Items without the key are invisible to
+    the index, so this must run before INDIVIDUAL_QUEST_USE_INDEXES is enabled.
+    """
+    quest_dao = IndividualQuestDAO(use_indexes=False)
+
+    print("Starting individual_quest backfill for student_period_key...")
+
+    migrated_count = 0
+    for quest in quest_dao.iter_all_quests():
+        if quest.get("student_period_key"):
+            continue
+        individual_quest_id = quest.get("individual_quest_id")
+        try:
+            quest_dao.table.update_item(
+                Key={"individual_quest_id": individual_quest_id},
+                UpdateExpression="SET student_period_key = :key",
+                ExpressionAttributeValues={
+                    ":key": f"{quest.get('student_id')}#{quest.get('period_id')}"
+                },
+            )
+            migrated_count += 1
+        except Exception as e:
+            print(f"Error migrating quest {individual_quest_id}: {e}")
+
+    print(f"Backfill completed. {migrated_count} quests migrated.")
+
+
+if __name__ == "__main__":
+    create_indexes()
+    backfill_student_period_keys()
+    print("Migration complete; set INDIVIDUAL_QUEST_USE_INDEXES=true to query the indexes.")
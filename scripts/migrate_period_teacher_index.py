@@ -0,0 +1,57 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from _dynamodb_migrations import create_gsi
+from data_access.config import get_dynamodb_client
+from data_access.period_dao import PeriodDAO, TEACHER_INDEX
+
+TABLE_NAME = "period"
+
+
+def create_teacher_index():
+    """
+    Create the teacher_id / created_at index. Only the dashboard fields are
+    projected, so listing a teacher's periods reads small index items.
+    """
+    create_gsi(
+        get_dynamodb_client(), TABLE_NAME, TEACHER_INDEX, "teacher_id", "created_at",
+        {"teacher_id": "S", "created_at": "S"},
+        projection={"ProjectionType": "INCLUDE", "NonKeyAttributes": ["course"]},
+    )
+
+
+def backfill_created_at():
+    """
+    Stamp created_at on periods written before the field existed. Items
+    without it are invisible to the index, so this must run before
+    PERIOD_USE_INDEXES is enabled.
+    """
+    period_dao = PeriodDAO(use_indexes=False)
+    migrated_at = datetime.now(timezone.utc).isoformat()
+
+    print("Starting period backfill for created_at...")
+
+    migrated_count = 0
+    for period in period_dao.paginate("scan"):
+        if period.get("created_at"):
+            continue
+        period_id = period.get("period_id")
+        try:
+            period_dao.update_period(period_id, {"created_at": migrated_at})
+            migrated_count += 1
+        except Exception as e:
+            print(f"Error migrating period {period_id}: {e}")
+
+    print(f"Backfill completed. {migrated_count} periods migrated.")
+
+
+if __name__ == "__main__":
+    create_teacher_index()
+    backfill_created_at()
+    print("Migration complete; set PERIOD_USE_INDEXES=true to query the index.")
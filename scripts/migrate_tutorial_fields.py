@@ -7,7 +7,6 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from data_access.config import DynamoDBConfig
 from data_access.student_dao import StudentDAO
 
 # current_path = os.getcwd()  # Get current working directory
@@ -18,19 +17,14 @@ def migrate_tutorial_fields():
     Migrate existing students to add completed_tutorial field.
     This script adds the new field to all existing student records.
     """
-    config = DynamoDBConfig()
-    table = config.get_table("student")
     student_dao = StudentDAO()
     
     print("Starting student table migration for completed_tutorial field...")
     
     try:
-        # Scan all students
-        response = table.scan()
-        students = response.get('Items', [])
-        
+        # Scan all students, page by page
         migrated_count = 0
-        for student in students:
+        for student in student_dao.paginate("scan"):
             student_id = student.get('student_id')
             
             # Check if completed_tutorial field already exists
@@ -0,0 +1,64 @@
+import os
+import sys
+
+# Add the current directory (eduquest-backend) to Python path so we can import modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from data_access.config import get_dynamodb_client
+from data_access.waitlist_dao import WaitlistDAO
+
+TABLE_NAME = "waitlist"
+
+
+def check_key_schema():
+    """
+    WaitlistDAO.get_by_code reads codes with GetItem, which relies on
+    waitlistID being the table's partition key.
+    """
+    client = get_dynamodb_client()
+    key_schema = client.describe_table(TableName=TABLE_NAME)["Table"]["KeySchema"]
+    hash_keys = [key["AttributeName"] for key in key_schema if key["KeyType"] == "HASH"]
+    if hash_keys != ["waitlistID"]:
+        raise SystemExit(f"{TABLE_NAME} is keyed on {hash_keys}, expected ['waitlistID']")
+    print(f"{TABLE_NAME} is keyed on waitlistID")
+
+
+def backfill_waitlist_entries():
+    """
+    Normalize entries written before codes were looked up by key: add the
+    missing `used` flag and lowercase emails so email-index lookups match.
+    """
+    waitlist_dao = WaitlistDAO()
+
+    print("Starting waitlist backfill...")
+
+    migrated_count = 0
+    for entry in waitlist_dao.paginate("scan"):
+        waitlist_id = entry.get("waitlistID")
+        updates = {}
+        if "used" not in entry:
+            updates["used"] = False
+        email = entry.get("email")
+        if email and email != email.strip().lower():
+            updates["email"] = email.strip().lower()
+        if not updates:
+            continue
+        try:
+            waitlist_dao.table.update_item(
+                Key={"waitlistID": waitlist_id},
+                UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in updates),
+                ExpressionAttributeNames={f"#{k}": k for k in updates},
+                ExpressionAttributeValues={f":{k}": v for k, v in updates.items()},
+            )
+            migrated_count += 1
+        except Exception as e:
+            print(f"Error migrating waitlist entry {waitlist_id}: {e}")
+
+    print(f"Backfill completed. {migrated_count} entries migrated.")
+
+
+if __name__ == "__main__":
+    check_key_schema()
+    backfill_waitlist_entries()
@@ -40,5 +40,8 @@ mock_boto3.client = MagicMock(return_value=MagicMock())
 sys.modules['boto3'] = mock_boto3
 sys.modules['boto3.dynamodb'] = MagicMock()
 sys.modules['boto3.dynamodb.conditions'] = MagicMock()
+sys.modules['boto3.s3'] = MagicMock()
+sys.modules['boto3.s3.transfer'] = MagicMock()
 sys.modules['botocore'] = MagicMock()
+sys.modules['botocore.config'] = MagicMock()
 sys.modules['botocore.exceptions'] = MagicMock()
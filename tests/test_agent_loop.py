@@ -0,0 +1,72 @@
+"""
+Tests for the per-process agent event loop
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import pytest
+
+
+def load_loop_module():
+    """conftest mocks the EQ_agents package; load the real module from its file."""
+    path = os.path.join(os.path.dirname(__file__), "..", "EQ_agents", "agent_loop.py")
+    spec = importlib.util.spec_from_file_location("agent_loop_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+AgentLoop = load_loop_module().AgentLoop
+
+
+@pytest.fixture
+def agent_loop():
+    loop = AgentLoop()
+    yield loop
+    loop.stop()
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.mark.unit
+def test_every_caller_shares_one_loop(agent_loop):
+    loops = [agent_loop.run(current_loop())]
+    thread = threading.Thread(target=lambda: loops.append(agent_loop.run(current_loop())))
+    thread.start()
+    thread.join()
+    assert loops[0] is loops[1]
+    assert loops[0].is_running()
+
+
+@pytest.mark.unit
+def test_timeout_cancels_the_coroutine(agent_loop):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(asyncio.TimeoutError):
+        agent_loop.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+@pytest.mark.unit
+def test_client_is_created_once_per_process(agent_loop, monkeypatch):
+    created = []
+    agent_loop.client_factory = lambda: created.append(1)
+    agent_loop.run(current_loop())
+    agent_loop.run(current_loop())
+    assert len(created) == 1
+
+    # A forked worker starts its own loop and client
+    agent_loop._pid = -1
+    agent_loop.run(current_loop())
+    assert len(created) == 2
@@ -0,0 +1,182 @@
+"""
+Tests for the shared assistant run engine and assistant cache in assistants.py
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import assistants
+
+
+def run(status, run_id="run_1"):
+    return SimpleNamespace(id=run_id, status=status, last_error=None)
+
+
+def text_message(value):
+    return SimpleNamespace(role="assistant", content=[SimpleNamespace(text=SimpleNamespace(value=value))])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    fake = MagicMock()
+    monkeypatch.setattr(assistants, "openai", fake)
+    monkeypatch.setattr(assistants.time, "sleep", lambda _: None)
+    return fake
+
+
+@pytest.mark.unit
+def test_streamed_run_forwards_deltas_and_returns_reply(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", True)
+    delta = SimpleNamespace(content=[SimpleNamespace(type="text", text=SimpleNamespace(value="Hi"))])
+    stream = MagicMock()
+    stream.__iter__.return_value = iter([
+        SimpleNamespace(event="thread.run.created", data=run("queued")),
+        SimpleNamespace(event="thread.message.delta", data=SimpleNamespace(delta=delta)),
+    ])
+    stream.get_final_run.return_value = run("completed")
+    stream.get_final_messages.return_value = [text_message("Hi there")]
+    fake_openai.beta.threads.runs.stream.return_value.__enter__.return_value = stream
+
+    chunks = []
+    assert assistants.run_assistant("th_1", "asst_1", on_text_delta=chunks.append) == "Hi there"
+    assert chunks == ["Hi"]
+    fake_openai.beta.threads.runs.retrieve.assert_not_called()
+
+
+@pytest.mark.unit
+def test_polling_backs_off_until_completed(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", False)
+    delays = []
+    monkeypatch.setattr(assistants.time, "sleep", delays.append)
+    fake_openai.beta.threads.runs.create.return_value = run("queued")
+    fake_openai.beta.threads.runs.retrieve.side_effect = [run("queued"), run("in_progress"), run("completed")]
+    fake_openai.beta.threads.messages.list.return_value = SimpleNamespace(data=[text_message("done")])
+
+    assert assistants.run_assistant("th_1", "asst_1") == "done"
+    assert delays == [assistants.POLL_INITIAL_DELAY, assistants.POLL_INITIAL_DELAY * 1.5]
+
+
+@pytest.mark.unit
+def test_failed_run_raises(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", False)
+    fake_openai.beta.threads.runs.create.return_value = run("queued")
+    fake_openai.beta.threads.runs.retrieve.return_value = run("cancelled")
+
+    with pytest.raises(assistants.RunFailedError) as exc:
+        assistants.run_assistant("th_1", "asst_1")
+    assert exc.value.status == "cancelled"
+
+
+@pytest.mark.unit
+def test_run_waiting_for_tool_output_is_cancelled(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", False)
+    fake_openai.beta.threads.runs.create.return_value = run("queued")
+    fake_openai.beta.threads.runs.retrieve.return_value = run("requires_action")
+
+    with pytest.raises(assistants.RunFailedError) as exc:
+        assistants.run_assistant("th_1", "asst_1")
+    assert exc.value.status == "requires_action"
+    fake_openai.beta.threads.runs.cancel.assert_called_once_with(thread_id="th_1", run_id="run_1")
+
+
+@pytest.mark.unit
+def test_deadline_cancels_run(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", False)
+    fake_openai.beta.threads.runs.create.return_value = run("queued")
+    fake_openai.beta.threads.runs.retrieve.return_value = run("in_progress")
+
+    with pytest.raises(assistants.RunTimeoutError):
+        assistants.run_assistant("th_1", "asst_1", timeout=0)
+    fake_openai.beta.threads.runs.cancel.assert_called_once_with(thread_id="th_1", run_id="run_1")
+
+
+@pytest.mark.unit
+def test_broken_stream_falls_back_to_polling_the_same_run(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", True)
+    stream = MagicMock()
+
+    def events():
+        yield SimpleNamespace(event="thread.run.created", data=run("queued", "run_9"))
+        raise ConnectionError("stream dropped")
+
+    stream.__iter__.side_effect = lambda: events()
+    fake_openai.beta.threads.runs.stream.return_value.__enter__.return_value = stream
+    fake_openai.beta.threads.runs.retrieve.return_value = run("completed", "run_9")
+    fake_openai.beta.threads.messages.list.return_value = SimpleNamespace(data=[text_message("late")])
+
+    assert assistants.run_assistant("th_1", "asst_1") == "late"
+    fake_openai.beta.threads.runs.create.assert_not_called()
+    assert fake_openai.beta.threads.runs.retrieve.call_args.kwargs["run_id"] == "run_9"
+
+
+@pytest.mark.unit
+def test_stream_dropped_mid_reply_sends_only_the_rest(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", True)
+    delta = SimpleNamespace(content=[SimpleNamespace(type="text", text=SimpleNamespace(value='{"response": "Hel'))])
+    stream = MagicMock()
+
+    def events():
+        yield SimpleNamespace(event="thread.run.created", data=run("queued", "run_9"))
+        yield SimpleNamespace(event="thread.message.delta", data=SimpleNamespace(delta=delta))
+        raise ConnectionError("stream dropped")
+
+    stream.__iter__.side_effect = lambda: events()
+    fake_openai.beta.threads.runs.stream.return_value.__enter__.return_value = stream
+    fake_openai.beta.threads.runs.retrieve.return_value = run("completed", "run_9")
+    fake_openai.beta.threads.messages.list.return_value = SimpleNamespace(
+        data=[text_message('{"response": "Hello"}')])
+
+    chunks = []
+    assistants.run_assistant("th_1", "asst_1", on_text_delta=chunks.append)
+    assert chunks == ['{"response": "Hel', 'lo"}']
+
+
+@pytest.mark.unit
+def test_wrappers_run_by_id_without_retrieving(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "RUN_STREAMING", False)
+    fake_openai.beta.threads.runs.create.return_value = run("queued")
+    fake_openai.beta.threads.runs.retrieve.return_value = run("completed")
+    fake_openai.beta.threads.messages.list.return_value = SimpleNamespace(
+        data=[text_message('{"message": "Pick one", "chosen_goal": "null"}')])
+
+    conv = assistants.ltg({"first_name": "A"}, assistant_id="asst_ltg")
+    conv.thread_id = "th_1"
+    assert conv.cont_conv("hi") == ("Pick one", False)
+    fake_openai.beta.assistants.retrieve.assert_not_called()
+    assert fake_openai.beta.threads.runs.create.call_args.kwargs["assistant_id"] == "asst_ltg"
+
+
+@pytest.mark.unit
+def test_assistant_metadata_is_cached(fake_openai):
+    cache = assistants.AssistantCache(ttl=60)
+    cache.get("asst_1")
+    cache.get("asst_1")
+    fake_openai.beta.assistants.retrieve.assert_called_once_with("asst_1")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.unit
+def test_unchanged_payloads_are_uploaded_once(fake_openai, monkeypatch):
+    monkeypatch.setattr(assistants, "upload_cache", assistants.UploadCache())
+    fake_openai.files.create.side_effect = lambda **kwargs: SimpleNamespace(id=f"file_{fake_openai.files.create.call_count}")
+
+    first = assistants.upload_json("student", {"b": 1, "a": [2]})
+    second = assistants.upload_json("student", {"a": [2], "b": 1})
+    third = assistants.upload_json("student", {"a": [3], "b": 1})
+
+    assert first.id == second.id != third.id
+    name, data, _ = fake_openai.files.create.call_args.kwargs["file"]
+    assert name.startswith(assistants.UPLOAD_PREFIX) and isinstance(data, bytes)
+
+
+@pytest.mark.unit
+def test_gc_deletes_only_expired_payload_files(fake_openai, monkeypatch):
+    now = assistants.time.time()
+    fake_openai.files.list.return_value = [
+        SimpleNamespace(id="old", filename="eduquest-quests-1.json", created_at=now - 10 ** 6),
+        SimpleNamespace(id="new", filename="eduquest-quests-2.json", created_at=now),
+        SimpleNamespace(id="other", filename="syllabus.pdf", created_at=now - 10 ** 6),
+    ]
+    assert assistants.delete_expired_uploads(max_age=3600) == 1
+    fake_openai.files.delete.assert_called_once_with("old")
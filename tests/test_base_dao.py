@@ -0,0 +1,171 @@
+"""
+Tests for BaseDAO pagination, batch and transaction helpers
+"""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from data_access.base_dao import (
+    BaseDAO,
+    ConditionalWriteError,
+    encode_page_token,
+    decode_page_token,
+    transact_write,
+)
+
+
+def make_dao(pages):
+    dao = BaseDAO("test_table")
+    dao.table = MagicMock()
+    dao.table.query.side_effect = pages
+    dao.table.scan.side_effect = pages
+    return dao
+
+
+@pytest.mark.unit
+def test_paginate_follows_last_evaluated_key():
+    """Items from every page are returned, not just the first 1 MB"""
+    dao = make_dao([
+        {"Items": [{"id": 1}, {"id": 2}], "LastEvaluatedKey": {"id": 2}},
+        {"Items": [{"id": 3}]},
+    ])
+    assert dao.query_all(KeyConditionExpression="x") == [{"id": 1}, {"id": 2}, {"id": 3}]
+    second_call = dao.table.query.call_args_list[1]
+    assert second_call.kwargs["ExclusiveStartKey"] == {"id": 2}
+
+
+@pytest.mark.unit
+def test_paginate_is_lazy():
+    """Later pages are only fetched when the caller keeps iterating"""
+    dao = make_dao([
+        {"Items": [{"id": 1}], "LastEvaluatedKey": {"id": 1}},
+        {"Items": [{"id": 2}]},
+    ])
+    first = next(dao.paginate("scan"))
+    assert first == {"id": 1}
+    assert dao.table.scan.call_count == 1
+
+
+@pytest.mark.unit
+def test_fetch_page_returns_token():
+    dao = make_dao([{"Items": [{"id": "a"}], "LastEvaluatedKey": {"id": "a", "week": Decimal(3)}}])
+    items, token = dao.fetch_page("query", 1, KeyConditionExpression="x")
+    assert items == [{"id": "a"}]
+    assert decode_page_token(token) == {"id": "a", "week": Decimal(3)}
+    assert dao.table.query.call_args.kwargs["Limit"] == 1
+
+
+@pytest.mark.unit
+def test_last_page_has_no_token():
+    assert encode_page_token(None) is None
+
+
+@pytest.mark.unit
+def test_invalid_page_token():
+    with pytest.raises(ValueError):
+        decode_page_token("not-a-token")
+
+
+@pytest.mark.unit
+def test_batch_put_chunks_and_retries(monkeypatch):
+    """Items go out 25 at a time and unprocessed items are retried"""
+    resource = MagicMock()
+    leftover = {"test_table": [{"PutRequest": {"Item": {"id": 0}}}]}
+    resource.batch_write_item.side_effect = [
+        {"UnprocessedItems": leftover},
+        {"UnprocessedItems": {}},
+        {},
+    ]
+    monkeypatch.setattr("data_access.base_dao.get_dynamodb_resource", lambda: resource)
+    monkeypatch.setattr("data_access.base_dao.time.sleep", lambda _: None)
+
+    dao = BaseDAO("test_table")
+    dao.batch_put([{"id": i} for i in range(30)])
+
+    calls = resource.batch_write_item.call_args_list
+    assert len(calls) == 3
+    assert len(calls[0].kwargs["RequestItems"]["test_table"]) == 25
+    assert calls[1].kwargs["RequestItems"] == leftover
+    assert len(calls[2].kwargs["RequestItems"]["test_table"]) == 5
+
+
+@pytest.mark.unit
+def test_batch_put_gives_up(monkeypatch):
+    resource = MagicMock()
+    resource.batch_write_item.return_value = {
+        "UnprocessedItems": {"test_table": [{"PutRequest": {"Item": {"id": 0}}}]}
+    }
+    monkeypatch.setattr("data_access.base_dao.get_dynamodb_resource", lambda: resource)
+    monkeypatch.setattr("data_access.base_dao.time.sleep", lambda _: None)
+
+    with pytest.raises(RuntimeError):
+        BaseDAO("test_table").batch_put([{"id": 0}], max_retries=2)
+    assert resource.batch_write_item.call_count == 3
+
+
+@pytest.mark.unit
+def test_batch_get_chunks_projects_and_retries(monkeypatch):
+    """Keys go out 100 at a time and unprocessed keys are retried"""
+    resource = MagicMock()
+    leftover = {"test_table": {"Keys": [{"id": 0}]}}
+    resource.batch_get_item.side_effect = [
+        {"Responses": {"test_table": [{"id": 1}]}, "UnprocessedKeys": leftover},
+        {"Responses": {"test_table": [{"id": 0}]}},
+        {"Responses": {"test_table": [{"id": 100}]}},
+    ]
+    monkeypatch.setattr("data_access.base_dao.get_dynamodb_resource", lambda: resource)
+    monkeypatch.setattr("data_access.base_dao.time.sleep", lambda _: None)
+
+    items = BaseDAO("test_table").batch_get([{"id": i} for i in range(101)], projection=["id"])
+
+    assert sorted(item["id"] for item in items) == [0, 1, 100]
+    calls = resource.batch_get_item.call_args_list
+    first = calls[0].kwargs["RequestItems"]["test_table"]
+    assert len(first["Keys"]) == 100
+    assert first["ProjectionExpression"] == "#p0"
+    assert first["ExpressionAttributeNames"] == {"#p0": "id"}
+    assert calls[1].kwargs["RequestItems"] == leftover
+    assert len(calls[2].kwargs["RequestItems"]["test_table"]["Keys"]) == 1
+
+
+
+class FakeClientError(Exception):
+    def __init__(self, response):
+        super().__init__(response["Error"]["Code"])
+        self.response = response
+
+
+@pytest.mark.unit
+def test_update_action_fills_missing_attributes_only():
+    action = BaseDAO("test_table").update_action(
+        {"id": "a"}, {"status": "done"}, defaults={"week": 1, "status": "new"}
+    )["Update"]
+    assert action["UpdateExpression"] == "SET #status = :status, #week = if_not_exists(#week, :week)"
+    assert action["ExpressionAttributeValues"] == {":status": "done", ":week": 1}
+
+
+@pytest.mark.unit
+def test_transact_write_chunks_at_100(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr("data_access.base_dao.get_dynamodb_client", lambda: client)
+
+    dao = BaseDAO("test_table")
+    transact_write([dao.put_action({"id": i}) for i in range(150)])
+
+    calls = client.transact_write_items.call_args_list
+    assert [len(call.kwargs["TransactItems"]) for call in calls] == [100, 50]
+
+
+@pytest.mark.unit
+def test_transact_write_raises_on_condition_failure(monkeypatch):
+    client = MagicMock()
+    client.transact_write_items.side_effect = FakeClientError({
+        "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+        "CancellationReasons": [{"Code": "ConditionalCheckFailed"}, {"Code": "None"}],
+    })
+    monkeypatch.setattr("data_access.base_dao.get_dynamodb_client", lambda: client)
+    monkeypatch.setattr("data_access.base_dao.ClientError", FakeClientError)
+
+    with pytest.raises(ConditionalWriteError):
+        transact_write([BaseDAO("test_table").put_action({"id": 1})])
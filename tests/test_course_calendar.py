@@ -0,0 +1,118 @@
+"""
+Tests for the per-period course calendar (week -> topics/skills map)
+"""
+
+import importlib.util
+import os
+import sys
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from routes.teacher.teacher_service import TeacherService
+
+
+def calendar_of(*weeks):
+    return SimpleNamespace(list_of_weeks=[
+        SimpleNamespace(Week=week, Topics=f"topic {week}", Skills=f"skill {week}") for week in weeks
+    ])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = TeacherService()
+    service.period_dao = MagicMock()
+    agent_cls = MagicMock()
+    agent_cls.return_value.run.return_value = calendar_of(2, 1)
+    monkeypatch.setattr("routes.teacher.teacher_service.CourseCalendarAgent", agent_cls)
+    service.agent_cls = agent_cls
+    return service
+
+
+def stored_calendar(service):
+    period_id, updates = service.period_dao.update_period.call_args.args
+    return updates["course_calendar"]
+
+
+def source(name, sha256="v1"):
+    return {"key": f"periods/p1/course materials/{name}", "sha256": sha256}
+
+
+@pytest.mark.unit
+def test_full_build_records_only_the_files_passed_in(service):
+    service.period_dao.get_period_by_id.return_value = {
+        "period_id": "p1", "vector_store_id": "vs",
+        "file_urls": ["periods/p1/course materials/syllabus.pdf", "periods/p1/course materials/broken.pdf"]
+    }
+
+    result = service.build_course_calendar("p1", [source("syllabus.pdf")])
+
+    assert result["weeks"] == 2
+    calendar = stored_calendar(service)
+    assert [week["week"] for week in calendar["weeks"]] == [1, 2]
+    # broken.pdf is in S3 but never reached the vector store, so it stays pending
+    assert calendar["source_files"] == [source("syllabus.pdf")]
+    assert service.agent_cls.call_args.kwargs["existing_calendar"] is None
+
+
+@pytest.mark.unit
+def test_incremental_rebuild_only_for_new_or_changed_files(service):
+    existing = {"weeks": [{"week": 1, "topics": "t", "skills": "s"}], "source_files": [source("syllabus.pdf")]}
+    service.period_dao.get_period_by_id.return_value = {"vector_store_id": "vs", "course_calendar": existing}
+
+    result = service.build_course_calendar("p1", [source("syllabus.pdf")], incremental=True)
+    assert result["message"] == "Course calendar is already up to date"
+    service.agent_cls.assert_not_called()
+    service.period_dao.update_period.assert_not_called()
+
+    service.build_course_calendar("p1", [source("syllabus.pdf"), source("unit3.pdf")], incremental=True)
+    kwargs = service.agent_cls.call_args.kwargs
+    assert kwargs["existing_calendar"] is existing
+    assert kwargs["new_files"] == ["unit3.pdf"]
+    assert stored_calendar(service)["source_files"] == [source("syllabus.pdf"), source("unit3.pdf")]
+
+    # A revised syllabus under the same name is picked up and replaces the old version
+    service.build_course_calendar("p1", [source("syllabus.pdf", "v2")], incremental=True)
+    assert service.agent_cls.call_args.kwargs["new_files"] == ["syllabus.pdf"]
+    assert stored_calendar(service)["source_files"] == [source("syllabus.pdf", "v2")]
+
+
+@pytest.mark.unit
+def test_sources_hash_file_content(tmp_path):
+    from routes.teacher.teacher_service import course_material_source
+    path = tmp_path / "syllabus.pdf"
+    path.write_bytes(b"week 1: limits")
+    first = course_material_source("p1", str(path))
+    path.write_bytes(b"week 1: derivatives")
+    assert first["key"] == "periods/p1/course materials/syllabus.pdf"
+    assert course_material_source("p1", str(path))["sha256"] != first["sha256"]
+
+
+def load_agent_module():
+    """conftest mocks EQ_agents; load the real agent module on top of the mocked SDK."""
+    sys.modules.setdefault("agents.extensions", MagicMock())
+    sys.modules.setdefault("agents.extensions.handoff_prompt", MagicMock())
+    for name in ("EQ_agents.llm_scheduler", "EQ_agents.agent_loop", "EQ_agents.schedule_guardrail"):
+        sys.modules.setdefault(name, MagicMock())
+    path = os.path.join(os.path.dirname(__file__), "..", "EQ_agents", "agent.py")
+    spec = importlib.util.spec_from_file_location("eq_agent_calendar_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.unit
+def test_schedules_prompt_uses_the_calendar_instead_of_file_search(monkeypatch):
+    agent_module = load_agent_module()
+    monkeypatch.setattr(agent_module, "Agent", lambda **kwargs: SimpleNamespace(**kwargs))
+    student = {key: "x" for key in ("first_name", "last_name", "strength", "weakness",
+                                    "interest", "learning_style", "long_term_goal", "grade")}
+    calendar = {"weeks": [{"week": 1, "topics": "Limits", "skills": "evaluate limits"}]}
+
+    with_calendar = agent_module.SchedulesAgent(student, {"vector_store_id": "vs", "course_calendar": calendar})
+    assert with_calendar.schedules_agent.tools == []
+    assert "Week 1: Limits (skills: evaluate limits)" in with_calendar.schedules_agent.instructions
+    assert "Week 1: Limits" in with_calendar.guardrial_agent.instructions
+
+    without = agent_module.SchedulesAgent(student, {"vector_store_id": "vs"})
+    assert len(without.schedules_agent.tools) == 1
@@ -0,0 +1,41 @@
+"""
+Tests for the shared DynamoDB resource and table registry
+"""
+
+import pytest
+import boto3
+
+from data_access import config
+from data_access.student_dao import StudentDAO
+from data_access.period_dao import PeriodDAO
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    """Start every test with an empty registry"""
+    config.reset_dynamodb()
+    boto3.resource.reset_mock()
+    yield
+    config.reset_dynamodb()
+
+
+@pytest.mark.unit
+def test_resource_created_once_per_process():
+    """Many DAOs share a single boto3 resource"""
+    StudentDAO()
+    PeriodDAO()
+    StudentDAO()
+    assert boto3.resource.call_count == 1
+
+
+@pytest.mark.unit
+def test_table_handles_are_cached():
+    """The same table name always returns the same handle"""
+    assert config.get_table("student") is config.get_table("student")
+    assert StudentDAO().table is StudentDAO().table
+
+
+@pytest.mark.unit
+def test_legacy_config_uses_registry():
+    """DynamoDBConfig keeps working on top of the shared resource"""
+    assert config.DynamoDBConfig().get_table("period") is config.get_table("period")
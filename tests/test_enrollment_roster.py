@@ -0,0 +1,92 @@
+"""
+Tests for roster hydration and keyed enrollment lookup
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.enrollment_dao import EnrollmentDAO, STUDENT_PERIOD_INDEX
+from routes.enrollment.enrollment_service import EnrollmentService, ROSTER_FIELDS
+
+
+@pytest.mark.unit
+def test_roster_batches_student_lookups():
+    service = EnrollmentService.__new__(EnrollmentService)
+    service.enrollment_dao = MagicMock()
+    service.student_dao = MagicMock()
+    service.period_dao = MagicMock()
+    service.enrollment_dao.get_enrollments_by_period.return_value = [
+        {"period_id": "p1", "student_id": f"s{i}"} for i in range(40)
+    ]
+    service.student_dao.get_students_by_ids.return_value = [
+        {"student_id": f"s{i}", "first_name": f"N{i}"} for i in range(40)
+    ]
+    service.period_dao.get_period_by_id.return_value = {"file_urls": ()}
+
+    roster = service.get_roster("p1")
+
+    service.student_dao.get_students_by_ids.assert_called_once()
+    assert service.student_dao.get_students_by_ids.call_args.kwargs["projection"] == ROSTER_FIELDS
+    service.student_dao.get_student_by_id.assert_not_called()
+    assert roster["students"][7]["profile"]["first_name"] == "N7"
+
+
+@pytest.mark.unit
+def test_enrollment_for_student_uses_index():
+    dao = EnrollmentDAO(use_indexes=True)
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [{"period_id": "p1", "student_id": "s1"}]}
+    assert dao.get_enrollment_for_student("p1", "s1")["student_id"] == "s1"
+    assert dao.table.query.call_args.kwargs["IndexName"] == STUDENT_PERIOD_INDEX
+
+
+@pytest.mark.unit
+def test_enrollment_for_student_filters_until_the_index_is_enabled(monkeypatch):
+    monkeypatch.delenv("ENROLLMENT_USE_INDEXES", raising=False)
+    dao = EnrollmentDAO()
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [{"period_id": "p1", "student_id": "s0"},
+                                              {"period_id": "p1", "student_id": "s1"}]}
+    assert dao.get_enrollment_for_student("p1", "s1")["student_id"] == "s1"
+    assert "IndexName" not in dao.table.query.call_args.kwargs
+
+
+@pytest.fixture
+def roster_client(monkeypatch):
+    from app import app as flask_app
+    import routes.enrollment.routes as enrollment_routes
+
+    flask_app.config.update({"TESTING": True})
+    monkeypatch.setattr("routes.auth_context.session_dao", MagicMock())
+    service = MagicMock()
+    service.get_period.side_effect = lambda period_id: {"teacher_id": "t1"} if period_id == "p1" else None
+    service.get_roster.return_value = {"students": [], "file_urls": []}
+    monkeypatch.setattr(enrollment_routes, "service", service)
+    return flask_app, service
+
+
+def bearer(flask_app, identity):
+    from flask_jwt_extended import create_access_token
+    with flask_app.app_context():
+        return {"Authorization": f"Bearer {create_access_token(identity=identity)}"}
+
+
+@pytest.mark.unit
+def test_roster_requires_authentication(roster_client):
+    flask_app, service = roster_client
+    response = flask_app.test_client().get("/enrollment/roster/p1")
+    assert response.status_code == 401
+    service.get_roster.assert_not_called()
+
+
+@pytest.mark.unit
+def test_roster_is_only_for_the_periods_teacher(roster_client):
+    flask_app, service = roster_client
+    client = flask_app.test_client()
+
+    assert client.get("/enrollment/roster/p1", headers=bearer(flask_app, "t2")).status_code == 403
+    assert client.get("/enrollment/roster/missing", headers=bearer(flask_app, "t1")).status_code == 404
+    service.get_roster.assert_not_called()
+
+    assert client.get("/enrollment/roster/p1", headers=bearer(flask_app, "t1")).status_code == 200
+    service.get_roster.assert_called_once_with("p1")
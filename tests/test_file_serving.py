@@ -0,0 +1,141 @@
+"""
+Tests for /teacher/get-file/<key>: presigned redirects and range/ETag streaming
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from flask_jwt_extended import create_access_token
+
+from app import app as flask_app
+import routes.teacher.routes as teacher_routes
+from routes.teacher.teacher_service import TeacherService
+
+KEY = "periods/P1/course materials/syllabus.pdf"
+
+
+class FakeClientError(Exception):
+    def __init__(self, code, status):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+        self.closed = False
+
+    def iter_chunks(self, chunk_size):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start:start + chunk_size]
+
+    def read(self):
+        raise AssertionError("the body must be streamed, not read whole")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client(monkeypatch):
+    flask_app.config.update({"TESTING": True})
+    monkeypatch.setattr("routes.auth_context.session_dao", MagicMock())
+    monkeypatch.setattr(teacher_routes, "ClientError", FakeClientError)
+    monkeypatch.setattr(teacher_routes, "FILE_SERVING_MODE", "stream")
+    service = TeacherService()
+    service.period_dao = MagicMock()
+    service.period_dao.get_period_by_id.side_effect = (
+        lambda period_id: {"period_id": "P1", "teacher_id": "t1"} if period_id == "P1" else None)
+    service.enrollment_dao = MagicMock()
+    service.enrollment_dao.get_enrollment_for_student.side_effect = (
+        lambda period_id, student_id: {"student_id": student_id} if student_id == "s1" else None)
+    monkeypatch.setattr(teacher_routes, "teacher_service", service)
+    return flask_app.test_client()
+
+
+def auth(teacher_id="t1", **headers):
+    with flask_app.app_context():
+        token = create_access_token(identity=teacher_id)
+    return {"Authorization": f"Bearer {token}", **headers}
+
+
+@pytest.mark.unit
+def test_streams_in_chunks_with_etag(client, monkeypatch):
+    body = FakeBody(b"x" * (teacher_routes.FILE_CHUNK_SIZE * 2 + 10))
+    get_object = MagicMock(return_value={
+        "Body": body, "ContentLength": len(body.data), "ContentType": "application/pdf", "ETag": '"abc"'
+    })
+    monkeypatch.setattr(teacher_routes, "get_object", get_object)
+
+    response = client.get(f"/teacher/get-file/{KEY}", headers=auth())
+
+    assert response.status_code == 200
+    assert response.data == body.data and body.closed
+    assert response.headers["ETag"] == '"abc"' and response.headers["Accept-Ranges"] == "bytes"
+    assert get_object.call_args.args == (KEY,)
+
+
+@pytest.mark.unit
+def test_range_request_returns_partial_content(client, monkeypatch):
+    get_object = MagicMock(return_value={
+        "Body": FakeBody(b"0123"), "ContentLength": 4, "ContentType": "video/mp4",
+        "ETag": '"abc"', "ContentRange": "bytes 0-3/100"
+    })
+    monkeypatch.setattr(teacher_routes, "get_object", get_object)
+
+    response = client.get(f"/teacher/get-file/{KEY}", headers=auth(Range="bytes=0-3"))
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == "bytes 0-3/100"
+    assert get_object.call_args.kwargs["byte_range"] == "bytes=0-3"
+
+
+@pytest.mark.unit
+def test_unchanged_file_returns_304(client, monkeypatch):
+    monkeypatch.setattr(teacher_routes, "get_object", MagicMock(side_effect=FakeClientError("304", 304)))
+
+    response = client.get(f"/teacher/get-file/{KEY}", headers=auth(**{"If-None-Match": '"abc"'}))
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"abc"'
+
+
+@pytest.mark.unit
+def test_redirect_mode(client, monkeypatch):
+    presign = MagicMock(return_value="https://bucket.s3.amazonaws.com/signed")
+    monkeypatch.setattr(teacher_routes, "presigned_download_url", presign)
+
+    monkeypatch.setattr(teacher_routes, "FILE_SERVING_MODE", "redirect")
+
+    response = client.get(f"/teacher/get-file/{KEY}", headers=auth())
+
+    assert response.status_code == 302
+    assert response.headers["Location"] == "https://bucket.s3.amazonaws.com/signed"
+    presign.assert_called_once_with(KEY, filename="syllabus.pdf")
+
+
+@pytest.mark.unit
+def test_file_access_by_role(client, monkeypatch):
+    get_object = MagicMock(return_value={"Body": FakeBody(b"pdf"), "ContentLength": 3, "ETag": '"abc"'})
+    monkeypatch.setattr(teacher_routes, "get_object", get_object)
+    submission = "periods/P1/students/s1/q1/170_essay.pdf"
+
+    # Enrolled students read course materials and their own submissions
+    assert client.get(f"/teacher/get-file/{KEY}", headers=auth("s1")).status_code == 200
+    assert client.get(f"/teacher/get-file/{submission}", headers=auth("s1")).status_code == 200
+    # The teacher reads every file of the period
+    assert client.get(f"/teacher/get-file/{submission}", headers=auth("t1")).status_code == 200
+    # Other students and teachers do not
+    assert client.get(f"/teacher/get-file/{KEY}", headers=auth("s2")).status_code == 403
+    assert client.get(f"/teacher/get-file/{submission}", headers=auth("s2")).status_code == 403
+    assert client.get(f"/teacher/get-file/{KEY}", headers=auth("t2")).status_code == 403
+    assert get_object.call_count == 3
+
+
+@pytest.mark.unit
+def test_keys_outside_a_known_period_are_not_found(client, monkeypatch):
+    get_object = MagicMock()
+    monkeypatch.setattr(teacher_routes, "get_object", get_object)
+
+    assert client.get("/teacher/get-file/periods/P2/course materials/a.pdf", headers=auth()).status_code == 404
+    assert client.get("/teacher/get-file/other/a.pdf", headers=auth()).status_code == 404
+    get_object.assert_not_called()
@@ -0,0 +1,217 @@
+"""
+Tests for per-quest homework checkpoints and resumable homework runs
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from models.weekly_quest import WeeklyQuest
+from models.weekly_quest_item import WeeklyQuestItem
+from routes.period.period_service import PeriodService
+
+
+def load_module(name):
+    """conftest mocks the EQ_agents package; load a real module from its file."""
+    path = os.path.join(os.path.dirname(__file__), "..", "EQ_agents", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"eq_{name}_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+sys.modules.setdefault("agents.extensions", MagicMock())
+sys.modules.setdefault("agents.extensions.handoff_prompt", MagicMock())
+sys.modules.setdefault("EQ_agents.llm_scheduler", MagicMock())
+# The real loop, without the model client (the SDK is mocked)
+loop_module = load_module("agent_loop")
+loop_module.agent_loop.client_factory = None
+sys.modules.setdefault("EQ_agents.agent_loop", loop_module)
+sys.modules.setdefault("EQ_agents.schedule_guardrail", load_module("schedule_guardrail"))
+agent_module = load_module("agent")
+HWAgent, IndividualQuest = agent_module.HWAgent, agent_module.IndividualQuest
+# Quest calls go through a real scheduler so the timeout starts at the first slot
+scheduler_module = load_module("llm_scheduler")
+agent_module.on_slot_acquired = scheduler_module.on_slot_acquired
+
+
+def make_quest(quest):
+    return IndividualQuest(Name=quest["Name"], Skills=quest["Skills"], Week=quest["Week"],
+                           instructions=f"do week {quest['Week']}", rubric={"criteria": []})
+
+
+def make_agent(schedule, on_quest_done, delays=None, timeout_seconds=5, scheduler=None, **kwargs):
+    scheduler = scheduler or scheduler_module.LLMScheduler(max_concurrency=5)
+    agent = HWAgent({}, {"vector_store_id": "vs"}, schedule,
+                    timeout_seconds=timeout_seconds, on_quest_done=on_quest_done, **kwargs)
+
+    async def call(quest):
+        await asyncio.sleep((delays or {}).get(quest["Week"], 0))
+        if quest["Name"] == "broken":
+            raise RuntimeError("model error")
+        return make_quest(quest)
+
+    async def process_quest(quest):
+        return await scheduler.submit("m", lambda: call(quest))
+
+    agent.process_quest = process_quest
+    return agent
+
+
+def schedule_of(*weeks):
+    return [{"Name": f"Quest {w}", "Skills": "algebra", "Week": w} for w in weeks]
+
+
+@pytest.mark.unit
+def test_each_quest_is_checkpointed_when_it_finishes():
+    saved = []
+    schedule = schedule_of(1, 2) + [{"Name": "broken", "Skills": "", "Week": 3}]
+
+    result = make_agent(schedule, saved.append).run()
+
+    assert sorted(q.Week for q in saved) == [1, 2]
+    assert sorted(q.Week for q in result) == [1, 2]
+
+
+@pytest.mark.unit
+def test_timeout_keeps_quests_already_saved():
+    saved = []
+    agent = make_agent(schedule_of(1, 2), saved.append, delays={2: 5}, timeout_seconds=0.2)
+
+    with pytest.raises(Exception, match=r"1/2 quests completed"):
+        agent.run()
+    assert [q.Week for q in saved] == [1]
+
+
+@pytest.mark.unit
+def test_time_queued_for_a_slot_does_not_count_toward_the_timeout():
+    scheduler = scheduler_module.LLMScheduler(max_concurrency=1)
+    busy = threading.Thread(target=asyncio.run, args=(scheduler.submit("m", lambda: asyncio.sleep(0.5)),))
+    busy.start()
+    time.sleep(0.05)
+
+    try:
+        result = make_agent(schedule_of(1), [].append, timeout_seconds=0.3, scheduler=scheduler).run()
+    finally:
+        busy.join()
+    assert [q.Week for q in result] == [1]
+
+
+@pytest.mark.unit
+def test_waiting_too_long_for_a_slot_is_reported():
+    scheduler = scheduler_module.LLMScheduler(max_concurrency=1)
+    busy = threading.Thread(target=asyncio.run, args=(scheduler.submit("m", lambda: asyncio.sleep(0.5)),))
+    busy.start()
+    time.sleep(0.05)
+
+    try:
+        with pytest.raises(Exception, match="still waiting for an LLM slot"):
+            make_agent(schedule_of(1), [].append, scheduler=scheduler, queue_timeout_seconds=0.1).run()
+    finally:
+        busy.join()
+
+
+def make_weekly_quest():
+    return WeeklyQuest(
+        quest_id="wq1", student_id="stu1", period_id="p1",
+        quests=[
+            WeeklyQuestItem(individual_quest_id="iq1", name="Quest 1", skills="algebra", week=1,
+                            instructions="already done", rubric={"criteria": []}),
+            WeeklyQuestItem(individual_quest_id="iq2", name="Quest 2", skills="algebra", week=2),
+            WeeklyQuestItem(individual_quest_id="iq3", name="Quest 3", skills="algebra", week=3,
+                            instructions="no rubric yet"),
+        ]
+    )
+
+
+def make_service(monkeypatch, weekly_quest):
+    service = PeriodService()
+    service.student_dao = MagicMock()
+    service.period_dao = MagicMock()
+    service.period_dao.get_period_by_id.return_value = {"vector_store_id": "vs"}
+    service.quest_service.weekly_quest_dao = MagicMock()
+    service.quest_service.weekly_quest_dao.get_weekly_quest_by_student_and_period.return_value = weekly_quest
+    monkeypatch.setattr("routes.quest.quest_service.transact_write", lambda actions: None)
+    return service
+
+
+@pytest.mark.unit
+def test_resume_only_generates_missing_weeks(monkeypatch):
+    weekly_quest = make_weekly_quest()
+    service = make_service(monkeypatch, weekly_quest)
+
+    scheduled = []
+
+    class FakeHWAgent:
+        def __init__(self, student, period, schedule, on_quest_done=None):
+            scheduled.extend(schedule)
+            self.schedule, self.on_quest_done = schedule, on_quest_done
+            self.failed_checkpoints = []
+
+        def run(self):
+            return [self.on_quest_done(make_quest(quest)) for quest in self.schedule]
+
+    monkeypatch.setattr("routes.period.period_service.HWAgent", FakeHWAgent)
+    progress = []
+
+    result = service.run_homework_agent("stu1", "p1", progress.append)
+
+    assert [quest["Week"] for quest in scheduled] == [2, 3]
+    assert weekly_quest.quests[0].instructions == "already done"
+    assert result["saved_quests"]["skipped_quests_count"] == 1
+    assert result["saved_quests"]["missing_weeks"] == []
+    assert len(result["homework"]["list_of_quests"]) == 3
+    assert progress[-1] == "Saved week 3 (3/3 quests ready)"
+    updated = service.quest_service.weekly_quest_dao.update_individual_quest_in_weekly_quest
+    assert [call.args[1] for call in updated.call_args_list] == ["iq2", "iq3"]
+
+
+@pytest.mark.unit
+def test_week_that_fails_to_save_is_reported_missing(monkeypatch):
+    weekly_quest = make_weekly_quest()
+    service = make_service(monkeypatch, weekly_quest)
+
+    def update_item(quest_id, individual_quest_id, updates):
+        if individual_quest_id == "iq2":
+            raise RuntimeError("throttled")
+    service.quest_service.weekly_quest_dao.update_individual_quest_in_weekly_quest.side_effect = update_item
+    monkeypatch.setattr("routes.period.period_service.HWAgent",
+                        lambda student, period, schedule, on_quest_done=None: make_agent(schedule, on_quest_done))
+
+    result = service.run_homework_agent("stu1", "p1")
+
+    assert result["saved_quests"]["missing_weeks"] == [2]
+    assert result["saved_quests"]["failed_checkpoints"] == [2]
+    assert [quest["Week"] for quest in result["homework"]["list_of_quests"]] == [1, 3]
+    # The unsaved week is left without homework so the next run generates it again
+    assert weekly_quest.quests[1].instructions is None
+
+
+@pytest.mark.unit
+def test_rerun_with_unchanged_inputs_costs_no_model_calls(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+    from data_access.llm_cache_dao import LLMOutputCache
+
+    rubric = {"criteria_list": [{"name": "Accuracy", "scale": {f"Score_{i}": str(i) for i in range(6)}}]}
+    run_agent = AsyncMock(side_effect=lambda agent, input: SimpleNamespace(
+        final_output=agent_module.Rubric(**rubric) if agent.output_type else "1. Solve"))
+    monkeypatch.setattr(agent_module, "run_agent", run_agent)
+    monkeypatch.setattr(agent_module, "llm_output_cache", LLMOutputCache())
+    monkeypatch.setattr(agent_module, "Agent", lambda output_type=None, **kwargs: SimpleNamespace(
+        output_type=output_type, **kwargs))
+
+    student = {key: "x" for key in ("first_name", "last_name", "strength", "weakness",
+                                    "interest", "learning_style", "grade")}
+    agent = HWAgent(student, {"vector_store_id": "vs"}, schedule_of(1))
+    first = asyncio.run(agent.process_quest(schedule_of(1)[0]))
+    second = asyncio.run(agent.process_quest(schedule_of(1)[0]))
+
+    assert run_agent.await_count == 2
+    assert second == first
+    assert agent_module.llm_output_cache.hits == 2
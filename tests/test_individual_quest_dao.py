@@ -0,0 +1,66 @@
+"""
+Tests for IndividualQuestDAO index-backed lookups
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.individual_quest_dao import (
+    IndividualQuestDAO,
+    STUDENT_PERIOD_INDEX,
+    QUEST_ID_INDEX,
+)
+from models.individual_quest import IndividualQuest
+
+
+def make_dao(use_indexes=True):
+    dao = IndividualQuestDAO(use_indexes=use_indexes)
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [{"individual_quest_id": "iq1"}]}
+    dao.table.scan.return_value = {"Items": [{"individual_quest_id": "iq2"}]}
+    return dao
+
+
+@pytest.mark.unit
+def test_student_and_period_uses_index():
+    """Dashboard lookup queries the student_period_index instead of scanning"""
+    dao = make_dao()
+    items = dao.get_quests_by_student_and_period("stu1", "per1")
+    assert items == [{"individual_quest_id": "iq1"}]
+    assert dao.table.query.call_args.kwargs["IndexName"] == STUDENT_PERIOD_INDEX
+    dao.table.scan.assert_not_called()
+
+
+@pytest.mark.unit
+def test_quest_id_uses_index():
+    dao = make_dao()
+    dao.get_quests_by_quest_id("q1")
+    assert dao.table.query.call_args.kwargs["IndexName"] == QUEST_ID_INDEX
+    dao.table.scan.assert_not_called()
+
+
+@pytest.mark.unit
+def test_scan_fallback_when_indexes_disabled():
+    """Scans are only used when indexes are explicitly disabled"""
+    dao = make_dao(use_indexes=False)
+    items = dao.get_quests_by_student("stu1")
+    assert items == [{"individual_quest_id": "iq2"}]
+    dao.table.query.assert_not_called()
+
+
+@pytest.mark.unit
+def test_to_item_sets_student_period_key():
+    quest = IndividualQuest(
+        individual_quest_id="iq1", quest_id="q1", student_id="stu1", period_id="per1",
+        description="d", skills="s", week=1, instructions="", rubric={}
+    )
+    assert quest.to_item()["student_period_key"] == "stu1#per1"
+
+
+@pytest.mark.unit
+def test_indexes_are_off_until_enabled(monkeypatch):
+    """A deploy that ships before the migration keeps scanning"""
+    monkeypatch.delenv("INDIVIDUAL_QUEST_USE_INDEXES", raising=False)
+    assert IndividualQuestDAO().use_indexes is False
+    monkeypatch.setenv("INDIVIDUAL_QUEST_USE_INDEXES", "true")
+    assert IndividualQuestDAO().use_indexes is True
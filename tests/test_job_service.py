@@ -0,0 +1,79 @@
+"""
+Tests for background jobs (in-memory job backend)
+"""
+
+import pytest
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+from data_access.job_dao import InMemoryJobDAO
+from routes.job.job_service import JobService
+
+
+@pytest.fixture
+def service():
+    service = JobService(job_dao=InMemoryJobDAO(), max_workers=1)
+    yield service
+    service.executor.shutdown(wait=True)
+
+
+@pytest.mark.unit
+def test_job_runs_in_background_and_records_result(service):
+    def run(progress):
+        progress("halfway")
+        return {"message": "done", "score": 0.5}
+
+    job = service.enqueue("schedules_agent", "stu1", run, period_id="p1")
+    assert job["status"] == "queued"
+    service.executor.shutdown(wait=True)
+
+    stored = service.get_job(job["job_id"], "stu1")
+    assert stored["status"] == "succeeded"
+    assert stored["progress"] == "halfway"
+    assert stored["result"] == {"message": "done", "score": 0.5}
+
+
+@pytest.mark.unit
+def test_failed_job_records_error(service):
+    def run(progress):
+        raise Exception("agent timed out")
+
+    job = service.enqueue("homework_agent", "stu1", run)
+    service.executor.shutdown(wait=True)
+
+    stored = service.get_job(job["job_id"], "stu1")
+    assert stored["status"] == "failed"
+    assert stored["error"] == "agent timed out"
+
+
+@pytest.mark.unit
+def test_jobs_are_private_to_their_user(service):
+    job = service.enqueue("schedules_agent", "stu1", lambda progress: {})
+    assert service.get_job(job["job_id"], "stu2") is None
+
+
+@pytest.mark.unit
+def test_stale_running_jobs_are_reported_failed(service):
+    stale = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    service.job_dao.update_job("j1", {"user_id": "stu1", "status": "running"})
+    service.job_dao._jobs["j1"]["updated_at"] = stale
+    assert service.get_job("j1", "stu1")["status"] == "failed"
+
+
+@pytest.mark.unit
+def test_long_running_jobs_are_kept_fresh_by_the_heartbeat():
+    service = JobService(job_dao=InMemoryJobDAO(), max_workers=1, heartbeat_seconds=0.01)
+    release = threading.Event()
+    job = service.enqueue("period_provisioning", "t1", lambda progress: release.wait(5) and {})
+    stale = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    service.job_dao._jobs[job["job_id"]]["updated_at"] = stale
+
+    time.sleep(0.1)
+    try:
+        assert service.get_job(job["job_id"], "t1")["status"] == "running"
+    finally:
+        release.set()
+        service.executor.shutdown(wait=True)
+    assert service.get_job(job["job_id"], "t1")["status"] == "succeeded"
+    assert service._active_jobs == set()
@@ -0,0 +1,71 @@
+"""
+Tests for the homework instruction/rubric output cache
+"""
+
+import json
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.llm_cache_dao import LLMOutputCache, llm_cache_key
+
+
+@pytest.mark.unit
+def test_key_ignores_prompt_whitespace_but_not_content():
+    key = llm_cache_key("rubric", "gpt-4o", "Create a rubric\n    for: Quest 1")
+    assert key == llm_cache_key("rubric", "gpt-4o", "Create a rubric for:   Quest 1 ")
+    assert key != llm_cache_key("rubric", "gpt-4o", "Create a rubric for: Quest 2")
+    assert key != llm_cache_key("rubric", "gpt-4.1", "Create a rubric for: Quest 1")
+    assert key.startswith("rubric:")
+
+
+@pytest.mark.unit
+def test_memory_hit_skips_the_table():
+    dao = MagicMock()
+    cache = LLMOutputCache(dao=dao)
+    cache.put("k", "rubric", "gpt-4o", {"criteria_list": []})
+
+    assert cache.get("k") == {"criteria_list": []}
+    dao.get_entry.assert_not_called()
+    dao.put_entry.assert_called_once()
+    assert cache.hits == 1 and cache.hit_rate() == 1.0
+
+
+@pytest.mark.unit
+def test_table_hit_fills_the_lru():
+    dao = MagicMock()
+    dao.get_entry.return_value = {"output": json.dumps("1. Read"), "expires_at": int(time.time()) + 60}
+    cache = LLMOutputCache(dao=dao)
+
+    assert cache.get("k") == "1. Read"
+    assert cache.get("k") == "1. Read"
+    assert dao.get_entry.call_count == 1
+    assert (cache.store_hits, cache.hits, cache.misses) == (1, 1, 0)
+
+
+@pytest.mark.unit
+def test_store_errors_are_misses():
+    dao = MagicMock()
+    dao.get_entry.side_effect = Exception("throttled")
+    dao.put_entry.side_effect = Exception("throttled")
+    cache = LLMOutputCache(dao=dao)
+
+    assert cache.get("k") is None
+    cache.put("k", "instructions", "gpt-4o", "1. Read")
+    assert cache.get("k") == "1. Read"
+    assert cache.errors == 2 and cache.misses == 1
+
+
+@pytest.mark.unit
+def test_invalidate_and_ttl():
+    dao = MagicMock()
+    dao.get_entry.return_value = None
+    cache = LLMOutputCache(dao=dao, ttl=0)
+    cache.put("expired", "instructions", "gpt-4o", "old")
+    assert cache.get("expired") is None
+
+    cache = LLMOutputCache(dao=dao)
+    cache.put("k", "instructions", "gpt-4o", "old")
+    cache.invalidate("k")
+    dao.delete_entry.assert_called_once_with("k")
+    assert cache.get("k") is None
@@ -0,0 +1,162 @@
+"""
+Tests for the shared LLM call scheduler
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import pytest
+from types import SimpleNamespace
+
+
+def load_scheduler_module():
+    """conftest mocks the EQ_agents package; load the real module from its file."""
+    path = os.path.join(os.path.dirname(__file__), "..", "EQ_agents", "llm_scheduler.py")
+    spec = importlib.util.spec_from_file_location("llm_scheduler_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+llm = load_scheduler_module()
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers=headers)
+
+
+def make_scheduler(**kwargs):
+    defaults = dict(max_concurrency=2, model_rpm={"m": 60000, "n": 60000}, base_delay=0.001, max_delay=0.05)
+    defaults.update(kwargs)
+    return llm.LLMScheduler(**defaults)
+
+
+class Tracker:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    async def call(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        return "ok"
+
+
+@pytest.mark.unit
+def test_global_and_model_caps():
+    scheduler = make_scheduler(max_concurrency=3, model_concurrency={"m": 1})
+    tracker, m_tracker = Tracker(), Tracker()
+
+    async def main():
+        calls = [scheduler.submit("n", tracker.call) for _ in range(10)]
+        calls += [scheduler.submit("m", m_tracker.call) for _ in range(4)]
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == ["ok"] * 14
+    assert tracker.peak <= 3
+    assert m_tracker.peak == 1
+    stats = scheduler.stats()
+    assert stats["completed"] == 14
+    assert stats["running"] == 0 and stats["queued"] == 0
+
+
+@pytest.mark.unit
+def test_caps_hold_for_callers_on_any_loop():
+    # Agent runs share one loop, but the slots must not depend on it
+    scheduler = make_scheduler(max_concurrency=2)
+    tracker = Tracker()
+
+    def worker():
+        async def main():
+            await asyncio.gather(*[scheduler.submit("m", tracker.call) for _ in range(5)])
+        asyncio.run(main())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.peak <= 2
+    assert scheduler.stats()["completed"] == 15
+
+
+@pytest.mark.unit
+def test_slot_callback_fires_once_the_call_leaves_the_queue():
+    scheduler = make_scheduler(max_concurrency=1)
+    events = []
+
+    async def call(name):
+        events.append(name)
+        await asyncio.sleep(0.01)
+
+    async def main():
+        first = asyncio.ensure_future(scheduler.submit("m", lambda: call("first")))
+        await asyncio.sleep(0)
+        with llm.on_slot_acquired(lambda: events.append("second acquired")):
+            second = asyncio.ensure_future(scheduler.submit("m", lambda: call("second")))
+        await asyncio.gather(first, second)
+
+    asyncio.run(main())
+    assert events == ["first", "second acquired", "second"]
+
+
+@pytest.mark.unit
+def test_rate_limit_is_retried_and_paused_from_headers():
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited({"retry-after-ms": "20"})
+        return "ok"
+
+    assert asyncio.run(scheduler.submit("m", call)) == "ok"
+    assert len(attempts) == 3
+    assert scheduler.rate_limited == 2
+    assert scheduler.stats()["models"]["m"] == {"running": 0, "queued": 0}
+
+
+@pytest.mark.unit
+def test_non_retryable_errors_fail_fast():
+    scheduler = make_scheduler()
+
+    async def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.submit("m", call))
+    assert scheduler.failed == 1 and scheduler.retries == 0
+
+
+@pytest.mark.unit
+def test_nested_calls_reuse_the_callers_slot():
+    scheduler = make_scheduler(max_concurrency=1)
+
+    async def inner():
+        return "inner"
+
+    async def outer():
+        return await scheduler.submit("m", inner)
+
+    assert asyncio.run(asyncio.wait_for(scheduler.submit("m", outer), 1)) == "inner"
+
+
+@pytest.mark.unit
+def test_reset_header_durations():
+    assert llm.parse_reset_duration("6m0s") == 360
+    assert llm.parse_reset_duration("120ms") == pytest.approx(0.12)
+    assert llm.parse_reset_duration("2") == 2
+    assert llm.retry_after_seconds(RateLimited({"x-ratelimit-reset-requests": "1s",
+                                                "x-ratelimit-reset-tokens": "3s"})) == 3
@@ -0,0 +1,159 @@
+"""
+Tests for PeriodDAO caching and teacher-indexed listing
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.period_dao import (
+    PeriodDAO,
+    PeriodCache,
+    period_cache,
+    TEACHER_INDEX,
+    DASHBOARD_FIELDS,
+)
+
+PERIOD_ITEM = {
+    "period_id": "p1",
+    "initial_conversation_assistant_id": "a1",
+    "update_assistant_id": "a2",
+    "ltg_assistant_id": "a3",
+    "teacher_id": "t1",
+    "vector_store_id": "vs1",
+    "course": "Math",
+    "file_urls": ["s3://one"],
+}
+
+
+@pytest.fixture
+def dao():
+    period_cache.clear()
+    dao = PeriodDAO()
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [dict(PERIOD_ITEM)]}
+    yield dao
+    period_cache.clear()
+
+
+@pytest.mark.unit
+def test_repeat_lookups_hit_the_cache(dao):
+    assert dao.get_period_by_id("p1")["course"] == "Math"
+    assert dao.get_period_by_id("p1")["course"] == "Math"
+    assert dao.table.query.call_count == 1
+    assert (period_cache.hits, period_cache.misses) == (1, 1)
+
+
+@pytest.mark.unit
+def test_callers_get_independent_copies(dao):
+    period = dao.get_period_by_id("p1")
+    period["course"] = "Art"
+    period["file_urls"].append("s3://two")
+    cached = dao.get_period_by_id("p1")
+    assert cached["course"] == "Math"
+    assert cached["file_urls"] == ["s3://one"]
+    assert dao.table.query.call_count == 1
+
+
+@pytest.mark.unit
+def test_verify_period_serializes_a_cached_period(dao, monkeypatch):
+    from app import app as flask_app
+    import routes.period.routes as period_routes
+
+    service = period_routes.period_service
+    monkeypatch.setattr(service, "period_dao", dao)
+    for name in ("session_dao", "student_dao", "enrollment_dao", "conversation_dao"):
+        monkeypatch.setattr(service, name, MagicMock())
+    service.session_dao.get_sessions_by_auth_token.return_value = [{"user_id": "s1"}]
+    service.student_dao.get_student_by_id.return_value = {"student_id": "s1", "enrollments": []}
+    monkeypatch.setattr("routes.auth_context.session_dao", MagicMock())
+    dao.get_period_by_id("p1")  # warm the cache
+
+    response = flask_app.test_client().post(
+        "/period/verify-period", json={"period_id": "p1"}, headers={"Authorization": "Bearer tok"})
+
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["period"]["file_urls"] == ["s3://one"]
+    assert period_cache.hits >= 1
+
+
+@pytest.mark.unit
+def test_legacy_periods_read_without_a_created_at(dao):
+    assert dao.get_period_by_id("p1", use_cache=False)["created_at"] is None
+    assert dao.get_period_by_id("p1", use_cache=False)["created_at"] is None
+
+
+@pytest.mark.unit
+def test_new_periods_are_stored_with_a_created_at(dao):
+    from models.period import Period
+    dao.add_period(Period(**PERIOD_ITEM))
+    assert dao.table.put_item.call_args.kwargs["Item"]["created_at"]
+
+
+@pytest.mark.unit
+def test_update_and_delete_invalidate(dao):
+    dao.get_period_by_id("p1")
+    dao.update_period("p1", {"file_urls": ["s3://one", "s3://two"]})
+    dao.get_period_by_id("p1")
+    dao.delete_period("p1")
+    dao.get_period_by_id("p1")
+    assert dao.table.query.call_count == 3
+
+
+@pytest.mark.unit
+def test_missing_periods_are_not_cached(dao):
+    dao.table.query.return_value = {"Items": []}
+    assert dao.get_period_by_id("nope") is None
+    assert dao.get_period_by_id("nope") is None
+    assert dao.table.query.call_count == 2
+
+
+@pytest.mark.unit
+def test_lru_eviction():
+    cache = PeriodCache(max_size=1)
+    cache.put("a", {"period_id": "a"})
+    cache.put("b", {"period_id": "b"})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+@pytest.mark.unit
+def test_teacher_listing_queries_index_with_projection():
+    dao = PeriodDAO(use_indexes=True)
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [{"period_id": "p1", "course": "Math"}]}
+    assert dao.get_periods_by_teacher_id("t1") == [{"period_id": "p1", "course": "Math"}]
+    kwargs = dao.table.query.call_args.kwargs
+    assert kwargs["IndexName"] == TEACHER_INDEX
+    assert kwargs["ScanIndexForward"] is False
+    assert set(kwargs["ExpressionAttributeNames"].values()) == set(DASHBOARD_FIELDS)
+    dao.table.scan.assert_not_called()
+
+
+@pytest.mark.unit
+def test_teacher_listing_page_returns_token():
+    dao = PeriodDAO(use_indexes=True)
+    dao.table = MagicMock()
+    dao.table.query.return_value = {"Items": [{"period_id": "p1"}], "LastEvaluatedKey": {"period_id": "p1"}}
+    items, token = dao.get_periods_by_teacher_id_page("t1", 1)
+    assert items == [{"period_id": "p1"}] and token
+    assert dao.table.query.call_args.kwargs["Limit"] == 1
+
+
+@pytest.mark.unit
+def test_teacher_listing_scans_until_the_index_is_enabled(monkeypatch):
+    monkeypatch.delenv("PERIOD_USE_INDEXES", raising=False)
+    dao = PeriodDAO()
+    dao.table = MagicMock()
+    dao.table.scan.return_value = {"Items": [{"period_id": "old", "created_at": "1"},
+                                             {"period_id": "new", "created_at": "2"}]}
+    assert [p["period_id"] for p in dao.get_periods_by_teacher_id("t1")] == ["new", "old"]
+    dao.table.query.assert_not_called()
+
+
+@pytest.mark.unit
+def test_teacher_listing_errors_are_not_hidden():
+    dao = PeriodDAO(use_indexes=True)
+    dao.table = MagicMock()
+    dao.table.query.side_effect = RuntimeError("ValidationException: index not found")
+    with pytest.raises(RuntimeError):
+        dao.get_periods_by_teacher_id("t1")
@@ -0,0 +1,217 @@
+"""
+Tests for the background period provisioning pipeline
+"""
+
+import copy
+import hashlib
+import os
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from routes.teacher.teacher_service import TeacherService, IngestionStatus, initial_ingestion
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name in ("syllabus.pdf", "unit1.pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"content")
+        paths.append(str(path))
+    return paths
+
+
+def bulk_upload(succeed):
+    def upload(file_paths, folder=None, on_result=None):
+        results = []
+        for path in file_paths:
+            name = os.path.basename(path)
+            result = {"filename": name, "key": f"{folder}/{name}" if succeed else None,
+                      "error": None if succeed else "no credentials"}
+            on_result(result)
+            results.append(result)
+        return {"results": results, "metrics": {"files": len(results)}}
+    return upload
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = TeacherService()
+    service.period_dao = MagicMock()
+    service.openai_client = MagicMock()
+    service.openai_client.vector_stores.files.upload_and_poll.return_value = SimpleNamespace(
+        status="completed", last_error=None)
+    service.statuses = []
+    service.period_dao.update_period.side_effect = lambda period_id, updates: service.statuses.append(
+        copy.deepcopy(updates))
+    service.period = {
+        "period_id": "p1", "course": "Calculus", "vector_store_id": "vs1", "file_urls": [],
+        "update_assistant_id": "placeholder_update_assistant_id",
+        "ltg_assistant_id": "placeholder_ltg_assistant_id",
+        "ingestion": initial_ingestion(["syllabus.pdf", "unit1.pdf"])
+    }
+    service.period_dao.get_period_by_id.side_effect = lambda period_id, use_cache=True: copy.deepcopy(service.period)
+
+    class_cls = MagicMock()
+    class_cls.return_value.update_assistant.id = "asst_update"
+    class_cls.return_value.ltg_assistant.id = "asst_ltg"
+    monkeypatch.setattr("routes.teacher.teacher_service.assistants.create_class", class_cls)
+    monkeypatch.setattr("routes.teacher.teacher_service.upload_files_to_s3", bulk_upload(succeed=True))
+    service.build_course_calendar = MagicMock(return_value={"weeks": 3})
+    service.class_cls = class_cls
+    return service
+
+
+def updates_of(service, field):
+    return [updates[field] for updates in service.statuses if field in updates]
+
+
+@pytest.mark.unit
+def test_files_and_assistants_are_provisioned(service, files):
+    result = service.provision_period("p1", "Calculus", "vs1", files)
+
+    assert result["status"] == "ready" and result["failed_files"] == []
+    assert result["s3"] == {"files": 2}
+    assert service.class_cls.call_args.kwargs["vector_store_id"] == "vs1"
+    service.class_cls.return_value.create_update_assistant.assert_called_once()
+    service.class_cls.return_value.create_ltg_assistant.assert_called_once()
+    assert updates_of(service, "file_urls") == [[
+        "periods/p1/course materials/syllabus.pdf", "periods/p1/course materials/unit1.pdf"]]
+    assert updates_of(service, "ltg_assistant_id") == ["asst_ltg"]
+
+    final = updates_of(service, "ingestion")[-1]
+    assert final["status"] == "ready"
+    assert final["files"]["unit1.pdf"] == {
+        "s3": "uploaded", "vector_store": "completed", "key": "periods/p1/course materials/unit1.pdf",
+        "sha256": hashlib.sha256(b"content").hexdigest()}
+    service.build_course_calendar.assert_called_once()
+    assert service.build_course_calendar.call_args.kwargs["incremental"] is True
+    assert sorted(source["key"] for source in service.build_course_calendar.call_args.args[1]) == [
+        "periods/p1/course materials/syllabus.pdf", "periods/p1/course materials/unit1.pdf"]
+
+
+@pytest.mark.unit
+def test_failed_files_are_reported_per_file(service, files, monkeypatch):
+    def upload(vector_store_id, file):
+        if file.name.endswith("unit1.pdf"):
+            return SimpleNamespace(status="failed", last_error=SimpleNamespace(message="unsupported file"))
+        return SimpleNamespace(status="completed", last_error=None)
+    service.openai_client.vector_stores.files.upload_and_poll.side_effect = upload
+    monkeypatch.setattr("routes.teacher.teacher_service.upload_files_to_s3", bulk_upload(succeed=False))
+
+    result = service.provision_period("p1", "Calculus", "vs1", files)
+
+    assert result["status"] == "partial"
+    assert sorted(result["failed_files"]) == ["syllabus.pdf", "unit1.pdf"]
+    final = updates_of(service, "ingestion")[-1]
+    assert (final["files"]["unit1.pdf"]["s3"], final["files"]["unit1.pdf"]["vector_store"]) == ("failed", "failed")
+    assert final["files"]["syllabus.pdf"]["vector_store"] == "completed"
+    assert [source["key"] for source in service.build_course_calendar.call_args.args[1]] == [
+        "periods/p1/course materials/syllabus.pdf"]
+
+
+@pytest.mark.unit
+def test_assistant_failure_marks_the_period_failed(service, files):
+    service.class_cls.return_value.create_ltg_assistant.side_effect = RuntimeError("quota")
+
+    with pytest.raises(RuntimeError):
+        service.provision_period("p1", "Calculus", "vs1", files)
+    final = updates_of(service, "ingestion")[-1]
+    assert final["status"] == "failed" and "quota" in final["error"]
+    service.build_course_calendar.assert_not_called()
+    # What did succeed is kept for the retry
+    assert updates_of(service, "file_urls") == [[
+        "periods/p1/course materials/syllabus.pdf", "periods/p1/course materials/unit1.pdf"]]
+    assert final["files"]["unit1.pdf"]["vector_store"] == "completed"
+    assert updates_of(service, "update_assistant_id") == ["asst_update"]
+
+
+@pytest.mark.unit
+def test_retry_only_redoes_what_failed(service, monkeypatch):
+    key = "periods/p1/course materials/unit1.pdf"
+    service.period.update(
+        file_urls=["periods/p1/course materials/syllabus.pdf", key],
+        update_assistant_id="asst_update",
+        ingestion={"status": "failed", "error": "Assistant creation failed: quota", "files": {
+            "syllabus.pdf": {"s3": "uploaded", "vector_store": "completed", "key": "periods/p1/course materials/syllabus.pdf"},
+            "unit1.pdf": {"s3": "uploaded", "vector_store": "failed", "key": key, "error": "timeout"},
+        }})
+    downloads = []
+
+    def download(s3_key, path):
+        downloads.append(s3_key)
+        with open(path, "wb") as f:
+            f.write(b"content")
+        return True
+    monkeypatch.setattr("routes.teacher.teacher_service.download_file_from_s3", download)
+    s3_upload = MagicMock(side_effect=bulk_upload(succeed=True))
+    monkeypatch.setattr("routes.teacher.teacher_service.upload_files_to_s3", s3_upload)
+
+    result = service.retry_provisioning("p1")
+
+    assert downloads == [key]
+    assert s3_upload.call_args.args[0] == []
+    assert service.openai_client.vector_stores.files.upload_and_poll.call_count == 1
+    service.class_cls.return_value.create_update_assistant.assert_not_called()
+    service.class_cls.return_value.create_ltg_assistant.assert_called_once()
+    assert updates_of(service, "ltg_assistant_id") == ["asst_ltg"]
+    assert result["status"] == "ready"
+    final = updates_of(service, "ingestion")[-1]
+    assert "error" not in final and "error" not in final["files"]["unit1.pdf"]
+    assert final["files"]["unit1.pdf"]["vector_store"] == "completed"
+
+
+@pytest.mark.unit
+def test_status_writes_are_coalesced():
+    dao = MagicMock()
+    status = IngestionStatus(dao, "p1", initial_ingestion([f"f{i}.pdf" for i in range(200)]), flush_interval=60)
+
+    for i in range(200):
+        status.update(f"f{i}.pdf", s3="uploaded")
+        status.update(f"f{i}.pdf", vector_store="completed")
+    status.flush()
+
+    assert dao.update_period.call_count == 2
+    written = dao.update_period.call_args.args[1]["ingestion"]
+    assert all(f == {"s3": "uploaded", "vector_store": "completed"} for f in written["files"].values())
+
+
+@pytest.mark.unit
+def test_period_status(service):
+    service.period = {
+        "teacher_id": "t1", "update_assistant_id": "asst_update",
+        "ltg_assistant_id": "placeholder_ltg_assistant_id", "ingestion": initial_ingestion(["a.pdf"])
+    }
+
+    status = service.get_period_status("p1")
+
+    service.period_dao.get_period_by_id.assert_called_with("p1", use_cache=False)
+    assert status["assistants_ready"] is False and status["course_calendar_ready"] is False
+    assert status["ingestion"]["files"] == {"a.pdf": {"s3": "pending", "vector_store": "pending"}}
+
+
+@pytest.mark.unit
+def test_create_period_removes_its_temp_files_when_it_fails(monkeypatch, tmp_path):
+    from io import BytesIO
+    from flask_jwt_extended import create_access_token
+    from app import app as flask_app
+    import routes.teacher.routes as teacher_routes
+
+    temp_dir = tmp_path / "upload"
+    temp_dir.mkdir()
+    monkeypatch.setattr(teacher_routes.tempfile, "mkdtemp", lambda: str(temp_dir))
+    monkeypatch.setattr("routes.auth_context.session_dao", MagicMock())
+    openai_client = MagicMock()
+    openai_client.vector_stores.create.side_effect = RuntimeError("quota")
+    monkeypatch.setattr(teacher_routes, "client", openai_client)
+    with flask_app.app_context():
+        token = create_access_token(identity="t1")
+
+    response = flask_app.test_client().post(
+        "/teacher/create-period", headers={"Authorization": f"Bearer {token}"},
+        data={"course": "Calculus", "files": (BytesIO(b"content"), "syllabus.pdf")},
+        content_type="multipart/form-data")
+
+    assert response.status_code == 500
+    assert not temp_dir.exists()
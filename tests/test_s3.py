@@ -0,0 +1,78 @@
+"""
+Tests for the concurrent bulk upload API in s3.py
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+import s3
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name, size in (("big.pdf", 3000), ("small.pdf", 10), ("notes.txt", 500)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(s3, "s3", client)
+    return client
+
+
+@pytest.mark.unit
+def test_results_are_per_file_and_in_order(client, files):
+    finished = []
+
+    upload = s3.upload_files_to_s3(files, folder="periods/p1/course materials", on_result=finished.append)
+
+    assert [result["key"] for result in upload["results"]] == [
+        "periods/p1/course materials/big.pdf",
+        "periods/p1/course materials/small.pdf",
+        "periods/p1/course materials/notes.txt",
+    ]
+    assert [result["bytes"] for result in upload["results"]] == [3000, 10, 500]
+    assert len(finished) == 3
+    metrics = upload["metrics"]
+    assert (metrics["files"], metrics["uploaded"], metrics["failed"], metrics["bytes"]) == (3, 3, 0, 3510)
+    assert client.upload_file.call_args.kwargs["Config"] is s3.transfer_config
+
+
+@pytest.mark.unit
+def test_one_failed_file_does_not_fail_the_batch(client, files):
+    def upload_file(Filename, **kwargs):
+        if Filename.endswith("small.pdf"):
+            raise RuntimeError("access denied")
+    client.upload_file.side_effect = upload_file
+
+    upload = s3.upload_files_to_s3(files + ["/missing/file.pdf"])
+
+    failed = [result for result in upload["results"] if result["key"] is None]
+    assert [result["filename"] for result in failed] == ["small.pdf", "file.pdf"]
+    assert failed[0]["error"] == "access denied"
+    assert (upload["metrics"]["uploaded"], upload["metrics"]["failed"], upload["metrics"]["bytes"]) == (2, 2, 3500)
+
+
+@pytest.mark.unit
+def test_files_upload_concurrently(client, files):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def upload_file(**kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+    client.upload_file.side_effect = upload_file
+
+    s3.upload_files_to_s3(files)
+    assert peak[0] == min(len(files), s3.S3_UPLOAD_WORKERS)
@@ -0,0 +1,144 @@
+"""
+Tests for the SchedulesAgent guardrail policy
+"""
+
+import asyncio
+import importlib.util
+import os
+import pytest
+from types import SimpleNamespace
+
+
+def load_guardrail_module():
+    """conftest mocks the EQ_agents package; load the real module from its file."""
+    path = os.path.join(os.path.dirname(__file__), "..", "EQ_agents", "schedule_guardrail.py")
+    spec = importlib.util.spec_from_file_location("schedule_guardrail_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+sg = load_guardrail_module()
+
+CALENDAR = {"weeks": [
+    {"week": 1, "topics": "Limits and continuity", "skills": "evaluate limits"},
+    {"week": 2, "topics": "Derivatives", "skills": "differentiate polynomials"},
+]}
+
+
+class Schedule(SimpleNamespace):
+    def model_dump(self):
+        return {"list_of_quests": self.list_of_quests}
+
+
+def schedule_of(*quests):
+    return Schedule(list_of_quests=[{"Name": name, "Skills": skills, "Week": week} for week, name, skills in quests])
+
+
+ALIGNED = schedule_of((1, "Racing limits", "Evaluating limits of lap times"),
+                      (2, "Speed derivatives", "Differentiating distance"))
+
+
+def make_guardrail(policy, **kwargs):
+    return sg.ScheduleGuardrail(policy=policy, cache=sg.GuardrailCache(), stats=sg.GuardrailStats(), **kwargs)
+
+
+class ModelCheck:
+    def __init__(self, approved=True):
+        self.calls = 0
+        self.approved = approved
+
+    async def __call__(self, schedule):
+        self.calls += 1
+        return self.approved, "" if self.approved else "week 2 is off"
+
+
+@pytest.mark.unit
+def test_week_map_check():
+    assert sg.check_against_week_map(ALIGNED.list_of_quests, CALENDAR) == (True, "")
+
+    approved, feedback = sg.check_against_week_map(
+        schedule_of((1, "Racing limits", "limits"), (1, "Poetry", "rhyme")).list_of_quests, CALENDAR)
+    assert not approved
+    assert "more than one quest for weeks [1]" in feedback and "no quest for weeks [2]" in feedback
+
+    approved, feedback = sg.check_against_week_map(
+        schedule_of((1, "Poetry", "rhyme"), (2, "Painting", "colour")).list_of_quests, CALENDAR)
+    assert not approved and "weeks [1, 2]" in feedback
+
+
+@pytest.mark.unit
+def test_calendar_makes_the_check_deterministic():
+    model_check = ModelCheck()
+    decision = asyncio.run(make_guardrail("always").check(ALIGNED, {"period_id": "p1", "course_calendar": CALENDAR}, model_check))
+    assert decision["method"] == "week_map" and decision["approved"]
+    assert model_check.calls == 0
+    assert decision["elapsed_ms"] >= 0 and decision["policy"] == "always"
+
+
+@pytest.mark.unit
+def test_cache_miss_policy_checks_each_schedule_once():
+    guardrail = make_guardrail("cache_miss")
+    model_check = ModelCheck(approved=False)
+
+    first = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1"}, model_check))
+    second = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1"}, model_check))
+    other_period = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p2"}, model_check))
+
+    assert (first["method"], second["method"], other_period["method"]) == ("model", "cache", "model")
+    assert second["approved"] is False and second["feedback"] == "week 2 is off"
+    assert model_check.calls == 2
+    assert guardrail.stats.snapshot()["model"]["rejected"] == 2
+
+
+@pytest.mark.unit
+def test_always_policy_ignores_the_cache():
+    guardrail = make_guardrail("always")
+    model_check = ModelCheck()
+    for _ in range(2):
+        asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1"}, model_check))
+    assert model_check.calls == 2
+
+
+@pytest.mark.unit
+def test_sampled_and_off_policies_skip_the_model():
+    model_check = ModelCheck()
+    skipped = asyncio.run(make_guardrail("sampled", sample_rate=0).check(ALIGNED, {"period_id": "p1"}, model_check))
+    sampled = asyncio.run(make_guardrail("sampled", sample_rate=1).check(ALIGNED, {"period_id": "p1"}, model_check))
+    off = asyncio.run(make_guardrail("off").check(ALIGNED, {"period_id": "p1"}, model_check))
+
+    assert (skipped["method"], sampled["method"], off["method"]) == ("not_sampled", "model", "off")
+    assert model_check.calls == 1
+
+
+@pytest.mark.unit
+def test_failed_model_check_keeps_the_schedule():
+    async def broken(schedule):
+        raise RuntimeError("timeout")
+
+    guardrail = make_guardrail("cache_miss")
+    decision = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1"}, broken))
+    assert decision["approved"] and decision["method"] == "error"
+    assert guardrail.cache.get(sg.schedule_cache_key("p1", ALIGNED)) is None
+
+
+@pytest.mark.unit
+def test_rebuilt_calendar_invalidates_cached_decisions():
+    guardrail = make_guardrail("cache_miss")
+    model_check = ModelCheck(approved=False)
+    asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1"}, model_check))
+
+    decision = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1", "course_calendar": CALENDAR}, model_check))
+    assert decision["method"] == "week_map" and decision["approved"]
+
+    revised = {"weeks": [{"week": 1, "topics": "Poetry", "skills": "rhyme"},
+                         {"week": 2, "topics": "Painting", "skills": "colour"}]}
+    decision = asyncio.run(guardrail.check(ALIGNED, {"period_id": "p1", "course_calendar": revised}, model_check))
+    assert decision["method"] == "week_map" and not decision["approved"]
+    assert model_check.calls == 1
+
+
+@pytest.mark.unit
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        sg.ScheduleGuardrail(policy="sometimes")
@@ -0,0 +1,61 @@
+"""
+Tests for the read-through session cache behind SessionDAO
+"""
+
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.session_dao import SessionDAO, SessionCache, session_cache
+
+
+@pytest.fixture
+def dao():
+    session_cache.clear()
+    dao = SessionDAO()
+    dao.table = MagicMock()
+    yield dao
+    session_cache.clear()
+
+
+@pytest.mark.unit
+def test_repeat_lookups_hit_the_cache(dao):
+    dao.table.query.return_value = {"Items": [{"auth_token": "t1", "user_id": "u1"}]}
+    assert dao.get_sessions_by_auth_token("t1")[0]["user_id"] == "u1"
+    assert dao.get_sessions_by_auth_token("t1")[0]["user_id"] == "u1"
+    assert dao.table.query.call_count == 1
+
+
+@pytest.mark.unit
+def test_unknown_tokens_are_negatively_cached(dao):
+    dao.table.query.return_value = {"Items": []}
+    assert dao.get_sessions_by_auth_token("bad") == []
+    assert dao.get_sessions_by_auth_token("bad") == []
+    assert dao.table.query.call_count == 1
+
+
+@pytest.mark.unit
+def test_delete_session_invalidates(dao):
+    dao.table.query.return_value = {"Items": [{"auth_token": "t1", "user_id": "u1"}]}
+    dao.get_sessions_by_auth_token("t1")
+    dao.delete_session("t1", "u1")
+    dao.table.query.return_value = {"Items": []}
+    assert dao.get_sessions_by_auth_token("t1") == []
+
+
+@pytest.mark.unit
+def test_entries_do_not_outlive_session_expiry():
+    cache = SessionCache(ttl=60)
+    cache.put("t1", [{"auth_token": "t1", "expires_at": int(time.time()) - 1}])
+    assert cache.get("t1") is None
+
+
+@pytest.mark.unit
+def test_lru_eviction():
+    cache = SessionCache(max_size=2)
+    cache.put("a", [{"user_id": "a"}])
+    cache.put("b", [{"user_id": "b"}])
+    cache.get("a")
+    cache.put("c", [{"user_id": "c"}])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
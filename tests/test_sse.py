@@ -0,0 +1,56 @@
+"""
+Tests for streaming assistant replies as server-sent events
+"""
+
+import json
+import pytest
+from flask import Flask
+
+from routes.sse import JsonFieldDeltas, stream_assistant_reply
+
+
+def collect(field, chunks):
+    out = []
+    deltas = JsonFieldDeltas(field, out.append)
+    for chunk in chunks:
+        deltas.feed(chunk)
+    return "".join(out)
+
+
+@pytest.mark.unit
+def test_field_text_is_decoded_across_chunks():
+    reply = json.dumps({"response": "Hi \"Sam\"\né ok", "Strengths": []})
+    chunks = [reply[i:i + 3] for i in range(0, len(reply), 3)]
+    assert collect("response", chunks) == "Hi \"Sam\"\né ok"
+
+
+@pytest.mark.unit
+def test_other_fields_are_not_streamed():
+    assert collect("message", ['{"chosen_goal": "x", ', '"message": "Pick', ' one"}']) == "Pick one"
+
+
+@pytest.mark.unit
+def test_stream_ends_with_done_event():
+    def call(on_text_delta):
+        on_text_delta('{"response": "Hel')
+        on_text_delta('lo", "change": true}')
+        return {"response": "Hello"}
+
+    with Flask(__name__).test_request_context():
+        body = "".join(stream_assistant_reply(call).response)
+
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    assert [e[0] for e in events] == ["event: delta", "event: delta", "event: done"]
+    done = json.loads(events[-1][1][len("data: "):])
+    assert done["response"] == "Hello"
+    assert done["assistant_output"]["change"] is True
+
+
+@pytest.mark.unit
+def test_service_error_becomes_error_event():
+    def call(on_text_delta):
+        raise Exception("Invalid auth token")
+
+    with Flask(__name__).test_request_context():
+        body = "".join(stream_assistant_reply(call).response)
+    assert body.startswith("event: error")
@@ -0,0 +1,74 @@
+"""
+Tests for waitlist code lookup and bulk code allocation
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.base_dao import ConditionalWriteError
+from data_access.waitlist_dao import WaitlistDAO
+from routes.waitlist.WaitlistService import WaitlistService
+
+
+@pytest.mark.unit
+def test_get_by_code_is_a_keyed_read():
+    dao = WaitlistDAO()
+    dao.table = MagicMock()
+    dao.table.get_item.return_value = {"Item": {"waitlistID": "abc", "used": False}}
+    assert dao.get_by_code("abc")["waitlistID"] == "abc"
+    dao.table.get_item.assert_called_once_with(Key={"waitlistID": "abc"})
+    dao.table.scan.assert_not_called()
+
+
+@pytest.mark.unit
+def test_generate_codes_replaces_collisions(monkeypatch):
+    candidates = iter(["taken", "a", "b", "c"])
+    monkeypatch.setattr("routes.waitlist.WaitlistService._gen_code", lambda n=8: next(candidates))
+    dao = MagicMock()
+    dao.get_existing_codes.side_effect = lambda codes: {"taken"} & set(codes)
+
+    codes = WaitlistService(dao).generate_codes(2)
+
+    assert len(codes) == 2 and "taken" not in codes
+    dao.put_codes.assert_called_once_with(codes)
+
+
+@pytest.mark.unit
+def test_code_taken_before_the_write_is_replaced(monkeypatch):
+    candidates = iter(["a", "b", "c"])
+    monkeypatch.setattr("routes.waitlist.WaitlistService._gen_code", lambda n=8: next(candidates))
+    taken = set()
+    dao = MagicMock()
+    dao.get_existing_codes.side_effect = lambda codes: taken & set(codes)
+
+    def put_codes(codes):
+        if not taken:
+            # join() allocates "b" between the collision check and the write
+            taken.add("b")
+            raise ConditionalWriteError("Conditional check failed")
+    dao.put_codes.side_effect = put_codes
+
+    assert WaitlistService(dao).generate_codes(2) == ["a", "c"]
+
+
+@pytest.mark.unit
+def test_codes_are_written_conditionally_in_chunks(monkeypatch):
+    transactions = []
+    monkeypatch.setattr("data_access.waitlist_dao.transact_write", transactions.append)
+    dao = WaitlistDAO()
+    dao.get_existing_codes = lambda codes: set()
+
+    codes = WaitlistService(dao).generate_codes(150)
+
+    assert len(set(codes)) == 150
+    assert [len(actions) for actions in transactions] == [100, 50]
+    put = transactions[0][0]["Put"]
+    assert put["ConditionExpression"] == "attribute_not_exists(waitlistID)"
+    assert put["Item"]["used"] is False
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("count", [0, True, "5"])
+def test_generate_codes_validates_count(count):
+    with pytest.raises(ValueError):
+        WaitlistService(MagicMock()).generate_codes(count)
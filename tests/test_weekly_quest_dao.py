@@ -0,0 +1,70 @@
+"""
+Tests for WeeklyQuestDAO versioned and targeted writes
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from data_access.weekly_quest_dao import WeeklyQuestDAO
+from models.weekly_quest import WeeklyQuest
+from models.weekly_quest_item import WeeklyQuestItem
+
+
+def make_dao():
+    dao = WeeklyQuestDAO()
+    dao.table = MagicMock()
+    return dao
+
+
+def make_weekly_quest(version=0):
+    return WeeklyQuest(
+        quest_id="q1",
+        student_id="stu1",
+        period_id="per1",
+        quests=[
+            WeeklyQuestItem(individual_quest_id=f"iq{week}", name="n", skills="s", week=week)
+            for week in (1, 2, 3)
+        ],
+        version=version,
+    )
+
+
+@pytest.mark.unit
+def test_add_weekly_quest_is_conditioned_on_version():
+    dao = make_dao()
+    quest = make_weekly_quest(version=4)
+    dao.add_weekly_quest(quest)
+
+    kwargs = dao.table.put_item.call_args.kwargs
+    assert kwargs["Item"]["version"] == 5
+    assert kwargs["Item"]["quest_index"] == {"iq1": 0, "iq2": 1, "iq3": 2}
+    assert kwargs["ExpressionAttributeValues"] == {":expected_version": 4}
+    assert quest.version == 5
+
+
+@pytest.mark.unit
+def test_status_update_writes_only_the_list_element():
+    """A status change sets quests[i].status instead of rewriting the document"""
+    dao = make_dao()
+    dao.table.get_item.return_value = {"Item": {"quest_id": "q1", "quest_index": {"iq3": 2}}}
+
+    dao.update_individual_quest_in_weekly_quest("q1", "iq3", {"status": "completed"})
+
+    dao.table.put_item.assert_not_called()
+    kwargs = dao.table.update_item.call_args.kwargs
+    assert "quests[2].#f_status = :f_status" in kwargs["UpdateExpression"]
+    assert kwargs["ConditionExpression"] == "quests[2].#iqid = :iqid"
+    assert kwargs["ExpressionAttributeValues"][":iqid"] == "iq3"
+
+
+@pytest.mark.unit
+def test_status_update_falls_back_for_documents_without_index():
+    dao = make_dao()
+    dao.table.get_item.side_effect = [
+        {"Item": {"quest_id": "q1"}},
+        {"Item": {"quests": [{"individual_quest_id": "iq1"}, {"individual_quest_id": "iq2"}]}},
+    ]
+
+    dao.update_individual_quest_in_weekly_quest("q1", "iq2", {"status": "in_progress"})
+
+    assert "quests[1].#f_status" in dao.table.update_item.call_args.kwargs["UpdateExpression"]